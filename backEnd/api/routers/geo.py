@@ -0,0 +1,17 @@
+# backEnd/api/routers/geo.py
+
+from fastapi import APIRouter, Query
+
+from backEnd.services.gazetteer import get_gazetteer
+
+router = APIRouter(prefix="/api/geo", tags=["geo"])
+
+
+@router.get("/suggest")
+def suggest(
+    q: str = Query(..., min_length=1, description="City name prefix, optionally 'name, region/country'"),
+    limit: int = Query(10, ge=1, le=50),
+):
+    """Population-ranked city suggestions from the offline gazetteer (no upstream call)."""
+    gazetteer = get_gazetteer()
+    return {"items": gazetteer.suggest(q, limit=limit) if gazetteer else []}
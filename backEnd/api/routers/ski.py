@@ -1,8 +1,12 @@
 # backEnd/api/routers/ski.py
 
-from fastapi import APIRouter, Depends, Query
+from typing import Any, List, Optional
 
-from backEnd.services.ski_resort_service import SkiResortService
+from fastapi import APIRouter, Depends, HTTPException, Query
+
+from backEnd.core.config import settings
+from backEnd.core.metrics import current_timings
+from backEnd.services.ski_resort_service import COMPARE_SORT_KEYS, ELEVATIONS, SkiResortService
 import asyncio
 
 router = APIRouter(prefix="/api/ski", tags=["ski"])
@@ -10,6 +14,33 @@ ski_service = SkiResortService()
 
 def get_ski_service() -> SkiResortService:
     return ski_service
+def _split_fields(fields: Optional[str]) -> Optional[List[str]]:
+    names = [f.strip() for f in (fields or "").split(",") if f.strip()]
+    return names or None
+
+
+def _split_elevations(elevations: Optional[str]) -> Optional[List[str]]:
+    names = list(dict.fromkeys(e.strip().lower() for e in (elevations or "").split(",") if e.strip()))
+    unknown = [n for n in names if n not in ELEVATIONS]
+    if unknown:
+        raise HTTPException(
+            status_code=400, detail=f"Unknown elevation(s): {', '.join(unknown)}. Use: {', '.join(ELEVATIONS)}"
+        )
+    return names or None
+
+
+def _with_timings(payload: Any) -> Any:
+    """Add the request's stage timings as `_timings` when SERVER_TIMING_DEBUG is on.
+
+    Only dict payloads get the field (upstream listings can be bare lists);
+    the Server-Timing header carries the same numbers either way.
+    """
+    timings = current_timings() if settings.server_timing_debug else None
+    if timings is None or not isinstance(payload, dict):
+        return payload
+    return {**payload, "_timings": timings}
+
+
 async def cleanup_ski_service():
     # close shared httpx client if your SkiResortClient has aclose()
     await ski_service.client.close()
@@ -20,7 +51,7 @@ async def ski_resort_geo(
     q: str = Query(..., description="Ski resort name (e.g. 'Jackson Hole')"),
     svc: SkiResortService = Depends(get_ski_service),
 ):
-    return await svc.get_resort_geo(q)
+    return _with_timings(await svc.get_resort_geo(q))
 
 
 @router.get("/hourly")
@@ -34,9 +65,15 @@ async def ski_resort_hourly(
         "top",
         description="Elevation (top, mid, base) if supported by the API",
     ),
+    compact: bool = Query(False, description="Return columnar arrays (one per metric) instead of rows"),
+    fields: Optional[str] = Query(None, description="Comma-separated metrics to keep, e.g. 'snow,maxTemp,windSpeed'"),
+    elevations: Optional[str] = Query(None, description="Several elevations at once, e.g. 'top,mid,base' (overrides elevation)"),
     svc: SkiResortService = Depends(get_ski_service),
 ):
-    return await svc.get_resort_hourly(q, units=units, elevation=elevation)
+    return _with_timings(await svc.get_resort_hourly(
+        q, units=units, elevation=elevation, compact=compact, fields=_split_fields(fields),
+        elevations=_split_elevations(elevations),
+    ))
 @router.get("/forecast")
 async def ski_resort_daily(
         q: str = Query(..., description="Ski resort name"),
@@ -48,9 +85,15 @@ async def ski_resort_daily(
             "top",
             description="Elevation (top, mid, base) if supported by the API",
         ),
+        compact: bool = Query(False, description="Return columnar arrays (one per metric) instead of rows"),
+        fields: Optional[str] = Query(None, description="Comma-separated metrics to keep, e.g. 'snow,maxTemp,windSpeed'"),
+        elevations: Optional[str] = Query(None, description="Several elevations at once, e.g. 'top,mid,base' (overrides elevation)"),
         svc: SkiResortService = Depends(get_ski_service),
 ):
-    return await svc.get_resort_forecast(q, units=units, elevation=elevation)
+    return _with_timings(await svc.get_resort_forecast(
+        q, units=units, elevation=elevation, compact=compact, fields=_split_fields(fields),
+        elevations=_split_elevations(elevations),
+    ))
 
 @router.get("/snow")
 async def ski_resort_snow(
@@ -67,7 +110,7 @@ async def ski_resort_snow(
     Example:
         GET /api/ski/snow?q=Jackson%20Hole
     """
-    return await svc.get_resort_snow(q, units=units)
+    return _with_timings(await svc.get_resort_snow(q, units=units))
 
 
 @router.get("/full")
@@ -81,6 +124,9 @@ async def ski_resort_full(
         "top",
         description="Elevation (top, mid, base) if supported by the API",
     ),
+    compact: bool = Query(False, description="Return columnar arrays (one per metric) instead of rows"),
+    fields: Optional[str] = Query(None, description="Comma-separated metrics to keep, e.g. 'snow,maxTemp,windSpeed'"),
+    elevations: Optional[str] = Query(None, description="Several elevations at once, e.g. 'top,mid,base' (overrides elevation)"),
     svc: SkiResortService = Depends(get_ski_service),
 ):
     """
@@ -88,11 +134,67 @@ async def ski_resort_full(
 
     Example:
         GET /api/ski/full?q=Jackson%20Hole
+        GET /api/ski/full?q=Jackson%20Hole&compact=true&fields=summary,snow,maxTemp
     """
-    return await svc.get_resort_full(q, units=units, elevation=elevation)
+    return _with_timings(await svc.get_resort_full(
+        q, units=units, elevation=elevation, compact=compact, fields=_split_fields(fields),
+        elevations=_split_elevations(elevations),
+    ))
+
+
+@router.get("/compare")
+async def ski_resort_compare(
+    resorts: Optional[List[str]] = Query(None, description="Resort names (repeat the param or comma-separate)"),
+    region: Optional[str] = Query(None, description="Compare every resort in this region"),
+    units: str = Query(
+        "i",
+        description="Units for ski API (usually 'i' = imperial)",
+    ),
+    elevation: str = Query(
+        "top",
+        description="Elevation (top, mid, base) if supported by the API",
+    ),
+    sort_by: str = Query("fresh_snow", description=f"One of: {', '.join(COMPARE_SORT_KEYS)}"),
+    svc: SkiResortService = Depends(get_ski_service),
+):
+    """
+    Ranked snow comparison of several resorts, fetched concurrently.
+
+    Example:
+        GET /api/ski/compare?resorts=Stevens%20Pass,Crystal%20Mountain,Mt.%20Baker
+    """
+    if sort_by not in COMPARE_SORT_KEYS:
+        raise HTTPException(status_code=400, detail=f"sort_by must be one of: {', '.join(COMPARE_SORT_KEYS)}")
+    names = [n.strip() for value in (resorts or []) for n in value.split(",") if n.strip()]
+    return _with_timings(await svc.compare_resorts(names, region=region, units=units, elevation=elevation, sort_by=sort_by))
+
+
+@router.get("/cache/stats")
+async def ski_cache_stats(svc: SkiResortService = Depends(get_ski_service)):
+    """
+    Per-endpoint hit rates of the ski provider response cache.
+    """
+    return svc.client.cache_stats()
+
+
+@router.get("/search")
+async def ski_resort_search(
+    q: str = Query(..., min_length=1, description="Resort name, prefix or misspelling"),
+    limit: int = Query(10, ge=1, le=50),
+    svc: SkiResortService = Depends(get_ski_service),
+):
+    """
+    Resort search over the local catalog (no upstream call).
+
+    Example:
+        GET /api/ski/search?q=stevns
+    """
+    return svc.search_resorts(q, limit=limit)
+
+
 @router.get("/resorts")
 async def ski_resorts_by_region(
     region: str = Query(..., description="Region code (e.g. 'USA-Idaho', 'USA-Colorado')"),
     svc: SkiResortService = Depends(get_ski_service),
 ):
-    return await svc.get_resorts_by_region(region)
\ No newline at end of file
+    return _with_timings(await svc.get_resorts_by_region(region))
\ No newline at end of file
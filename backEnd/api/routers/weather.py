@@ -1,20 +1,34 @@
 from typing import Optional
 from fastapi import APIRouter, Query, Depends
-from backEnd.services.weather_service import WeatherService
+from backEnd.services.weather_service import WeatherService, forecast_cache_stats
 from backEnd.services.geo_service import GeoService
 from backEnd.core.config import settings
 from fastapi import Body, HTTPException, status
 from pydantic import BaseModel, Field
 from datetime import date, datetime, timedelta
-from starlette.concurrency import run_in_threadpool
-from backEnd.core.database import get_db
+from backEnd.core.metrics import current_timings, run_in_threadpool, timed, timing_stage
+from backEnd.core.database import engine, get_db
+from sqlalchemy import String, and_, or_, select, type_coerce, update
 from sqlalchemy.orm import Session
+import base64
+import binascii
 import json
 import asyncio
 from backEnd.services.gemini_service import GeminiService
 from backEnd.services.youtube_service import YoutubeService
-
-from backEnd.models.model import Provider, Location, Request as RequestModel, WeatherForecast, Favorite
+from backEnd.services.forecast_export import EXPORT_FORMATS, export_forecasts, parquet_available
+from backEnd.services.forecast_reader import forecast_columns
+from backEnd.services.forecast_writer import build_forecast_rows, insert_forecast_rows
+from backEnd.services.observation_service import ACCURACY_METRICS, ObservationService
+from backEnd.services.location_index import coordinate_name, find_nearest_location, has_coordinate_name
+from fastapi.responses import StreamingResponse
+from fastapi import Request, Response
+from backEnd.services.live_updates import LiveHub, get_live_hub
+from backEnd.services.request_queue import get_request_queue
+
+from backEnd.models.model import (
+    Provider, Location, Request as RequestModel, WeatherForecast, WeatherForecastDaily, WeatherForecastHourly, Favorite
+)
 
 router = APIRouter(prefix="/api/weather", tags=["weather"])
 
@@ -48,10 +62,11 @@ async def summary(
     geo: GeoService = Depends(get_geocoding_service),
     yt: YoutubeService = Depends(get_youtube_service),
     ai: GeminiService = Depends(get_gemini_service),
+    db: Session = Depends(get_db),
 ):
     if q:
         try:
-            resolved = await geo.resolve_coords_from_query(q)
+            resolved = await timed("geocode", geo.resolve_coords_from_query(q))
         except HTTPException as e:
             print(f"Geocoding lookup failed for query '{q}': {e.detail}")
             resolved = None
@@ -60,14 +75,28 @@ async def summary(
         else:
             lat, lon = settings.default_lat, settings.default_lon
             place = None
+        known = await timed("location", run_in_threadpool(db_find_location, db, lat, lon))
+        if known:
+            lat, lon = known.latitude, known.longitude
     else:
         lat = lat or settings.default_lat
         lon = lon or settings.default_lon
-        try:
-            place = await geo.resolve_place_from_coords(lat, lon)
-        except HTTPException as e:
-            print(f"Reverse geocoding failed for {lat}, {lon}: {e.detail}")
-            place = None
+        # Snap to a nearby stored location: reuses its name and cached forecast.
+        known = await timed("location", run_in_threadpool(db_find_location, db, lat, lon))
+        place = None
+        if known:
+            lat, lon = known.latitude, known.longitude
+            # Background requests and bulk ingestion name locations by their coordinates.
+            if not has_coordinate_name(known):
+                place = known.canonical_name
+        if place is None:
+            try:
+                place = await timed("geocode", geo.resolve_place_from_coords(lat, lon))
+            except HTTPException as e:
+                print(f"Reverse geocoding failed for {lat}, {lon}: {e.detail}")
+                place = None
+            if place and known:
+                await run_in_threadpool(db_rename_location, db, known, place)
 
     # Prepare a best-effort city/country guess from resolved `place` or query for the video call.
     city_guess = None
@@ -81,18 +110,23 @@ async def summary(
     city_guess = city_guess or q or "Seattle"
 
     # Start asynchronous tasks: primary weather fetch + best-effort video fetch.
-    fetch_task = asyncio.create_task(wx.fetch_data(lat, lon, units))
-    video_task = asyncio.create_task(yt.get_local_news_videos(city=city_guess, country_code=country_guess, max_results=4))
+    # Each task records its own stage, so the two overlap in the Server-Timing header.
+    fetch_task = asyncio.create_task(timed("forecast", wx.fetch_data(lat, lon)))
+    video_task = asyncio.create_task(
+        timed("youtube", yt.get_local_news_videos(city=city_guess, country_code=country_guess, max_results=4))
+    )
 
     # Wait for weather data (primary). build_context may be CPU-bound; run it in threadpool.
     data = await fetch_task
-    ctx = await run_in_threadpool(wx.build_context, data, max_days=days, units=units)
+    with timing_stage("build_context"):
+        ctx = await run_in_threadpool(wx.build_context, data, max_days=days, units=units)
     ctx["place"] = place or ctx.get("place") or f"{lat:.4f}, {lon:.4f}"
     ctx["insight"]["source"] = "rules"
 
     if ai.enabled:
         try:
-            ai_insight = await asyncio.wait_for(ai.generate_weather_insight(ctx), timeout=8.0)
+            with timing_stage("gemini"):
+                ai_insight = await asyncio.wait_for(ai.generate_weather_insight(ctx), timeout=8.0)
             if ai_insight:
                 ctx["insight"] = ai_insight
         except Exception as e:
@@ -121,6 +155,8 @@ async def summary(
         videos = []
 
     ctx["videos"] = videos
+    if settings.server_timing_debug:
+        ctx["_timings"] = current_timings()
 
     return ctx
 
@@ -146,6 +182,49 @@ def validate_date_range(start_date: date, end_date: date):
         raise HTTPException(status_code=400, detail="date range may not exceed 7 days")
 
 
+def encode_cursor(sort_key, row_id: str) -> str:
+    """Opaque keyset cursor: the last row's raw sort value and id."""
+    raw = json.dumps([str(sort_key), row_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[str, str]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        sort_key, row_id = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return str(sort_key), str(row_id)
+    except (binascii.Error, ValueError, TypeError, UnicodeError):
+        raise HTTPException(status_code=400, detail="invalid cursor")
+
+
+def keyset_sort_key(sort_col):
+    # Compare on the stored representation: SQLite keeps server_default timestamps
+    # without microseconds, so a datetime bind parameter would never equal them.
+    return type_coerce(sort_col, String)
+
+
+def apply_keyset(q, sort_col, id_col, cursor: Optional[str], descending: bool = False):
+    """Seek past `cursor` and order by (sort_col, id_col), so every page is an index range scan."""
+    key = keyset_sort_key(sort_col)
+    if cursor:
+        sort_key, row_id = decode_cursor(cursor)
+        if descending:
+            q = q.filter(key <= sort_key, or_(key < sort_key, and_(key == sort_key, id_col < row_id)))
+        else:
+            q = q.filter(key >= sort_key, or_(key > sort_key, and_(key == sort_key, id_col > row_id)))
+    if descending:
+        return q.order_by(sort_col.desc(), id_col.desc())
+    return q.order_by(sort_col.asc(), id_col.asc())
+
+
+def keyset_page(rows: list, limit: int, cursor_of) -> tuple[list, Optional[str]]:
+    """Split a `limit + 1` fetch into the page and the cursor for the next one."""
+    if len(rows) <= limit:
+        return rows, None
+    page = rows[:limit]
+    return page, cursor_of(page[-1])
+
+
 def db_get_or_create_provider(db: Session, name: str, base_url: str) -> Provider:
     p = db.query(Provider).filter(Provider.name == name).first()
     if p:
@@ -157,22 +236,38 @@ def db_get_or_create_provider(db: Session, name: str, base_url: str) -> Provider
     return p
 
 
-def db_get_or_create_location(db: Session, lat: float, lon: float, canonical_name: str | None = None) -> Location:
+def db_find_location(db: Session, lat: float, lon: float) -> Location | None:
     # round coordinates to 5 decimals to match schema uniqueness
     key_lat = round(float(lat), 5)
     key_lon = round(float(lon), 5)
     loc = db.query(Location).filter(Location.latitude == key_lat, Location.longitude == key_lon).first()
     if loc:
         return loc
-    loc = Location(latitude=key_lat, longitude=key_lon, canonical_name=canonical_name or f"{key_lat:.5f}, {key_lon:.5f}")
+    # snap to a known location a short distance away instead of creating a near-duplicate
+    nearest = find_nearest_location(db, key_lat, key_lon, settings.location_snap_radius_km)
+    return nearest[0] if nearest else None
+
+
+def db_get_or_create_location(db: Session, lat: float, lon: float, canonical_name: str | None = None) -> Location:
+    loc = db_find_location(db, lat, lon)
+    if loc:
+        return loc
+    key_lat = round(float(lat), 5)
+    key_lon = round(float(lon), 5)
+    loc = Location(latitude=key_lat, longitude=key_lon, canonical_name=canonical_name or coordinate_name(key_lat, key_lon))
     db.add(loc)
     db.commit()
     db.refresh(loc)
     return loc
 
 
-def db_create_request(db: Session, user_id: str | None, location_id: str, provider_id: str, query_raw: str | None, start_date: date, end_date: date, granularity: str) -> RequestModel:
-    req = RequestModel(user_id=user_id, location_id=location_id, provider_id=provider_id, query_raw=query_raw, start_date=start_date, end_date=end_date, granularity=granularity, status="ok")
+def db_rename_location(db: Session, loc: Location, canonical_name: str) -> None:
+    loc.canonical_name = canonical_name
+    db.commit()
+
+
+def db_create_request(db: Session, user_id: str | None, location_id: str, provider_id: str, query_raw: str | None, start_date: date, end_date: date, granularity: str, status: str = "ok") -> RequestModel:
+    req = RequestModel(user_id=user_id, location_id=location_id, provider_id=provider_id, query_raw=query_raw, start_date=start_date, end_date=end_date, granularity=granularity, status=status)
     db.add(req)
     db.commit()
     db.refresh(req)
@@ -180,35 +275,22 @@ def db_create_request(db: Session, user_id: str | None, location_id: str, provid
 
 
 def db_store_forecasts(db: Session, location: Location, provider: Provider, data: dict, start_date: date, end_date: date):
-    # store hourly forecasts from OpenWeather 'list' items
-    now = datetime.utcnow()
-    stored = 0
-    items = data.get("list", [])
-    for item in items:
-        dt = datetime.utcfromtimestamp(int(item.get("dt", 0)))
-        if dt.date() < start_date or dt.date() > end_date:
-            continue
-        main = item.get("main", {})
-        wf = WeatherForecast(
-            location_id=location.id,
-            provider_id=provider.id,
-            kind="hourly",
-            snapshot_time=now,
-            forecast_time=dt,
-            temperature_c=main.get("temp"),
-            temp_min_c=main.get("temp_min"),
-            temp_max_c=main.get("temp_max"),
-            humidity_pct=main.get("humidity"),
-            payload_raw=json.dumps(item),
-        )
-        db.add(wf)
-        stored += 1
+    # store hourly forecasts from OpenWeather 'list' items in one executemany
+    rows = build_forecast_rows(location.id, provider.id, data, datetime.utcnow(), start_date, end_date)
+    stored = insert_forecast_rows(db, rows)
     db.commit()
     return stored
 
 
 @router.post("/requests", status_code=201)
-async def create_request(body: CreateRequestBody, wx: WeatherService = Depends(get_weather_service), geo: GeoService = Depends(get_geocoding_service), db: Session = Depends(get_db)):
+async def create_request(
+    body: CreateRequestBody,
+    response: Response,
+    wait: bool = Query(True, description="false: return 202 with the request id and fetch in the background"),
+    wx: WeatherService = Depends(get_weather_service),
+    geo: GeoService = Depends(get_geocoding_service),
+    db: Session = Depends(get_db),
+):
     validate_date_range(body.start_date, body.end_date)
 
     # Resolve location
@@ -221,14 +303,43 @@ async def create_request(body: CreateRequestBody, wx: WeatherService = Depends(g
         if body.lat is None or body.lon is None:
             raise HTTPException(status_code=400, detail="Provide either 'q' or lat and lon")
         lat, lon = body.lat, body.lon
-        place = await geo.resolve_place_from_coords(lat, lon)
+        place = None
 
     # Run DB create operations in threadpool
     provider = await run_in_threadpool(db_get_or_create_provider, db, "openweather", "https://api.openweathermap.org/data/2.5")
-    location = await run_in_threadpool(db_get_or_create_location, db, lat, lon, place)
-
-    # Fetch data from upstream
-    data = await wx.fetch_data(lat, lon)
+    location = await run_in_threadpool(db_find_location, db, lat, lon)
+    if location is None:
+        # Background requests skip reverse geocoding; the location is named by its coordinates.
+        if place is None and wait:
+            place = await geo.resolve_place_from_coords(lat, lon)
+        location = await run_in_threadpool(db_get_or_create_location, db, lat, lon, place)
+
+    if not wait:
+        req = await run_in_threadpool(
+            db_create_request,
+            db,
+            None,
+            str(location.id),
+            str(provider.id),
+            body.q or f"{lat},{lon}",
+            body.start_date,
+            body.end_date,
+            body.granularity,
+            "pending",
+        )
+        depth = await get_request_queue().submit({
+            "request_id": req.id,
+            "lat": location.latitude,
+            "lon": location.longitude,
+            "start_date": body.start_date,
+            "end_date": body.end_date,
+        })
+        response.status_code = status.HTTP_202_ACCEPTED
+        response.headers["Location"] = f"{router.prefix}/requests/{req.id}"
+        return {"request_id": req.id, "status": "pending", "queue_depth": depth}
+
+    # Fetch the raw upstream forecast: the rows below are stored as a snapshot taken now.
+    data = await wx.fetch_raw(location.latitude, location.longitude)
 
     # store forecasts in DB (sync)
     stored = await run_in_threadpool(db_store_forecasts, db, location, provider, data, body.start_date, body.end_date)
@@ -250,23 +361,38 @@ async def create_request(body: CreateRequestBody, wx: WeatherService = Depends(g
 
 
 @router.get("/requests")
-async def list_requests(db: Session = Depends(get_db)):
+async def list_requests(
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    db: Session = Depends(get_db),
+):
     def _list(db: Session):
-        rows = db.query(RequestModel).order_by(RequestModel.created_at.desc()).all()
-        return [
-            {
-                "id": r.id,
-                "query_raw": r.query_raw,
-                "start_date": r.start_date.isoformat(),
-                "end_date": r.end_date.isoformat(),
-                "location_id": r.location_id,
-            }
-            for r in rows
-        ]
+        q = db.query(RequestModel, keyset_sort_key(RequestModel.created_at))
+        q = apply_keyset(q, RequestModel.created_at, RequestModel.id, cursor, descending=True)
+        rows, next_cursor = keyset_page(q.limit(limit + 1).all(), limit, lambda row: encode_cursor(row[1], row[0].id))
+        return {
+            "items": [
+                {
+                    "id": r.id,
+                    "query_raw": r.query_raw,
+                    "start_date": r.start_date.isoformat(),
+                    "end_date": r.end_date.isoformat(),
+                    "location_id": r.location_id,
+                    "status": r.status,
+                }
+                for r, _ in rows
+            ],
+            "next_cursor": next_cursor,
+        }
 
     return await run_in_threadpool(_list, db)
 
 
+@router.get("/requests/queue/stats")
+async def request_queue_stats():
+    return get_request_queue().summary()
+
+
 @router.get("/requests/{request_id}")
 async def get_request(request_id: str, db: Session = Depends(get_db)):
     def _get(db: Session):
@@ -274,8 +400,14 @@ async def get_request(request_id: str, db: Session = Depends(get_db)):
         if not r:
             return None
         # return forecasts stored for location in that date range
-        fcs = db.query(WeatherForecast).filter(WeatherForecast.location_id == r.location_id, WeatherForecast.forecast_time >= r.start_date, WeatherForecast.forecast_time <= (r.end_date + timedelta(days=1))).all()
-        return {"request": {"id": r.id, "query_raw": r.query_raw}, "forecasts": [{"forecast_time": f.forecast_time.isoformat(), "temp": str(f.temperature_c)} for f in fcs]}
+        stmt = select(*forecast_columns(["forecast_time", "temperature_c"])).where(
+            WeatherForecast.location_id == r.location_id,
+            WeatherForecast.forecast_time >= r.start_date,
+            WeatherForecast.forecast_time <= (r.end_date + timedelta(days=1)),
+        )
+        fcs = db.execute(stmt).all()
+        request = {"id": r.id, "query_raw": r.query_raw, "status": r.status, "error_message": r.error_message}
+        return {"request": request, "forecasts": [{"forecast_time": forecast_time.isoformat(), "temp": temp} for forecast_time, temp in fcs]}
 
     out = await run_in_threadpool(_get, db)
     if out is None:
@@ -317,9 +449,13 @@ async def create_favorite(body: FavoriteBody, geo: GeoService = Depends(get_geoc
         if body.lat is None or body.lon is None:
             raise HTTPException(status_code=400, detail="Provide either 'q' or lat and lon")
         lat, lon = body.lat, body.lon
-        place = await geo.resolve_place_from_coords(lat, lon)
+        place = None
 
-    location = await run_in_threadpool(db_get_or_create_location, db, lat, lon, place)
+    location = await run_in_threadpool(db_find_location, db, lat, lon)
+    if location is None:
+        if place is None:
+            place = await geo.resolve_place_from_coords(lat, lon)
+        location = await run_in_threadpool(db_get_or_create_location, db, lat, lon, place)
 
     def _create(db: Session):
         fav = Favorite(user_id=None, location_id=location.id)
@@ -338,16 +474,20 @@ async def create_favorite(body: FavoriteBody, geo: GeoService = Depends(get_geoc
 
 
 @router.get("/favorites")
-async def list_favorites(db: Session = Depends(get_db)):
+async def list_favorites(
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    db: Session = Depends(get_db),
+):
     def _list(db: Session):
-        rows = (
-            db.query(Favorite, Location)
+        q = (
+            db.query(Favorite, Location, keyset_sort_key(Favorite.created_at))
             .join(Location, Favorite.location_id == Location.id)
-            .order_by(Favorite.created_at.desc())
-            .all()
         )
+        q = apply_keyset(q, Favorite.created_at, Favorite.id, cursor, descending=True)
+        rows, next_cursor = keyset_page(q.limit(limit + 1).all(), limit, lambda row: encode_cursor(row[2], row[0].id))
         out = []
-        for fav, loc in rows:
+        for fav, loc, _ in rows:
             out.append({
                 "id": fav.id,
                 "location_id": fav.location_id,
@@ -355,7 +495,7 @@ async def list_favorites(db: Session = Depends(get_db)):
                 "latitude": loc.latitude,
                 "longitude": loc.longitude,
             })
-        return out
+        return {"items": out, "next_cursor": next_cursor}
 
     return await run_in_threadpool(_list, db)
 
@@ -391,10 +531,16 @@ async def list_forecasts(
     location_id: Optional[str] = Query(None),
     start_date: Optional[date] = Query(None),
     end_date: Optional[date] = Query(None),
+    limit: int = Query(1000, ge=1, le=1000),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    include_raw: bool = Query(False, description="Include the raw upstream payload per row"),
     db: Session = Depends(get_db),
 ):
     def _list(db: Session):
-        q = db.query(WeatherForecast)
+        q = select(
+            *forecast_columns(["id", "location_id", "forecast_time", "temperature_c", "humidity_pct", "kind"], include_raw=include_raw),
+            keyset_sort_key(WeatherForecast.forecast_time).label("sort_key"),
+        )
         if location_id:
             q = q.filter(WeatherForecast.location_id == location_id)
         if start_date:
@@ -402,22 +548,253 @@ async def list_forecasts(
         if end_date:
             # include the full end day
             q = q.filter(WeatherForecast.forecast_time < (end_date + timedelta(days=1)))
-        rows = q.order_by(WeatherForecast.forecast_time.asc()).limit(1000).all()
-        return [
-            {
+        q = apply_keyset(q, WeatherForecast.forecast_time, WeatherForecast.id, cursor)
+        rows, next_cursor = keyset_page(db.execute(q.limit(limit + 1)).all(), limit, lambda row: encode_cursor(row.sort_key, row.id))
+        items = []
+        for f in rows:
+            item = {
                 "id": f.id,
                 "location_id": f.location_id,
                 "forecast_time": f.forecast_time.isoformat(),
-                "temperature_c": (str(f.temperature_c) if f.temperature_c is not None else None),
-                "humidity_pct": (str(f.humidity_pct) if f.humidity_pct is not None else None),
+                "temperature_c": f.temperature_c,
+                "humidity_pct": f.humidity_pct,
                 "kind": f.kind,
             }
-            for f in rows
+            if include_raw:
+                item["payload_raw"] = f.payload_raw
+            items.append(item)
+        return {"items": items, "next_cursor": next_cursor}
+
+    return await run_in_threadpool(_list, db)
+
+
+@router.get("/forecasts/export")
+async def export_forecasts_stream(
+    format: str = Query("ndjson", description="ndjson, csv or parquet"),
+    location_id: Optional[str] = Query(None),
+    provider_id: Optional[str] = Query(None),
+    start_time: Optional[datetime] = Query(None, description="Inclusive lower bound on forecast_time"),
+    end_time: Optional[datetime] = Query(None, description="Exclusive upper bound on forecast_time"),
+    batch_size: int = Query(5000, ge=100, le=50000),
+):
+    if format not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"format must be one of: {', '.join(EXPORT_FORMATS)}")
+    if format == "parquet" and not parquet_available():
+        raise HTTPException(status_code=501, detail="Parquet export requires the 'pyarrow' package")
+
+    # The generator owns its own connection; StreamingResponse drives it in the threadpool.
+    body = export_forecasts(
+        engine,
+        format,
+        batch_size=batch_size,
+        location_id=location_id,
+        provider_id=provider_id,
+        start_time=start_time,
+        end_time=end_time,
+    )
+    return StreamingResponse(
+        body,
+        media_type=EXPORT_FORMATS[format],
+        headers={"Content-Disposition": f'attachment; filename="weather_forecasts.{format}"'},
+    )
+
+
+# -----------------------------
+# Forecast cache
+# -----------------------------
+
+
+@router.get("/cache/stats")
+async def cache_stats():
+    """Hit rate of the shared forecast cache (per grid cell when tiling is enabled)."""
+    return forecast_cache_stats()
+
+
+# -----------------------------
+# Live updates (server-sent events)
+# -----------------------------
+
+
+def _parse_live_locations(loc: list[str], units: Optional[str]) -> list:
+    if len(loc) > settings.live_max_locations:
+        raise HTTPException(status_code=400, detail=f"at most {settings.live_max_locations} locations per stream")
+    topics = []
+    for raw in loc:
+        try:
+            lat, lon = (float(part) for part in raw.split(","))
+        except ValueError:
+            raise HTTPException(status_code=400, detail=f"loc must be 'lat,lon', got '{raw}'")
+        topic = LiveHub.topic(lat, lon, units)
+        if topic not in topics:
+            topics.append(topic)
+    return topics
+
+
+@router.get("/live")
+async def live_updates(
+    request: Request,
+    loc: list[str] = Query(..., description="'lat,lon'; repeat for several locations"),
+    units: Optional[str] = Query(None),
+):
+    """Server-sent events: a `snapshot` of each location's summary, then `patch` events with only the changed fields."""
+    topics = _parse_live_locations(loc, units)
+    hub = get_live_hub()
+    queue = await hub.subscribe(topics)
+
+    async def events():
+        try:
+            while True:
+                try:
+                    message = await asyncio.wait_for(queue.get(), timeout=settings.live_heartbeat_seconds)
+                except asyncio.TimeoutError:
+                    if await request.is_disconnected():
+                        break
+                    yield ": ping\n\n"  # keeps proxies from closing an idle stream
+                    continue
+                yield f"event: {message['type']}\ndata: {json.dumps(message, separators=(',', ':'))}\n\n"
+                if message["type"] == "reset":
+                    break
+        finally:
+            hub.unsubscribe(queue, topics)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/live/stats")
+async def live_stats():
+    return get_live_hub().summary()
+
+
+# -----------------------------
+# Analytics over compacted forecast rollups
+# -----------------------------
+
+
+@router.get("/analytics/daily")
+async def analytics_daily(
+    location_id: str = Query(...),
+    provider_id: Optional[str] = Query(None),
+    start_date: Optional[date] = Query(None),
+    end_date: Optional[date] = Query(None),
+    limit: int = Query(366, ge=1, le=5000),
+    db: Session = Depends(get_db),
+):
+    """Daily min/max/mean temperature, total precipitation and max wind from weather_forecast_daily."""
+    def _list(db: Session):
+        d = WeatherForecastDaily
+        q = select(d).where(d.location_id == location_id)
+        if provider_id:
+            q = q.where(d.provider_id == provider_id)
+        if start_date:
+            q = q.where(d.day >= start_date)
+        if end_date:
+            q = q.where(d.day <= end_date)
+        rows = db.execute(q.order_by(d.day.asc()).limit(limit)).scalars().all()
+        return [
+            {
+                "day": r.day.isoformat(),
+                "provider_id": r.provider_id,
+                "temp_min_c": r.temp_min_c,
+                "temp_max_c": r.temp_max_c,
+                "temp_mean_c": r.temp_mean_c,
+                "precip_total_mm": r.precip_total_mm,
+                "wind_max_ms": r.wind_max_ms,
+                "hours": r.hours,
+            }
+            for r in rows
+        ]
+
+    return await run_in_threadpool(_list, db)
+
+
+@router.get("/analytics/hourly")
+async def analytics_hourly(
+    location_id: str = Query(...),
+    provider_id: Optional[str] = Query(None),
+    start_date: Optional[date] = Query(None),
+    end_date: Optional[date] = Query(None),
+    limit: int = Query(1000, ge=1, le=10000),
+    db: Session = Depends(get_db),
+):
+    """Hourly buckets from weather_forecast_hourly, averaged over every compacted snapshot."""
+    def _list(db: Session):
+        h = WeatherForecastHourly
+        q = select(h).where(h.location_id == location_id)
+        if provider_id:
+            q = q.where(h.provider_id == provider_id)
+        if start_date:
+            q = q.where(h.bucket_start >= start_date)
+        if end_date:
+            q = q.where(h.bucket_start < (end_date + timedelta(days=1)))
+        rows = db.execute(q.order_by(h.bucket_start.asc()).limit(limit)).scalars().all()
+        return [
+            {
+                "bucket_start": r.bucket_start.isoformat(),
+                "provider_id": r.provider_id,
+                "temp_min_c": r.temp_min_c,
+                "temp_max_c": r.temp_max_c,
+                "temp_mean_c": (r.temp_sum_c / r.temp_count if r.temp_count else None),
+                "precip_mm": (r.precip_sum_mm / r.precip_count if r.precip_count else None),
+                "wind_max_ms": r.wind_max_ms,
+                "snapshots": r.sample_count,
+            }
+            for r in rows
         ]
 
     return await run_in_threadpool(_list, db)
 
 
+# -----------------------------
+# Observations and forecast accuracy
+# -----------------------------
+
+
+def get_observation_service(wx: WeatherService = Depends(get_weather_service)) -> ObservationService:
+    return ObservationService(engine, weather_service=wx)
+
+
+class IngestObservationsBody(BaseModel):
+    location_ids: Optional[list[str]] = None
+    concurrency: int = Field(8, ge=1, le=32)
+
+
+@router.post("/observations/ingest")
+async def ingest_observations(body: IngestObservationsBody, obs: ObservationService = Depends(get_observation_service)):
+    """Fetch current conditions for tracked locations (all, or `location_ids`) into weather_observations."""
+    return await obs.ingest_current(body.location_ids, concurrency=body.concurrency)
+
+
+@router.get("/accuracy")
+async def forecast_accuracy(
+    metric: str = Query("temperature_c"),
+    location_id: Optional[str] = Query(None),
+    provider_id: Optional[str] = Query(None),
+    start_time: Optional[datetime] = Query(None),
+    end_time: Optional[datetime] = Query(None),
+    max_gap_minutes: int = Query(90, ge=1, le=360),
+    horizon_bucket_hours: int = Query(3, ge=1, le=48),
+    obs: ObservationService = Depends(get_observation_service),
+):
+    """Bias, MAE and RMSE of stored forecasts vs. the nearest observation, per horizon bucket."""
+    if metric not in ACCURACY_METRICS:
+        raise HTTPException(status_code=400, detail=f"metric must be one of: {', '.join(sorted(ACCURACY_METRICS))}")
+    horizons = await run_in_threadpool(
+        obs.accuracy_by_horizon,
+        metric=metric,
+        location_id=location_id,
+        provider_id=provider_id,
+        start_time=start_time,
+        end_time=end_time,
+        max_gap_minutes=max_gap_minutes,
+        horizon_bucket_hours=horizon_bucket_hours,
+    )
+    return {"metric": metric, "horizons": horizons}
+
+
 class UpdateForecastBody(BaseModel):
     temperature_c: Optional[float] = None
     temp_min_c: Optional[float] = None
@@ -437,19 +814,21 @@ class UpdateForecastBody(BaseModel):
 @router.patch("/forecasts/{forecast_id}")
 async def update_forecast(forecast_id: str, body: UpdateForecastBody, db: Session = Depends(get_db)):
     def _update(db: Session):
-        f = db.query(WeatherForecast).filter(WeatherForecast.id == forecast_id).first()
+        values = body.model_dump(exclude_none=True)
+        if values:
+            db.execute(update(WeatherForecast).where(WeatherForecast.id == forecast_id).values(**values))
+            db.commit()
+        stmt = select(
+            *forecast_columns(["id", "forecast_time", "temperature_c", "humidity_pct", "weather_code"])
+        ).where(WeatherForecast.id == forecast_id)
+        f = db.execute(stmt).first()
         if not f:
             return None
-        for field, value in body.model_dump(exclude_none=True).items():
-            setattr(f, field, value)
-        db.add(f)
-        db.commit()
-        db.refresh(f)
         return {
             "id": f.id,
             "forecast_time": f.forecast_time.isoformat(),
-            "temperature_c": (str(f.temperature_c) if f.temperature_c is not None else None),
-            "humidity_pct": (str(f.humidity_pct) if f.humidity_pct is not None else None),
+            "temperature_c": f.temperature_c,
+            "humidity_pct": f.humidity_pct,
             "weather_code": f.weather_code,
         }
 
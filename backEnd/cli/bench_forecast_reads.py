@@ -0,0 +1,114 @@
+"""Benchmark ORM entity reads against projected Core reads of weather_forecasts.
+
+Seeds a temporary SQLite file with N forecast rows, then serialises a full
+scan to the list_forecasts response dicts both ways:
+- orm:  db.query(WeatherForecast), the pre-projection read path
+- core: select(*forecast_columns([...])), the path the API uses now
+
+Usage:
+    python -m backEnd.cli.bench_forecast_reads --rows 100000 --runs 3
+"""
+import argparse
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session
+
+from backEnd.core.database import Base
+from backEnd.models.model import Location, Provider, WeatherForecast, gen_uuid
+from backEnd.services.forecast_reader import forecast_columns
+
+_COLUMNS = ["id", "location_id", "forecast_time", "temperature_c", "humidity_pct", "kind"]
+
+
+def _seed(engine, rows: int) -> None:
+    Base.metadata.create_all(bind=engine)
+    location_id, provider_id = gen_uuid(), gen_uuid()
+    start = datetime(2025, 1, 1)
+    with engine.begin() as conn:
+        conn.execute(Location.__table__.insert().values(id=location_id, canonical_name="Bench", latitude=1.0, longitude=2.0))
+        conn.execute(Provider.__table__.insert().values(id=provider_id, name="bench"))
+        batch = []
+        for i in range(rows):
+            batch.append({
+                "id": gen_uuid(),
+                "location_id": location_id,
+                "provider_id": provider_id,
+                "kind": "hourly",
+                "snapshot_time": start,
+                "forecast_time": start + timedelta(hours=i),
+                "temperature_c": 10.0 + (i % 200) / 10,
+                "humidity_pct": 50.0 + i % 40,
+                "payload_raw": '{"dt": %d, "main": {"temp": 10.0, "humidity": 50}}' % i,
+            })
+            if len(batch) == 5000:
+                conn.execute(WeatherForecast.__table__.insert(), batch)
+                batch = []
+        if batch:
+            conn.execute(WeatherForecast.__table__.insert(), batch)
+
+
+def read_orm(engine) -> int:
+    with Session(engine) as db:
+        items = [
+            {
+                "id": f.id,
+                "location_id": f.location_id,
+                "forecast_time": f.forecast_time.isoformat(),
+                "temperature_c": float(f.temperature_c) if f.temperature_c is not None else None,
+                "humidity_pct": float(f.humidity_pct) if f.humidity_pct is not None else None,
+                "kind": f.kind,
+            }
+            for f in db.query(WeatherForecast).order_by(WeatherForecast.forecast_time)
+        ]
+    return len(items)
+
+
+def read_core(engine) -> int:
+    with engine.connect() as conn:
+        rows = conn.execute(select(*forecast_columns(_COLUMNS)).order_by(WeatherForecast.forecast_time))
+        items = [
+            {
+                "id": f.id,
+                "location_id": f.location_id,
+                "forecast_time": f.forecast_time.isoformat(),
+                "temperature_c": f.temperature_c,
+                "humidity_pct": f.humidity_pct,
+                "kind": f.kind,
+            }
+            for f in rows
+        ]
+    return len(items)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Compare ORM and projected Core forecast reads.")
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    engine = create_engine("sqlite:///" + path, future=True)
+    try:
+        _seed(engine, args.rows)
+        for label, read in (("orm", read_orm), ("core", read_core)):
+            read(engine)  # warm the page cache
+            best = None
+            for _ in range(args.runs):
+                start = time.perf_counter()
+                count = read(engine)
+                elapsed = time.perf_counter() - start
+                best = elapsed if best is None else min(best, elapsed)
+            print(f"{label:5s} {count} rows, best of {args.runs}: {best:.3f}s ({count / best:,.0f} rows/s)")
+    finally:
+        engine.dispose()
+        os.remove(path)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
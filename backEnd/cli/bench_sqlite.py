@@ -0,0 +1,135 @@
+"""Mixed read/write benchmark for the SQLite tuning profile (WAL pragmas + pool sizing).
+
+Runs the same workload against a fresh file database twice: once with SQLite
+defaults (rollback journal, default pool) and once with the profile that
+core/database.py applies from Settings. Writer threads commit either single
+favorites rows or 40-row forecast batches; reader threads page the newest
+favorites.
+
+Usage:
+    python -m backEnd.cli.bench_sqlite --writers 4 --readers 12 --seconds 5
+    python -m backEnd.cli.bench_sqlite --workload forecasts
+"""
+import argparse
+import os
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, event, select
+
+from backEnd.core.config import settings
+from backEnd.core.database import Base, _apply_sqlite_pragmas
+from backEnd.models.model import Favorite, Location, Provider, WeatherForecast, gen_uuid
+
+_BATCH_ROWS = 40
+
+
+def _make_engine(path: str, tuned: bool):
+    url = "sqlite:///" + path
+    if not tuned:
+        return create_engine(url, connect_args={"check_same_thread": False}, future=True)
+    engine = create_engine(
+        url,
+        connect_args={"check_same_thread": False},
+        future=True,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout,
+    )
+    event.listen(engine, "connect", _apply_sqlite_pragmas)
+    return engine
+
+
+def _seed(engine):
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        location_id, provider_id = gen_uuid(), gen_uuid()
+        conn.execute(Location.__table__.insert().values(id=location_id, canonical_name="Bench", latitude=1.0, longitude=2.0))
+        conn.execute(Provider.__table__.insert().values(id=provider_id, name="bench"))
+    return location_id, provider_id
+
+
+def _forecast_batch(location_id: str, provider_id: str):
+    snapshot = datetime.utcnow()
+    return [
+        {
+            "id": gen_uuid(),
+            "location_id": location_id,
+            "provider_id": provider_id,
+            "kind": "hourly",
+            "snapshot_time": snapshot,
+            "forecast_time": snapshot + timedelta(hours=3 * i),
+            "temperature_c": 10.0 + i,
+            "payload_raw": '{"dt": 0}',
+        }
+        for i in range(_BATCH_ROWS)
+    ]
+
+
+def run_profile(tuned: bool, workload: str, writers: int, readers: int, seconds: float) -> dict:
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    os.remove(path)
+    engine = _make_engine(path, tuned)
+    location_id, provider_id = _seed(engine)
+    counts = {"writes": 0, "reads": 0, "errors": 0}
+    lock = threading.Lock()
+    deadline = time.perf_counter() + seconds
+
+    def _bump(key: str) -> None:
+        with lock:
+            counts[key] += 1
+
+    def _writer() -> None:
+        while time.perf_counter() < deadline:
+            try:
+                with engine.begin() as conn:
+                    if workload == "favorites":
+                        conn.execute(Favorite.__table__.insert().values(id=gen_uuid(), location_id=location_id))
+                    else:
+                        conn.execute(WeatherForecast.__table__.insert(), _forecast_batch(location_id, provider_id))
+                _bump("writes")
+            except Exception:
+                _bump("errors")
+
+    def _reader() -> None:
+        stmt = select(Favorite.id, Favorite.created_at).order_by(Favorite.created_at.desc(), Favorite.id.desc()).limit(20)
+        while time.perf_counter() < deadline:
+            try:
+                with engine.connect() as conn:
+                    conn.execute(stmt).all()
+                _bump("reads")
+            except Exception:
+                _bump("errors")
+
+    threads = [threading.Thread(target=_writer) for _ in range(writers)]
+    threads += [threading.Thread(target=_reader) for _ in range(readers)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    engine.dispose()
+    for suffix in ("", "-wal", "-shm", "-journal"):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+    return {name: round(value / seconds, 1) for name, value in counts.items()}
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Compare SQLite defaults with the tuned profile.")
+    parser.add_argument("--workload", choices=("favorites", "forecasts"), default="favorites")
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--readers", type=int, default=12)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    args = parser.parse_args(argv)
+
+    for label, tuned in (("default", False), ("tuned", True)):
+        result = run_profile(tuned, args.workload, args.writers, args.readers, args.seconds)
+        print(f"{label:8s} writes/s={result['writes']:8.1f} reads/s={result['reads']:9.1f} errors/s={result['errors']:.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
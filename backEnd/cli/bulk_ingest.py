@@ -0,0 +1,55 @@
+"""Fetch and store forecasts for many locations at once.
+
+Usage:
+    python -m backEnd.cli.bulk_ingest sites.csv --concurrency 32 --rate 20 --checkpoint sites.done
+
+The locations file is CSV or NDJSON with either a `q` column (geocoded) or
+`lat`/`lon` (plus an optional `name`). Re-running with the same --checkpoint
+skips locations whose forecasts were already committed.
+"""
+import argparse
+import asyncio
+
+import httpx
+
+from backEnd.core.config import settings
+from backEnd.core.database import engine
+from backEnd.services.api_forecast_client import ApiForecastClient
+from backEnd.services.bulk_ingest import BulkIngestor, read_locations_file
+from backEnd.services.weather_service import WeatherService
+
+
+async def _run(args) -> dict:
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(timeout=httpx.Timeout(settings.api_timeout), limits=limits) as http:
+        ingestor = BulkIngestor(
+            engine,
+            WeatherService(client=ApiForecastClient(http_client=http)),
+            concurrency=args.concurrency,
+            rate_per_sec=args.rate,
+            batch_rows=args.batch_rows,
+            checkpoint_path=args.checkpoint,
+        )
+        return await ingestor.run(read_locations_file(args.locations))
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Bulk-ingest OpenWeather forecasts for a file of locations.")
+    parser.add_argument("locations", help="CSV or NDJSON file of locations")
+    parser.add_argument("--concurrency", type=int, default=16, help="Maximum in-flight upstream requests")
+    parser.add_argument("--rate", type=float, default=10.0, help="Upstream requests per second (provider limit)")
+    parser.add_argument("--batch-rows", type=int, default=20000, help="Forecast rows per committed transaction")
+    parser.add_argument("--checkpoint", help="Append-only file of completed locations, used to resume")
+    args = parser.parse_args(argv)
+
+    stats = asyncio.run(_run(args))
+    print(
+        f"{stats['locations_done']} locations ({stats['skipped']} skipped, {stats['errors']} errors), "
+        f"{stats['rows']} rows in {stats['elapsed_s']}s: "
+        f"{stats['locations_per_s']} locations/s, {stats['rows_per_s']} rows/s"
+    )
+    return 0 if not stats["errors"] else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,49 @@
+"""Export stored forecasts to NDJSON, CSV or Parquet.
+
+Usage:
+    python -m backEnd.cli.export_forecasts --format parquet --out forecasts.parquet \
+        --location-id <id> --start 2025-11-01 --end 2025-12-01
+"""
+import argparse
+import sys
+from datetime import datetime
+
+from backEnd.core.database import engine
+from backEnd.services.forecast_export import EXPORT_FORMATS, export_forecasts, parquet_available
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Stream weather_forecasts rows to a file.")
+    parser.add_argument("--format", choices=sorted(EXPORT_FORMATS), default="ndjson")
+    parser.add_argument("--out", default="-", help="Output path, or '-' for stdout")
+    parser.add_argument("--location-id")
+    parser.add_argument("--provider-id")
+    parser.add_argument("--start", type=datetime.fromisoformat, help="Inclusive lower bound on forecast_time")
+    parser.add_argument("--end", type=datetime.fromisoformat, help="Exclusive upper bound on forecast_time")
+    parser.add_argument("--batch-size", type=int, default=5000)
+    args = parser.parse_args(argv)
+
+    if args.format == "parquet" and not parquet_available():
+        parser.error("Parquet export requires the 'pyarrow' package")
+
+    chunks = export_forecasts(
+        engine,
+        args.format,
+        batch_size=args.batch_size,
+        location_id=args.location_id,
+        provider_id=args.provider_id,
+        start_time=args.start,
+        end_time=args.end,
+    )
+    out = sys.stdout.buffer if args.out == "-" else open(args.out, "wb")
+    try:
+        for chunk in chunks:
+            out.write(chunk)
+    finally:
+        if out is not sys.stdout.buffer:
+            out.close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,37 @@
+"""Batch-load weather observations.
+
+Usage:
+    python -m backEnd.cli.ingest_observations --current               # all tracked locations
+    python -m backEnd.cli.ingest_observations --file obs.ndjson --provider station-feed
+"""
+import argparse
+import asyncio
+
+from backEnd.core.database import engine
+from backEnd.services.observation_service import ObservationService, read_observation_file
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Load rows into weather_observations.")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--current", action="store_true", help="Fetch current conditions from OpenWeather")
+    source.add_argument("--file", help="NDJSON or CSV file with location_id, observed_at and metric columns")
+    parser.add_argument("--location-id", action="append", dest="location_ids", help="Limit --current to these locations")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--provider", default="openweather", help="Provider name recorded for --file rows")
+    parser.add_argument("--batch-size", type=int, default=5000)
+    args = parser.parse_args(argv)
+
+    svc = ObservationService(engine)
+    if args.current:
+        result = asyncio.run(svc.ingest_current(args.location_ids, concurrency=args.concurrency))
+    else:
+        provider_id = svc.provider_id(args.provider)
+        stored = svc.load_rows(read_observation_file(args.file), provider_id, batch_size=args.batch_size)
+        result = {"observations_stored": stored}
+    print(result)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,426 @@
+import asyncio
+import json
+import os
+import sqlite3
+import struct
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+from backEnd.core.config import settings
+
+"""
+Shared cache used by the forecast, geocoding, ski, YouTube and Gemini caches.
+
+Backends (CACHE_BACKEND):
+- memory: in-process LRU, bounded by CACHE_MAX_BYTES. Each worker has its own copy.
+- sqlite: one SQLite file (CACHE_PATH) shared by every worker on the host.
+- redis:  any Redis-protocol server (CACHE_URL), shared by every replica, over a
+          pool of CACHE_REDIS_POOL_SIZE connections. Size is bounded by the
+          server's maxmemory policy, not CACHE_MAX_BYTES.
+
+Every backend stores the same bytes: a small header (freshness deadline and
+value kind) followed by the value, either as JSON or, for callers with their
+own compact encoding, as raw bytes. The memory and sqlite backends are bounded
+by total bytes, not entry count. Entries can outlive their TTL by a `stale_ttl`, for
+callers that serve stale data when an upstream fails. Entries larger than
+CACHE_MAX_ITEM_BYTES are not stored. Backend failures are logged and
+treated as misses, so a cache outage never fails a request.
+"""
+
+
+_HEADER = struct.Struct("<dB")  # fresh_until, kind
+_KIND_JSON, _KIND_BYTES = 0, 1
+
+
+def _encode(value: Any, fresh_until: float) -> bytes:
+    if isinstance(value, (bytes, bytearray)):
+        return _HEADER.pack(fresh_until, _KIND_BYTES) + bytes(value)
+    body = json.dumps(value, separators=(",", ":")).encode("utf-8")
+    return _HEADER.pack(fresh_until, _KIND_JSON) + body
+
+
+def _decode(raw: bytes) -> Tuple[Any, float]:
+    fresh_until, kind = _HEADER.unpack_from(raw)
+    body = raw[_HEADER.size:]
+    if kind == _KIND_BYTES:
+        return body, fresh_until
+    if kind == _KIND_JSON:
+        return json.loads(body), fresh_until
+    raise ValueError(f"unknown cache entry kind {kind}")
+
+
+class MemoryBackend:
+    name = "memory"
+
+    def __init__(self, max_bytes: int) -> None:
+        self.max_bytes = max_bytes
+        self._data: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+        self._bytes = 0
+
+    async def get(self, key: str) -> Optional[bytes]:
+        item = self._data.get(key)
+        if item is None:
+            return None
+        if item[0] <= time.time():
+            self._drop(key)
+            return None
+        self._data.move_to_end(key)
+        return item[1]
+
+    async def set(self, key: str, raw: bytes, ttl: float) -> None:
+        self._drop(key)
+        self._data[key] = (time.time() + ttl, raw)
+        self._bytes += len(raw)
+        while self._bytes > self.max_bytes and self._data:
+            self._drop(next(iter(self._data)))
+
+    async def delete(self, key: str) -> None:
+        self._drop(key)
+
+    def _drop(self, key: str) -> None:
+        item = self._data.pop(key, None)
+        if item is not None:
+            self._bytes -= len(item[1])
+
+    async def info(self) -> Dict[str, Any]:
+        return {"entries": len(self._data), "bytes": self._bytes, "max_bytes": self.max_bytes}
+
+
+class SQLiteBackend:
+    """Cache table in a standalone SQLite file; WAL lets many worker processes share it."""
+
+    name = "sqlite"
+
+    def __init__(self, path: str, max_bytes: int) -> None:
+        self.path = path
+        self.max_bytes = max_bytes
+        self._local = threading.local()
+        self._writes = 0
+        conn = self._conn()
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache_entries ("
+            " key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL NOT NULL,"
+            " size INTEGER NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_cache_accessed ON cache_entries (accessed_at)")
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _get(self, key: str) -> Optional[bytes]:
+        now = time.time()
+        conn = self._conn()
+        row = conn.execute("SELECT value FROM cache_entries WHERE key = ? AND expires_at > ?", (key, now)).fetchone()
+        if row is None:
+            return None
+        conn.execute("UPDATE cache_entries SET accessed_at = ? WHERE key = ?", (now, key))
+        return bytes(row[0])
+
+    def _set(self, key: str, raw: bytes, ttl: float) -> None:
+        now = time.time()
+        conn = self._conn()
+        conn.execute(
+            "INSERT OR REPLACE INTO cache_entries (key, value, expires_at, size, accessed_at) VALUES (?, ?, ?, ?, ?)",
+            (key, raw, now + ttl, len(raw), now),
+        )
+        self._writes += 1
+        if self._writes % 100 == 0:
+            self._evict(conn, now)
+
+    def _evict(self, conn: sqlite3.Connection, now: float) -> None:
+        conn.execute("DELETE FROM cache_entries WHERE expires_at <= ?", (now,))
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM cache_entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        # Drop least recently used entries until the file is back under budget.
+        excess = total - self.max_bytes
+        conn.execute(
+            "DELETE FROM cache_entries WHERE key IN ("
+            " SELECT key FROM (SELECT key, size, SUM(size) OVER (ORDER BY accessed_at, key) AS running"
+            " FROM cache_entries) WHERE running - size < ?)",
+            (excess,),
+        )
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await asyncio.to_thread(self._get, key)
+
+    async def set(self, key: str, raw: bytes, ttl: float) -> None:
+        await asyncio.to_thread(self._set, key, raw, ttl)
+
+    async def delete(self, key: str) -> None:
+        await asyncio.to_thread(lambda: self._conn().execute("DELETE FROM cache_entries WHERE key = ?", (key,)))
+
+    async def info(self) -> Dict[str, Any]:
+        def _info():
+            entries, size = self._conn().execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM cache_entries").fetchone()
+            return {"entries": entries, "bytes": size, "max_bytes": self.max_bytes, "path": self.path}
+
+        return await asyncio.to_thread(_info)
+
+
+class _RedisReplyError(RuntimeError):
+    """An error reply from the server; the connection itself is still usable."""
+
+
+class _RedisConnection:
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.reader = reader
+        self.writer = writer
+
+    async def _read_reply(self) -> Any:
+        line = await self.reader.readline()
+        if not line:
+            raise ConnectionError("redis connection closed")
+        kind, body = line[:1], line[1:-2]
+        if kind == b"+":
+            return body.decode()
+        if kind == b"-":
+            raise _RedisReplyError(f"redis error: {body.decode()}")
+        if kind == b":":
+            return int(body)
+        if kind == b"$":
+            length = int(body)
+            if length < 0:
+                return None
+            data = await self.reader.readexactly(length + 2)
+            return data[:-2]
+        if kind == b"*":
+            return [await self._read_reply() for _ in range(int(body))]
+        raise ConnectionError(f"unexpected redis reply: {line!r}")
+
+    async def roundtrip(self, timeout: float, *args: Any) -> Any:
+        parts = [a if isinstance(a, bytes) else str(a).encode("utf-8") for a in args]
+        self.writer.write(b"*%d\r\n" % len(parts) + b"".join(b"$%d\r\n%s\r\n" % (len(p), p) for p in parts))
+        await self.writer.drain()
+        return await asyncio.wait_for(self._read_reply(), timeout=timeout)
+
+    def close(self) -> None:
+        try:
+            self.writer.close()
+        except Exception:
+            pass  # the transport may belong to a loop that is already closed
+
+
+class RedisBackend:
+    """Minimal RESP client over asyncio streams (GET / SET PX / DEL / DBSIZE); no extra dependency.
+
+    Commands run on a pool of up to `pool_size` connections, one command per
+    connection at a time. A connection that fails or times out is closed and
+    replaced. Unlike the memory and sqlite backends there is no byte budget
+    here beyond CACHE_MAX_ITEM_BYTES per value: memory is bounded by the
+    server's own maxmemory policy.
+    """
+
+    name = "redis"
+
+    def __init__(self, url: str, timeout: float = 1.0, pool_size: int = 8) -> None:
+        parsed = urlparse(url)
+        self.host = parsed.hostname or "localhost"
+        self.port = parsed.port or 6379
+        self.password = parsed.password
+        self.db = int((parsed.path or "/0").lstrip("/") or 0)
+        self.timeout = timeout
+        self.pool_size = max(1, pool_size)
+        self._idle: List[_RedisConnection] = []
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    async def _connect(self) -> _RedisConnection:
+        reader, writer = await asyncio.wait_for(asyncio.open_connection(self.host, self.port), timeout=self.timeout)
+        conn = _RedisConnection(reader, writer)
+        try:
+            if self.password:
+                await conn.roundtrip(self.timeout, "AUTH", self.password)
+            if self.db:
+                await conn.roundtrip(self.timeout, "SELECT", str(self.db))
+        except BaseException:
+            conn.close()
+            raise
+        return conn
+
+    async def _command(self, *args: Any) -> Any:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # Streams and semaphores belong to one event loop; start fresh on a new one.
+            for conn in self._idle:
+                conn.close()
+            self._loop, self._slots, self._idle = loop, asyncio.Semaphore(self.pool_size), []
+        async with self._slots:
+            for attempt in (1, 2):
+                conn = self._idle.pop() if self._idle else None
+                try:
+                    if conn is None:
+                        conn = await self._connect()
+                    result = await conn.roundtrip(self.timeout, *args)
+                except _RedisReplyError:
+                    self._idle.append(conn)
+                    raise
+                except (ConnectionError, OSError, asyncio.IncompleteReadError, asyncio.TimeoutError):
+                    if conn is not None:
+                        conn.close()
+                    if attempt == 2:
+                        raise
+                    continue
+                except BaseException:
+                    # Cancelled mid-command: the reply may still be in flight, so the stream is unusable.
+                    if conn is not None:
+                        conn.close()
+                    raise
+                self._idle.append(conn)
+                return result
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await self._command("GET", key)
+
+    async def set(self, key: str, raw: bytes, ttl: float) -> None:
+        await self._command("SET", key, raw, "PX", max(1, int(ttl * 1000)))
+
+    async def delete(self, key: str) -> None:
+        await self._command("DEL", key)
+
+    async def info(self) -> Dict[str, Any]:
+        return {
+            "entries": await self._command("DBSIZE"),
+            "url": f"redis://{self.host}:{self.port}/{self.db}",
+            "pool_size": self.pool_size,
+            "idle_connections": len(self._idle),
+        }
+
+
+def create_backend(kind: Optional[str] = None):
+    kind = (kind or settings.cache_backend).lower()
+    if kind == "sqlite":
+        path = settings.cache_path or os.path.join(os.path.dirname(__file__), "..", "..", "db", "cache.sqlite")
+        return SQLiteBackend(os.path.abspath(path), settings.cache_max_bytes)
+    if kind == "redis":
+        return RedisBackend(settings.cache_url, pool_size=settings.cache_redis_pool_size)
+    return MemoryBackend(settings.cache_max_bytes)
+
+
+_backend = None
+_caches: Dict[str, "Cache"] = {}
+
+
+def get_backend():
+    global _backend
+    if _backend is None:
+        _backend = create_backend()
+    return _backend
+
+
+class Cache:
+    """A namespace in the shared backend, with its own hit/miss counters."""
+
+    def __init__(self, namespace: str, backend=None) -> None:
+        self.namespace = namespace
+        self._backend = backend
+        self.stats: Dict[str, int] = defaultdict(int)
+
+    @property
+    def backend(self):
+        return self._backend or get_backend()
+
+    def _key(self, key: str) -> str:
+        return f"{self.namespace}:{key}"
+
+    async def get_entry(self, key: str) -> Tuple[Optional[Any], bool]:
+        """(value, fresh). An expired-but-kept entry comes back with fresh=False; a miss is (None, False)."""
+        try:
+            raw = await self.backend.get(self._key(key))
+        except Exception as e:
+            self.stats["errors"] += 1
+            print(f"Cache '{self.namespace}' read failed: {type(e).__name__}: {e}")
+            raw = None
+        if raw is not None:
+            try:
+                value, fresh_until = _decode(raw)
+            except (ValueError, struct.error) as e:
+                # Written by an older format or corrupted: drop it and refetch.
+                self.stats["errors"] += 1
+                print(f"Cache '{self.namespace}' entry unreadable: {e}")
+                raw = None
+        if raw is None:
+            self.stats["misses"] += 1
+            return None, False
+        if fresh_until > time.time():
+            self.stats["hits"] += 1
+            return value, True
+        self.stats["misses"] += 1
+        return value, False
+
+    async def get(self, key: str) -> Optional[Any]:
+        value, fresh = await self.get_entry(key)
+        return value if fresh else None
+
+    def mark_stale_served(self) -> None:
+        self.stats["stale_served"] += 1
+
+    async def set(self, key: str, value: Any, ttl: float, stale_ttl: float = 0.0) -> None:
+        if ttl <= 0:
+            return
+        raw = _encode(value, time.time() + ttl)
+        if len(raw) > settings.cache_max_item_bytes:
+            self.stats["oversize"] += 1
+            return
+        try:
+            await self.backend.set(self._key(key), raw, ttl + stale_ttl)
+            self.stats["sets"] += 1
+            self.stats["bytes_written"] += len(raw)
+        except Exception as e:
+            self.stats["errors"] += 1
+            print(f"Cache '{self.namespace}' write failed: {type(e).__name__}: {e}")
+
+    async def delete(self, key: str) -> None:
+        try:
+            await self.backend.delete(self._key(key))
+        except Exception as e:
+            print(f"Cache '{self.namespace}' delete failed: {type(e).__name__}: {e}")
+
+    def summary(self) -> Dict[str, Any]:
+        hits, misses = self.stats["hits"], self.stats["misses"]
+        lookups = hits + misses
+        sets = self.stats["sets"]
+        return {
+            **self.stats,
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": (round(hits / lookups, 4) if lookups else None),
+            "avg_entry_bytes": (round(self.stats["bytes_written"] / sets) if sets else None),
+        }
+
+
+def get_cache(namespace: str) -> Cache:
+    if namespace not in _caches:
+        _caches[namespace] = Cache(namespace)
+    return _caches[namespace]
+
+
+def cache_key(*parts: Any) -> str:
+    return json.dumps(parts, separators=(",", ":"), default=str)
+
+
+def namespace_stats() -> Dict[str, Dict[str, Any]]:
+    """Per-namespace counters for this process (no backend round-trip)."""
+    return {name: cache.summary() for name, cache in sorted(_caches.items())}
+
+
+async def cache_stats() -> Dict[str, Any]:
+    backend = get_backend()
+    try:
+        info = await backend.info()
+    except Exception as e:
+        info = {"error": f"{type(e).__name__}: {e}"}
+    return {
+        "backend": backend.name,
+        **info,
+        "namespaces": namespace_stats(),
+    }
@@ -24,6 +24,85 @@ class Settings(BaseSettings):
     default_lat: float = Field(default=47.6061, validation_alias="DEFAULT_LAT")
     default_lon: float = Field(default=-122.3328, validation_alias="DEFAULT_LON")
     units: str = Field(default="metric", validation_alias="WEATHER_UNITS")
+    # Requests within this distance of a stored location reuse it (and its cached forecast).
+    location_snap_radius_km: float = Field(default=1.0, validation_alias="LOCATION_SNAP_RADIUS_KM")
+    forecast_cache_ttl_seconds: float = Field(default=600.0, validation_alias="FORECAST_CACHE_TTL_SECONDS")
+    # Read-through tier over weather_forecasts: snapshots younger than MAX_AGE are served
+    # without an upstream call; up to STALE_SECONDS old when OpenWeather fails.
+    forecast_store_enabled: bool = Field(default=True, validation_alias="FORECAST_STORE_ENABLED")
+    forecast_store_max_age_seconds: float = Field(default=3600.0, validation_alias="FORECAST_STORE_MAX_AGE_SECONDS")
+    forecast_store_stale_seconds: float = Field(default=172800.0, validation_alias="FORECAST_STORE_STALE_SECONDS")
+    forecast_store_flush_seconds: float = Field(default=5.0, validation_alias="FORECAST_STORE_FLUSH_SECONDS")
+    # Background processing of POST /requests?wait=false (in-process worker pool).
+    request_queue_workers: int = Field(default=4, validation_alias="REQUEST_QUEUE_WORKERS")
+    request_queue_batch_size: int = Field(default=16, validation_alias="REQUEST_QUEUE_BATCH_SIZE")
+    request_queue_max_attempts: int = Field(default=3, validation_alias="REQUEST_QUEUE_MAX_ATTEMPTS")
+    request_queue_retry_seconds: float = Field(default=2.0, validation_alias="REQUEST_QUEUE_RETRY_SECONDS")
+    # GET /api/weather/live: one refresh loop per subscribed location, diffs pushed over SSE.
+    live_refresh_seconds: float = Field(default=60.0, validation_alias="LIVE_REFRESH_SECONDS")
+    live_heartbeat_seconds: float = Field(default=15.0, validation_alias="LIVE_HEARTBEAT_SECONDS")
+    live_max_locations: int = Field(default=20, validation_alias="LIVE_MAX_LOCATIONS")
+    live_queue_size: int = Field(default=32, validation_alias="LIVE_QUEUE_SIZE")
+    # Per-stage durations on /api/weather/summary and /api/ski/*: a Server-Timing header,
+    # plus a `_timings` field in the JSON body when the debug flag is on.
+    server_timing_enabled: bool = Field(default=True, validation_alias="SERVER_TIMING_ENABLED")
+    server_timing_debug: bool = Field(default=False, validation_alias="SERVER_TIMING_DEBUG")
+    # Shared cache for forecast, geocoding, ski, YouTube and Gemini responses:
+    # "memory" (per-process LRU), "sqlite" (file shared by workers on one host) or "redis".
+    cache_backend: str = Field(default="memory", validation_alias="CACHE_BACKEND")
+    cache_url: str = Field(default="redis://localhost:6379/0", validation_alias="CACHE_URL")
+    cache_redis_pool_size: int = Field(default=8, validation_alias="CACHE_REDIS_POOL_SIZE")
+    cache_path: str = Field(default="", validation_alias="CACHE_PATH")
+    cache_max_bytes: int = Field(default=64 * 1024 * 1024, validation_alias="CACHE_MAX_BYTES")
+    cache_max_item_bytes: int = Field(default=1024 * 1024, validation_alias="CACHE_MAX_ITEM_BYTES")
+    geo_cache_ttl_seconds: float = Field(default=604800.0, validation_alias="GEO_CACHE_TTL_SECONDS")
+    youtube_cache_ttl_seconds: float = Field(default=1800.0, validation_alias="YOUTUBE_CACHE_TTL_SECONDS")
+    gemini_cache_ttl_seconds: float = Field(default=1800.0, validation_alias="GEMINI_CACHE_TTL_SECONDS")
+    # Offline gazetteer for /api/geo/suggest and query resolution (empty path = bundled cities.csv).
+    gazetteer_enabled: bool = Field(default=True, validation_alias="GAZETTEER_ENABLED")
+    gazetteer_path: str = Field(default="", validation_alias="GAZETTEER_PATH")
+    # Local ski resort catalog (resort search, name validation, stored coordinates).
+    ski_catalog_refresh_seconds: float = Field(default=86400.0, validation_alias="SKI_CATALOG_REFRESH_SECONDS")
+    ski_catalog_path: str = Field(default="", validation_alias="SKI_CATALOG_PATH")
+    # Max concurrent requests to the ski provider, and resorts per /api/ski/compare call.
+    ski_max_concurrency: int = Field(default=8, validation_alias="SKI_MAX_CONCURRENCY")
+    ski_compare_max_resorts: int = Field(default=20, validation_alias="SKI_COMPARE_MAX_RESORTS")
+    # Ski provider response cache: TTL per endpoint, plus how long an expired
+    # entry may still be served when the provider is failing.
+    ski_cache_ttl_snow_seconds: float = Field(default=1800.0, validation_alias="SKI_CACHE_TTL_SNOW_SECONDS")
+    ski_cache_ttl_forecast_seconds: float = Field(default=900.0, validation_alias="SKI_CACHE_TTL_FORECAST_SECONDS")
+    ski_cache_ttl_listing_seconds: float = Field(default=86400.0, validation_alias="SKI_CACHE_TTL_LISTING_SECONDS")
+    ski_cache_stale_seconds: float = Field(default=86400.0, validation_alias="SKI_CACHE_STALE_SECONDS")
+    # Forecast tiling: quantize coordinates to cells of this many degrees (0 disables).
+    forecast_grid_deg: float = Field(default=0.0, validation_alias="FORECAST_GRID_DEG")
+
+    # SQLite tuning profile, applied per connection when DATABASE_URL is SQLite.
+    sqlite_journal_mode: str = Field(default="WAL", validation_alias="SQLITE_JOURNAL_MODE")
+    sqlite_synchronous: str = Field(default="NORMAL", validation_alias="SQLITE_SYNCHRONOUS")
+    # Negative values are KiB (SQLite convention); -65536 is a 64 MiB page cache.
+    sqlite_cache_size: int = Field(default=-65536, validation_alias="SQLITE_CACHE_SIZE")
+    sqlite_mmap_size: int = Field(default=268435456, validation_alias="SQLITE_MMAP_SIZE")
+    sqlite_busy_timeout_ms: int = Field(default=5000, validation_alias="SQLITE_BUSY_TIMEOUT_MS")
+    sqlite_temp_store: str = Field(default="MEMORY", validation_alias="SQLITE_TEMP_STORE")
+    # Only takes effect for new database files (or after a manual VACUUM).
+    sqlite_auto_vacuum: str = Field(default="INCREMENTAL", validation_alias="SQLITE_AUTO_VACUUM")
+    db_pool_size: int = Field(default=8, validation_alias="DB_POOL_SIZE")
+    db_max_overflow: int = Field(default=8, validation_alias="DB_MAX_OVERFLOW")
+    db_pool_timeout: float = Field(default=30.0, validation_alias="DB_POOL_TIMEOUT")
+
+    # payload_raw storage: "zlib" (preset-dictionary compression, SQLite only) or "none".
+    payload_compression: str = Field(default="zlib", validation_alias="PAYLOAD_COMPRESSION")
+    payload_compression_level: int = Field(default=6, validation_alias="PAYLOAD_COMPRESSION_LEVEL")
+
+    # Forecast retention: raw snapshots older than N days are folded into the
+    # hourly/daily rollup tables and deleted by a background job.
+    forecast_retention_enabled: bool = Field(default=True, validation_alias="FORECAST_RETENTION_ENABLED")
+    forecast_raw_retention_days: int = Field(default=30, validation_alias="FORECAST_RAW_RETENTION_DAYS")
+    forecast_hourly_retention_days: int = Field(default=365, validation_alias="FORECAST_HOURLY_RETENTION_DAYS")
+    forecast_retention_interval_seconds: float = Field(default=3600.0, validation_alias="FORECAST_RETENTION_INTERVAL_SECONDS")
+    # Each batch compacts one day of snapshot_time; bounds the work per run.
+    forecast_retention_max_batches: int = Field(default=24, validation_alias="FORECAST_RETENTION_MAX_BATCHES")
+    sqlite_incremental_vacuum_pages: int = Field(default=2000, validation_alias="SQLITE_INCREMENTAL_VACUUM_PAGES")
 
 
 settings = Settings()
@@ -1,8 +1,11 @@
 from typing import Generator, Optional
 import os
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker, Session, declarative_base
 
+from backEnd.core.config import settings
+from backEnd.core.metrics import instrument_engine
+
 """
 Database URL configurable via env var. Default to a local SQLite file for easy development.
 Default path: <project_root>/db/weather.db (two levels up from this file).
@@ -17,14 +20,64 @@ os.makedirs(_DB_DIR, exist_ok=True)
 DEFAULT_SQLITE_URL = "sqlite:///" + os.path.join(_DB_DIR, "weather.db")
 DATABASE_URL: str = os.getenv("DATABASE_URL", DEFAULT_SQLITE_URL)
 
+IS_SQLITE = DATABASE_URL.startswith("sqlite")
+_IS_SQLITE_MEMORY = IS_SQLITE and (":memory:" in DATABASE_URL or DATABASE_URL.rstrip("/") == "sqlite:")
+
 # For SQLite we need to pass connect_args to avoid thread check issues.
-connect_args = {"check_same_thread": False} if DATABASE_URL.startswith("sqlite") else {}
+connect_args = {"check_same_thread": False} if IS_SQLITE else {}
+
+# In-memory SQLite uses a SingletonThreadPool/StaticPool and rejects pool sizing.
+engine_kwargs = {}
+if not _IS_SQLITE_MEMORY:
+	engine_kwargs = {
+		"pool_size": settings.db_pool_size,
+		"max_overflow": settings.db_max_overflow,
+		"pool_timeout": settings.db_pool_timeout,
+	}
+
+engine = create_engine(DATABASE_URL, connect_args=connect_args, future=True, **engine_kwargs)
+
+
+def _apply_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+	"""Apply the SQLite tuning profile from Settings to every new DB-API connection.
+
+	WAL lets readers proceed while a writer commits; synchronous=NORMAL is durable
+	under WAL except for the last transactions on power loss.
+	"""
+	cursor = dbapi_connection.cursor()
+	try:
+		if not _IS_SQLITE_MEMORY:
+			# auto_vacuum must precede table creation; it is a no-op on existing files.
+			cursor.execute(f"PRAGMA auto_vacuum={settings.sqlite_auto_vacuum}")
+			cursor.execute(f"PRAGMA journal_mode={settings.sqlite_journal_mode}")
+			cursor.execute(f"PRAGMA mmap_size={int(settings.sqlite_mmap_size)}")
+		cursor.execute(f"PRAGMA synchronous={settings.sqlite_synchronous}")
+		cursor.execute(f"PRAGMA cache_size={int(settings.sqlite_cache_size)}")
+		cursor.execute(f"PRAGMA busy_timeout={int(settings.sqlite_busy_timeout_ms)}")
+		cursor.execute(f"PRAGMA temp_store={settings.sqlite_temp_store}")
+	finally:
+		cursor.close()
+
+
+if IS_SQLITE:
+	event.listen(engine, "connect", _apply_sqlite_pragmas)
+
+# Per-statement timings for GET /api/metrics.
+instrument_engine(engine)
 
-engine = create_engine(DATABASE_URL, connect_args=connect_args, future=True)
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False, expire_on_commit=False, class_=Session)
 Base = declarative_base()
 
 
+def dialect_insert(dialect_name: str, table):
+	"""INSERT construct with ON CONFLICT support for the given dialect (SQLite or PostgreSQL)."""
+	if dialect_name == "postgresql":
+		from sqlalchemy.dialects.postgresql import insert
+	else:
+		from sqlalchemy.dialects.sqlite import insert
+	return insert(table)
+
+
 def get_db() -> Generator[Session, None, None]:
 	"""Dependency that provides a SQLAlchemy Session (sync).
 
@@ -0,0 +1,324 @@
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Optional, Tuple
+
+import httpx
+from sqlalchemy import event
+from starlette.concurrency import run_in_threadpool as _starlette_run_in_threadpool
+
+"""
+Prometheus-style metrics for GET /api/metrics (text exposition format 0.0.4).
+
+Collection is a dict lookup plus a few float additions per event; there are
+no locks. Nearly every update happens on the event loop thread. DB timings
+come from worker threads, where the GIL makes a lost increment possible but
+rare, which is an acceptable trade for zero contention on the request path.
+
+Instrumented here or through the helpers below:
+- HTTP requests per route template (MetricsMiddleware)
+- upstream calls: latency, outcome and status per provider (track_upstream)
+- run_in_threadpool queue wait and run time (run_in_threadpool)
+- SQL statement timings per verb (instrument_engine)
+- gauges read at scrape time, e.g. cache hit ratios (register_gauge)
+
+Separately, ServerTimingMiddleware reports per-request stage durations
+(timing_stage) in a Server-Timing response header.
+"""
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_registry: List[Any] = []
+_gauges: List[Tuple[str, str, Tuple[str, ...], Callable[[], Dict[Tuple, Optional[float]]], str]] = []
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Tuple[str, ...], values: Tuple, extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _num(value: float) -> str:
+    return repr(float(value)) if value not in (float("inf"), float("-inf")) else ("+Inf" if value > 0 else "-Inf")
+
+
+class Counter:
+    def __init__(self, name: str, help_text: str, labels: Tuple[str, ...] = ()) -> None:
+        self.name, self.help, self.labels = name, help_text, labels
+        self._values: Dict[Tuple, float] = defaultdict(float)
+        _registry.append(self)
+
+    def inc(self, *label_values: Any, amount: float = 1.0) -> None:
+        self._values[label_values] += amount
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        for key, value in list(self._values.items()):
+            lines.append(f"{self.name}{_labels(self.labels, key)} {_num(value)}")
+        return lines
+
+
+class Histogram:
+    def __init__(self, name: str, help_text: str, labels: Tuple[str, ...] = (), buckets: Tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+        self.name, self.help, self.labels = name, help_text, labels
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: one count per bucket, then +Inf, sum, count (non-cumulative; summed on render).
+        self._children: Dict[Tuple, List[float]] = {}
+        _registry.append(self)
+
+    def observe(self, value: float, *label_values: Any) -> None:
+        child = self._children.get(label_values)
+        if child is None:
+            child = self._children.setdefault(label_values, [0.0] * (len(self.buckets) + 3))
+        child[bisect_left(self.buckets, value)] += 1
+        child[-2] += value
+        child[-1] += 1
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for key, child in list(self._children.items()):
+            child = list(child)
+            running = 0.0
+            for bound, count in zip(self.buckets + (float("inf"),), child):
+                running += count
+                le = 'le="' + _num(bound) + '"'
+                lines.append(f"{self.name}_bucket{_labels(self.labels, key, le)} {_num(running)}")
+            lines.append(f"{self.name}_sum{_labels(self.labels, key)} {_num(child[-2])}")
+            lines.append(f"{self.name}_count{_labels(self.labels, key)} {_num(child[-1])}")
+        return lines
+
+
+def register_gauge(
+    name: str, help_text: str, labels: Tuple[str, ...], read: Callable[[], Dict[Tuple, Optional[float]]], kind: str = "gauge"
+) -> None:
+    """A metric computed at scrape time by `read()` -> {label values: value}; None values are skipped.
+
+    Use kind="counter" when `read()` returns totals another component already keeps.
+    """
+    _gauges.append((name, help_text, labels, read, kind))
+
+
+def render_metrics() -> str:
+    lines: List[str] = []
+    for metric in _registry:
+        lines.extend(metric.render())
+    for name, help_text, labels, read, kind in _gauges:
+        try:
+            values = read()
+        except Exception as e:
+            print(f"Metrics gauge {name} failed: {type(e).__name__}: {e}")
+            continue
+        lines.extend([f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"])
+        for key, value in values.items():
+            if value is not None:
+                lines.append(f"{name}{_labels(labels, key)} {_num(value)}")
+    return "\n".join(lines) + "\n"
+
+
+# ---------- HTTP ----------
+
+http_requests = Counter("http_requests_total", "HTTP requests by route template and status.", ("method", "route", "status"))
+http_duration = Histogram("http_request_duration_seconds", "HTTP request latency until the response body is sent.", ("method", "route"))
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware (no BaseHTTPMiddleware task overhead)."""
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        start = time.perf_counter()
+        status = [500]
+
+        async def _send(message) -> None:
+            if message["type"] == "http.response.start":
+                status[0] = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, _send)
+        finally:
+            # The router stores the matched route in the scope; label by its template, not the raw path.
+            route = getattr(scope.get("route"), "path", None) or "other"
+            http_requests.inc(scope["method"], route, status[0])
+            http_duration.observe(time.perf_counter() - start, scope["method"], route)
+
+
+# ---------- upstream APIs ----------
+
+upstream_requests = Counter("upstream_requests_total", "Calls to upstream APIs by outcome and HTTP status.", ("upstream", "outcome", "status"))
+upstream_duration = Histogram("upstream_request_duration_seconds", "Upstream API call latency.", ("upstream",))
+
+
+class track_upstream:
+    """`with track_upstream("openweather") as call: ...; call.status = response.status_code`.
+
+    Outcome is "timeout" for httpx timeouts and HTTPException 504, "error" for
+    any other exception or an upstream status >= 400, else "ok".
+    """
+
+    def __init__(self, upstream: str) -> None:
+        self.upstream = upstream
+        self.status: Any = ""
+
+    def __enter__(self) -> "track_upstream":
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        upstream_duration.observe(time.perf_counter() - self._start, self.upstream)
+        if not self.status and isinstance(exc, httpx.HTTPStatusError):
+            self.status = exc.response.status_code
+        if isinstance(exc, httpx.TimeoutException) or getattr(exc, "status_code", None) == 504:
+            outcome = "timeout"
+        elif exc is not None or (isinstance(self.status, int) and self.status >= 400):
+            outcome = "error"
+        else:
+            outcome = "ok"
+        upstream_requests.inc(self.upstream, outcome, self.status)
+
+
+# ---------- thread pool ----------
+
+threadpool_wait = Histogram(
+    "threadpool_queue_wait_seconds",
+    "Time run_in_threadpool work waits for a worker thread.",
+    (),
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0),
+)
+threadpool_run = Histogram("threadpool_run_seconds", "Run time of run_in_threadpool work.")
+
+
+async def run_in_threadpool(func: Callable, *args: Any, **kwargs: Any) -> Any:
+    """starlette.concurrency.run_in_threadpool, recording queue wait and run time."""
+    submitted = time.perf_counter()
+
+    def _timed() -> Any:
+        started = time.perf_counter()
+        threadpool_wait.observe(started - submitted)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            threadpool_run.observe(time.perf_counter() - started)
+
+    return await _starlette_run_in_threadpool(_timed)
+
+
+# ---------- database ----------
+
+db_duration = Histogram("db_query_duration_seconds", "SQL statement execution time by statement verb.", ("operation",))
+db_errors = Counter("db_query_errors_total", "SQL statements that raised.", ("operation",))
+
+
+def _operation(statement: str) -> str:
+    head = statement.lstrip().split(None, 1)
+    return head[0].upper() if head else "OTHER"
+
+
+def instrument_engine(engine) -> None:
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("_metrics_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        starts = conn.info.get("_metrics_start")
+        if starts:
+            db_duration.observe(time.perf_counter() - starts.pop(), _operation(statement))
+
+    @event.listens_for(engine, "handle_error")
+    def _error(ctx):
+        starts = ctx.connection.info.get("_metrics_start") if ctx.connection is not None else None
+        if starts:
+            starts.pop()
+        db_errors.inc(_operation(ctx.statement or ""))
+
+
+# ---------- Server-Timing ----------
+
+
+class ServerTiming:
+    """Stage durations of one request, in insertion order. A repeated stage name adds up."""
+
+    def __init__(self) -> None:
+        self.stages: Dict[str, float] = {}
+
+    def add(self, name: str, seconds: float) -> None:
+        self.stages[name] = self.stages.get(name, 0.0) + seconds
+
+    def as_dict(self) -> Dict[str, float]:
+        return {name: round(seconds * 1000.0, 2) for name, seconds in self.stages.items()}
+
+    def header(self) -> str:
+        return ", ".join(f"{name};dur={ms}" for name, ms in self.as_dict().items())
+
+
+# Set per request by ServerTimingMiddleware; tasks started by the handler inherit it.
+_timing: ContextVar[Optional[ServerTiming]] = ContextVar("server_timing", default=None)
+
+
+@contextmanager
+def timing_stage(name: str) -> Iterator[None]:
+    """Time a block as stage `name` of the current request; a no-op outside a timed request."""
+    timing = _timing.get()
+    if timing is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timing.add(name, time.perf_counter() - start)
+
+
+async def timed(name: str, awaitable: Awaitable) -> Any:
+    """`await` under timing_stage(name); wrap coroutines handed to create_task/gather."""
+    with timing_stage(name):
+        return await awaitable
+
+
+def current_timings() -> Optional[Dict[str, float]]:
+    """Stages recorded so far for the current request (milliseconds), or None."""
+    timing = _timing.get()
+    return timing.as_dict() if timing is not None else None
+
+
+class ServerTimingMiddleware:
+    """Adds a Server-Timing header (stages plus `total`) to responses under `prefixes`."""
+
+    def __init__(self, app, prefixes: Tuple[str, ...]) -> None:
+        self.app = app
+        self.prefixes = tuple(prefixes)
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http" or not scope["path"].startswith(self.prefixes):
+            await self.app(scope, receive, send)
+            return
+        start = time.perf_counter()
+        timing = ServerTiming()
+        token = _timing.set(timing)
+
+        async def _send(message) -> None:
+            if message["type"] == "http.response.start":
+                timing.add("total", time.perf_counter() - start)
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", timing.header().encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, _send)
+        finally:
+            _timing.reset(token)
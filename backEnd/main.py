@@ -1,3 +1,4 @@
+import asyncio
 import pathlib
 import os
 
@@ -8,8 +9,17 @@ from fastapi.staticfiles import StaticFiles
 from fastapi.responses import FileResponse, Response
 from starlette.requests import Request
 
-from backEnd.api.routers import weather, ski, pages
+from backEnd.api.routers import weather, ski, pages, geo
+from backEnd.core.cache import cache_stats, namespace_stats
+from backEnd.core.config import settings
 from backEnd.core.database import engine, Base
+from backEnd.core.metrics import CONTENT_TYPE, MetricsMiddleware, ServerTimingMiddleware, register_gauge, render_metrics
+from backEnd.services.forecast_retention import ForecastRetentionService
+from backEnd.services.forecast_store import get_forecast_store
+from backEnd.services.gazetteer import get_gazetteer
+from backEnd.services.live_updates import get_live_hub
+from backEnd.services.request_queue import get_request_queue
+from backEnd.services.weather_service import forecast_grid_stats
 # --- paths ---
 BASE_DIR = pathlib.Path(__file__).resolve().parent
 PROJECT_DIR = BASE_DIR.parent
@@ -44,10 +54,15 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+if settings.server_timing_enabled:
+    app.add_middleware(ServerTimingMiddleware, prefixes=("/api/weather/summary", "/api/ski/"))
+# Outermost, so the timings include the other middleware.
+app.add_middleware(MetricsMiddleware)
 
 # Include API routers
 app.include_router(weather.router)
 app.include_router(ski.router)
+app.include_router(geo.router)
 
 
 @app.get("/env.js", include_in_schema=False)
@@ -62,8 +77,49 @@ async def env_js() -> Response:
 def on_startup():
     # create DB tables if they don't exist (local dev convenience)
     Base.metadata.create_all(bind=engine)
+    # create_all skips tables that already exist (and their indexes), so add any
+    # model-declared index that an older database file is still missing.
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
+    # Load the gazetteer now so the first autocomplete request doesn't pay for it.
+    get_gazetteer()
+
+
+@app.on_event("startup")
+async def start_background_jobs():
+    if settings.forecast_retention_enabled:
+        retention = ForecastRetentionService(engine)
+        app.state.retention_task = asyncio.create_task(retention.run_periodic())
+    store = get_forecast_store()
+    if store is not None:
+        # Batched write-back of upstream forecasts.
+        app.state.forecast_store_task = asyncio.create_task(store.run_periodic())
+    # Start the POST /requests?wait=false workers and requeue requests a previous run left pending.
+    recovered = await get_request_queue().recover()
+    if recovered:
+        print(f"Request queue: {recovered} pending requests requeued")
+    catalog = ski.ski_service.catalog
+    if settings.api_ski_key and settings.ski_catalog_refresh_seconds > 0:
+        app.state.ski_catalog_task = asyncio.create_task(catalog.run_periodic())
+    else:
+        catalog.load_snapshot()
+    # Geocoded resort coordinates are written back in the background.
+    app.state.ski_catalog_flush_task = asyncio.create_task(catalog.flush_periodic())
+
+
 @app.on_event("shutdown")
 async def on_shutdown():
+    for name in ("retention_task", "ski_catalog_task", "ski_catalog_flush_task", "forecast_store_task"):
+        task = getattr(app.state, name, None)
+        if task:
+            task.cancel()
+    await get_request_queue().stop()
+    store = get_forecast_store()
+    if store is not None:
+        # Write whatever the periodic flush has not picked up yet.
+        store.flush()
+    ski.ski_service.catalog.save_if_dirty()
     await ski.cleanup_ski_service()
 
 
@@ -72,6 +128,64 @@ async def health():
     return {"status": "ok"}
 
 
+@app.get("/api/cache/stats", tags=["health"])
+async def shared_cache_stats():
+    return {**await cache_stats(), "forecast_grid": forecast_grid_stats()}
+
+
+# Gauges are read from the existing stats objects at scrape time.
+def _pick(summary, keys):
+    return {(k,): summary[k] for k in keys}
+
+
+def _grid_values(pairs):
+    # Empty while tiling is off (FORECAST_GRID_DEG=0).
+    grid = forecast_grid_stats(top=0) or {}
+    return {(label,): grid.get(key) for label, key in pairs}
+
+
+register_gauge(
+    "cache_hit_ratio", "Shared cache hit ratio per namespace.", ("namespace",),
+    lambda: {(name,): s["hit_rate"] for name, s in namespace_stats().items()},
+)
+register_gauge(
+    "cache_lookups_total", "Shared cache lookups per namespace.", ("namespace", "result"),
+    lambda: {
+        (name, result): s[key] for name, s in namespace_stats().items() for result, key in (("hit", "hits"), ("miss", "misses"))
+    },
+    kind="counter",
+)
+register_gauge(
+    "forecast_grid_lookups_total",
+    "Forecast cache lookups in tiling mode; shared_hit = hit for a point other than the one that filled the cell.",
+    ("result",),
+    lambda: _grid_values((("hit", "hits"), ("shared_hit", "shared_hits"), ("miss", "misses"))),
+    kind="counter",
+)
+register_gauge(
+    "forecast_grid_hit_ratio", "Forecast grid cell hit ratio; scope=shared counts only hits for another point.", ("scope",),
+    lambda: _grid_values((("all", "hit_rate"), ("shared", "shared_hit_rate"))),
+)
+register_gauge(
+    "request_queue_jobs", "POST /requests?wait=false jobs by state.", ("state",),
+    lambda: _pick(get_request_queue().summary(), ("depth", "in_flight", "waiting_retry")),
+)
+register_gauge(
+    "live_updates", "Live forecast topics and subscriptions.", ("kind",),
+    lambda: _pick(get_live_hub().summary(), ("topics", "subscriptions")),
+)
+register_gauge(
+    "forecast_store_pending_snapshots", "Forecast snapshots waiting for the next write-back.", (),
+    lambda: {(): (get_forecast_store().summary()["pending"] if get_forecast_store() else None)},
+)
+
+
+@app.get("/api/metrics", tags=["health"])
+async def metrics() -> Response:
+    """Prometheus text exposition of the process metrics."""
+    return Response(content=render_metrics(), media_type=CONTENT_TYPE)
+
+
 # Static UI from the repo folder: ./frontEnd
 frontend_dir = PROJECT_DIR / "frontEnd"
 frontend_html_dir = frontend_dir / "html"
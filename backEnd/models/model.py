@@ -1,11 +1,12 @@
 import uuid
 from datetime import datetime
 from sqlalchemy import (
-    Column, String, Text, Integer, Date, DateTime, Float, Numeric, ForeignKey, func
+    Column, String, Text, Integer, Date, DateTime, Float, Numeric, ForeignKey, Index, UniqueConstraint, func
 )
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import deferred, relationship
 
 from backEnd.core.database import Base
+from backEnd.models.payload_codec import CompressedPayload
 
 
 def gen_uuid() -> str:
@@ -15,6 +16,9 @@ def gen_uuid() -> str:
 # Simple ORM models for persistence. IDs are stored as strings for
 # cross-database portability in local dev; in production with Postgres you
 # can map to UUID types.
+#
+# Indexes and unique constraints mirror db/db_schema.sql so that tables created
+# through Base.metadata.create_all get the same access paths as the SQL schema.
 
 
 class User(Base):
@@ -25,6 +29,10 @@ class User(Base):
     created_at = Column(DateTime, nullable=False, server_default=func.now())
     updated_at = Column(DateTime, nullable=False, server_default=func.now(), onupdate=func.now())
 
+    __table_args__ = (
+        Index("idx_users_email", "email"),
+    )
+
 
 class Provider(Base):
     __tablename__ = "providers"
@@ -51,6 +59,13 @@ class Location(Base):
     created_at = Column(DateTime, nullable=False, server_default=func.now())
     updated_at = Column(DateTime, nullable=False, server_default=func.now(), onupdate=func.now())
 
+    __table_args__ = (
+        UniqueConstraint("latitude", "longitude"),
+        UniqueConstraint("canonical_name", "country_code", "admin1", "admin2", "postal_code"),
+        Index("idx_locations_canon", "canonical_name"),
+        Index("idx_locations_geo", "latitude", "longitude"),
+    )
+
 
 class Request(Base):
     __tablename__ = "requests"
@@ -70,6 +85,13 @@ class Request(Base):
     location = relationship("Location")
     provider = relationship("Provider")
 
+    __table_args__ = (
+        Index("idx_requests_loc_dates", "location_id", "start_date", "end_date"),
+        Index("idx_requests_user", "user_id"),
+        Index("idx_requests_status", "status"),
+        Index("idx_requests_created", "created_at", "id"),
+    )
+
 
 class WeatherForecast(Base):
     __tablename__ = "weather_forecasts"
@@ -93,9 +115,56 @@ class WeatherForecast(Base):
     cloud_pct = Column(Numeric(5, 2), nullable=True)
     pop_pct = Column(Numeric(5, 2), nullable=True)
     weather_code = Column(Text, nullable=True)
-    payload_raw = Column(Text, nullable=True)
+    # Deferred: only loaded (and decompressed) when the attribute is accessed.
+    payload_raw = deferred(Column(CompressedPayload, nullable=True))
     ingested_at = Column(DateTime, nullable=False, server_default=func.now())
 
+    __table_args__ = (
+        UniqueConstraint("location_id", "provider_id", "kind", "snapshot_time", "forecast_time"),
+        Index("idx_fc_loc_time", "location_id", "forecast_time"),
+        Index("idx_fc_loc_kind_snap", "location_id", "kind", "snapshot_time"),
+        Index("idx_fc_loc_provider_snap", "location_id", "provider_id", "snapshot_time"),
+        Index("idx_fc_time", "forecast_time", "id"),
+    )
+
+
+class WeatherForecastHourly(Base):
+    """Hourly rollup of compacted forecast snapshots (see services/forecast_retention.py).
+
+    Sums and counts are stored instead of means so later compaction runs can
+    merge more snapshots into an existing bucket.
+    """
+    __tablename__ = "weather_forecast_hourly"
+    location_id = Column(String(36), ForeignKey("locations.id"), primary_key=True)
+    provider_id = Column(String(36), ForeignKey("providers.id"), primary_key=True)
+    bucket_start = Column(DateTime, primary_key=True)
+    sample_count = Column(Integer, nullable=False, default=0)
+    temp_count = Column(Integer, nullable=False, default=0)
+    temp_sum_c = Column(Float, nullable=True)
+    temp_min_c = Column(Float, nullable=True)
+    temp_max_c = Column(Float, nullable=True)
+    precip_count = Column(Integer, nullable=False, default=0)
+    precip_sum_mm = Column(Float, nullable=True)
+    wind_max_ms = Column(Float, nullable=True)
+
+    __table_args__ = (
+        Index("idx_fc_hourly_time", "bucket_start"),
+    )
+
+
+class WeatherForecastDaily(Base):
+    """Daily rollup derived from weather_forecast_hourly; outlives the hourly rows."""
+    __tablename__ = "weather_forecast_daily"
+    location_id = Column(String(36), ForeignKey("locations.id"), primary_key=True)
+    provider_id = Column(String(36), ForeignKey("providers.id"), primary_key=True)
+    day = Column(Date, primary_key=True)
+    temp_min_c = Column(Float, nullable=True)
+    temp_max_c = Column(Float, nullable=True)
+    temp_mean_c = Column(Float, nullable=True)
+    precip_total_mm = Column(Float, nullable=True)
+    wind_max_ms = Column(Float, nullable=True)
+    hours = Column(Integer, nullable=False, default=0)
+
 
 class WeatherObservation(Base):
     __tablename__ = "weather_observations"
@@ -115,9 +184,17 @@ class WeatherObservation(Base):
     visibility_m = Column(Numeric(9, 2), nullable=True)
     uv_index = Column(Numeric(4, 2), nullable=True)
     weather_code = Column(Text, nullable=True)
-    payload_raw = Column(Text, nullable=True)
+    # Deferred: only loaded (and decompressed) when the attribute is accessed.
+    payload_raw = deferred(Column(CompressedPayload, nullable=True))
     ingested_at = Column(DateTime, nullable=False, server_default=func.now())
 
+    __table_args__ = (
+        # Also serves (location_id, provider_id, observed_at) range scans.
+        UniqueConstraint("location_id", "provider_id", "observed_at"),
+        Index("idx_obs_loc_time", "location_id", "observed_at"),
+        Index("idx_obs_provider_time", "provider_id", "observed_at"),
+    )
+
 
 class Favorite(Base):
     __tablename__ = "favorites"
@@ -126,3 +203,6 @@ class Favorite(Base):
     location_id = Column(String(36), ForeignKey("locations.id"), nullable=False)
     created_at = Column(DateTime, nullable=False, server_default=func.now())
 
+    __table_args__ = (
+        Index("idx_favorites_created", "created_at", "id"),
+    )
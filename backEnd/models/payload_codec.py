@@ -0,0 +1,132 @@
+import json
+import zlib
+from typing import Any, Optional
+
+from sqlalchemy import Text
+from sqlalchemy.types import TypeDecorator
+
+from backEnd.core.config import settings
+
+"""
+Compact storage for raw upstream payloads (`payload_raw` columns).
+
+Payloads are single OpenWeather list items (~500 bytes of JSON) that repeat
+the same keys and a small set of values, which is too little for zlib to find
+matches on its own. A preset dictionary made of representative items gives the
+compressor those matches up front.
+
+Stored format: MAGIC + dictionary id byte + raw deflate stream. Anything that
+does not start with MAGIC is a legacy plain-text payload and is returned as-is.
+"""
+
+MAGIC = b"\x00wz"
+
+_SAMPLE_ITEMS = [
+    {
+        "dt": 1700000000,
+        "main": {
+            "temp": 10.5, "feels_like": 9.8, "temp_min": 9.9, "temp_max": 10.5, "pressure": 1015,
+            "sea_level": 1015, "grnd_level": 1008, "humidity": 80, "temp_kf": 0.6,
+        },
+        "weather": [{"id": 500, "main": "Rain", "description": "light rain", "icon": "10n"}],
+        "clouds": {"all": 100},
+        "wind": {"speed": 3.2, "deg": 200, "gust": 7.1},
+        "visibility": 10000,
+        "pop": 0.4,
+        "rain": {"3h": 0.5},
+        "sys": {"pod": "n"},
+        "dt_txt": "2023-11-14 21:00:00",
+    },
+    {
+        "dt": 1700010800,
+        "main": {
+            "temp": 12.1, "feels_like": 11.2, "temp_min": 12.1, "temp_max": 12.1, "pressure": 1016,
+            "sea_level": 1016, "grnd_level": 1009, "humidity": 71, "temp_kf": 0,
+        },
+        "weather": [{"id": 803, "main": "Clouds", "description": "broken clouds", "icon": "04d"}],
+        "clouds": {"all": 75},
+        "wind": {"speed": 2.1, "deg": 180, "gust": 4.3},
+        "visibility": 10000,
+        "pop": 0,
+        "sys": {"pod": "d"},
+        "dt_txt": "2023-11-15 00:00:00",
+    },
+    {
+        "dt": 1700021600,
+        "main": {
+            "temp": -1.3, "feels_like": -4.6, "temp_min": -1.3, "temp_max": -1.3, "pressure": 1021,
+            "sea_level": 1021, "grnd_level": 1002, "humidity": 93, "temp_kf": 0,
+        },
+        "weather": [{"id": 600, "main": "Snow", "description": "light snow", "icon": "13n"}],
+        "clouds": {"all": 90},
+        "wind": {"speed": 2.7, "deg": 350, "gust": 5.9},
+        "visibility": 4200,
+        "pop": 0.65,
+        "snow": {"3h": 0.8},
+        "sys": {"pod": "n"},
+        "dt_txt": "2023-11-15 03:00:00",
+    },
+    {
+        "dt": 1700032400,
+        "main": {
+            "temp": 18.4, "feels_like": 17.6, "temp_min": 18.4, "temp_max": 18.4, "pressure": 1012,
+            "sea_level": 1012, "grnd_level": 1010, "humidity": 52, "temp_kf": 0,
+        },
+        "weather": [{"id": 800, "main": "Clear", "description": "clear sky", "icon": "01d"}],
+        "clouds": {"all": 0},
+        "wind": {"speed": 4.6, "deg": 270, "gust": 6.2},
+        "visibility": 10000,
+        "pop": 0,
+        "sys": {"pod": "d"},
+        "dt_txt": "2023-11-15 06:00:00",
+    },
+]
+
+# Dictionary id 1. Never change the bytes of a published id; add a new id instead.
+_DICTIONARIES = {
+    1: " ".join(json.dumps(item) for item in _SAMPLE_ITEMS).encode("utf-8"),
+}
+CURRENT_DICTIONARY_ID = 1
+
+
+def encode_payload(value: str, level: Optional[int] = None) -> bytes:
+    zdict = _DICTIONARIES[CURRENT_DICTIONARY_ID]
+    comp = zlib.compressobj(
+        level if level is not None else settings.payload_compression_level,
+        zlib.DEFLATED,
+        -15,
+        zdict=zdict,
+    )
+    body = comp.compress(value.encode("utf-8")) + comp.flush()
+    return MAGIC + bytes([CURRENT_DICTIONARY_ID]) + body
+
+
+def decode_payload(value: Any) -> Optional[str]:
+    if value is None or isinstance(value, str):
+        return value
+    data = bytes(value)
+    if not data.startswith(MAGIC):
+        return data.decode("utf-8")
+    zdict = _DICTIONARIES[data[len(MAGIC)]]
+    decomp = zlib.decompressobj(-15, zdict=zdict)
+    return (decomp.decompress(data[len(MAGIC) + 1:]) + decomp.flush()).decode("utf-8")
+
+
+class CompressedPayload(TypeDecorator):
+    """Text column that stores payloads zlib-compressed when PAYLOAD_COMPRESSION=zlib.
+
+    Compression is SQLite-only: SQLite keeps the bytes as a BLOB in the
+    existing TEXT column, so no migration is needed. Other dialects store plain
+    text. Reads accept both encodings.
+    """
+
+    impl = Text
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is None or dialect.name != "sqlite" or settings.payload_compression != "zlib":
+            return value
+        return encode_payload(value)
+
+    def process_result_value(self, value, dialect):
+        return decode_payload(value)
@@ -3,16 +3,21 @@ from typing import Optional, Dict, Any
 import httpx
 from fastapi import HTTPException
 from backEnd.core.config import settings
+from backEnd.core.metrics import track_upstream
 
 
 class ApiForecastClient:
 
-    def __init__(self, api_key: Optional[str] = None, base_url: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None, base_url: Optional[str] = None, http_client: Optional[httpx.AsyncClient] = None):
         """
         Simple OpenWeather forecast client.
+
+        Pass `http_client` to reuse one pooled connection across many calls
+        (bulk jobs); otherwise each request opens its own client.
         """
         self.api_key = api_key
         self.base_url = base_url or "https://api.openweathermap.org/data/2.5"
+        self.http_client = http_client
 
     async def _make_request(self, endpoint: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         url = f"{self.base_url}/{endpoint}"
@@ -24,8 +29,13 @@ class ApiForecastClient:
         timeout = httpx.Timeout(settings.api_timeout)
 
         try:
-            async with httpx.AsyncClient(timeout=timeout) as client:
-                response = await client.get(url, params=params)
+            with track_upstream("openweather") as call:
+                if self.http_client is not None:
+                    response = await self.http_client.get(url, params=params, timeout=timeout)
+                else:
+                    async with httpx.AsyncClient(timeout=timeout) as client:
+                        response = await client.get(url, params=params)
+                call.status = response.status_code
                 response.raise_for_status()
                 return response.json()
 
@@ -0,0 +1,226 @@
+import asyncio
+import csv
+import json
+import os
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from fastapi import HTTPException
+from sqlalchemy import select
+from sqlalchemy.engine import Engine
+
+from backEnd.core.database import dialect_insert
+from backEnd.models.model import Location, Provider
+from backEnd.services.forecast_writer import build_forecast_rows, insert_forecast_rows
+from backEnd.services.geo_service import GeoService
+from backEnd.services.location_index import coordinate_name
+from backEnd.services.weather_service import WeatherService
+
+
+def read_locations_file(path: str) -> List[Dict[str, Any]]:
+    """Read a CSV or NDJSON file of locations: either `q`, or `lat` and `lon` (optional `name`).
+
+    Every entry gets a `key` (q or "lat,lon") used for resume checkpoints.
+    """
+    with open(path, newline="", encoding="utf-8") as fh:
+        if path.endswith((".ndjson", ".jsonl", ".json")):
+            records = [json.loads(line) for line in fh if line.strip()]
+        else:
+            records = list(csv.DictReader(fh))
+    out = []
+    for record in records:
+        q = (record.get("q") or "").strip() or None
+        lat = record.get("lat")
+        lon = record.get("lon")
+        if q is None and (lat in (None, "") or lon in (None, "")):
+            raise ValueError(f"location entry needs 'q' or 'lat' and 'lon': {record}")
+        entry = {"q": q, "name": record.get("name") or None}
+        if q is None:
+            entry["lat"], entry["lon"] = float(lat), float(lon)
+            entry["key"] = f"{entry['lat']:.5f},{entry['lon']:.5f}"
+        else:
+            entry["key"] = q
+        out.append(entry)
+    return out
+
+
+class RateLimiter:
+    """Token bucket shared by all workers: at most `rate` acquisitions per second on average."""
+
+    def __init__(self, rate: float, burst: Optional[int] = None) -> None:
+        self.rate = rate
+        self.capacity = float(burst or max(1, int(rate)))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class BulkIngestor:
+    """Fetches forecasts for many locations and writes them in large transactions.
+
+    Fetch workers are bounded by `concurrency` and `rate_per_sec`. They hand
+    parsed results to a single writer through a bounded queue. The writer
+    commits once `batch_rows` rows are pending. Location keys are appended to
+    `checkpoint_path` only after their rows commit, so an interrupted run can
+    be restarted and skips what is already stored.
+    """
+
+    def __init__(
+        self,
+        engine: Engine,
+        weather_service: Optional[WeatherService] = None,
+        geo_service: Optional[GeoService] = None,
+        *,
+        concurrency: int = 16,
+        rate_per_sec: float = 10.0,
+        batch_rows: int = 20000,
+        checkpoint_path: Optional[str] = None,
+    ) -> None:
+        self.engine = engine
+        self.dialect = engine.dialect.name
+        self.wx = weather_service or WeatherService()
+        self.geo = geo_service or GeoService()
+        self.concurrency = concurrency
+        self.limiter = RateLimiter(rate_per_sec)
+        self.batch_rows = batch_rows
+        self.checkpoint_path = checkpoint_path
+
+    # ---------- checkpoints ----------
+
+    def _load_checkpoint(self) -> Set[str]:
+        if not self.checkpoint_path or not os.path.exists(self.checkpoint_path):
+            return set()
+        with open(self.checkpoint_path, encoding="utf-8") as fh:
+            return {line.rstrip("\n") for line in fh if line.strip()}
+
+    def _append_checkpoint(self, keys: List[str]) -> None:
+        if not self.checkpoint_path or not keys:
+            return
+        with open(self.checkpoint_path, "a", encoding="utf-8") as fh:
+            fh.write("".join(f"{key}\n" for key in keys))
+            fh.flush()
+            os.fsync(fh.fileno())
+
+    # ---------- writer (runs in a worker thread) ----------
+
+    def _provider_id(self, conn) -> str:
+        conn.execute(
+            dialect_insert(self.dialect, Provider.__table__)
+            .values(name="openweather", base_url="https://api.openweathermap.org/data/2.5")
+            .on_conflict_do_nothing()
+        )
+        return conn.execute(select(Provider.id).where(Provider.name == "openweather")).scalar_one()
+
+    def _location_id(self, conn, lat: float, lon: float, name: Optional[str]) -> str:
+        key_lat, key_lon = round(float(lat), 5), round(float(lon), 5)
+        found = conn.execute(
+            select(Location.id).where(Location.latitude == key_lat, Location.longitude == key_lon)
+        ).scalar()
+        if found:
+            return found
+        conn.execute(
+            dialect_insert(self.dialect, Location.__table__)
+            .values(latitude=key_lat, longitude=key_lon, canonical_name=name or coordinate_name(key_lat, key_lon))
+            .on_conflict_do_nothing()
+        )
+        return conn.execute(
+            select(Location.id).where(Location.latitude == key_lat, Location.longitude == key_lon)
+        ).scalar_one()
+
+    def _write_batch(self, pending: List[Tuple[Dict[str, Any], float, float, Optional[str], Dict[str, Any], datetime]]) -> int:
+        stored = 0
+        with self.engine.begin() as conn:
+            provider_id = self._provider_id(conn)
+            for _, lat, lon, place, data, fetched_at in pending:
+                location_id = self._location_id(conn, lat, lon, place)
+                stored += insert_forecast_rows(conn, build_forecast_rows(location_id, provider_id, data, fetched_at))
+        self._append_checkpoint([entry["key"] for entry, *_ in pending])
+        return stored
+
+    # ---------- pipeline ----------
+
+    async def _fetch(self, entry: Dict[str, Any]):
+        if entry["q"]:
+            await self.limiter.acquire()
+            resolved = await self.geo.resolve_coords_from_query(entry["q"])
+            if not resolved:
+                raise HTTPException(status_code=404, detail=f"Could not resolve '{entry['q']}'")
+            lat, lon, place = resolved
+        else:
+            lat, lon, place = entry["lat"], entry["lon"], entry.get("name")
+        await self.limiter.acquire()
+        data = await self.wx.fetch_raw(lat, lon)
+        return entry, lat, lon, place or entry.get("name"), data, datetime.utcnow()
+
+    async def run(self, locations: List[Dict[str, Any]]) -> Dict[str, Any]:
+        done = self._load_checkpoint()
+        todo = [entry for entry in locations if entry["key"] not in done]
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.concurrency * 4)
+        stats = {"locations_total": len(locations), "skipped": len(locations) - len(todo), "locations_done": 0, "rows": 0, "errors": 0}
+        started = time.perf_counter()
+
+        async def writer() -> None:
+            pending: list = []
+            pending_rows = 0
+            while True:
+                item = await queue.get()
+                if item is not None:
+                    pending.append(item)
+                    pending_rows += len(item[4].get("list", []))
+                if pending and (item is None or pending_rows >= self.batch_rows):
+                    try:
+                        stats["rows"] += await asyncio.to_thread(self._write_batch, pending)
+                        stats["locations_done"] += len(pending)
+                    except Exception as e:
+                        # Keep draining so workers never block on a full queue. The batch is
+                        # not checkpointed, so a rerun fetches these locations again.
+                        stats["errors"] += len(pending)
+                        print(f"Bulk ingest write failed ({len(pending)} locations): {type(e).__name__}: {e}")
+                    pending, pending_rows = [], 0
+                if item is None:
+                    return
+
+        sources: asyncio.Queue = asyncio.Queue()
+        for entry in todo:
+            sources.put_nowait(entry)
+
+        async def worker() -> None:
+            while True:
+                try:
+                    entry = sources.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                try:
+                    await queue.put(await self._fetch(entry))
+                except HTTPException as e:
+                    stats["errors"] += 1
+                    print(f"Bulk ingest failed for '{entry['key']}': {e.detail}")
+                except Exception as e:
+                    stats["errors"] += 1
+                    print(f"Bulk ingest failed for '{entry['key']}': {type(e).__name__}: {e}")
+
+        writer_task = asyncio.create_task(writer())
+        try:
+            await asyncio.gather(*(worker() for _ in range(self.concurrency)))
+        finally:
+            if not writer_task.done():
+                await queue.put(None)
+            await writer_task
+
+        elapsed = max(time.perf_counter() - started, 1e-9)
+        stats["elapsed_s"] = round(elapsed, 3)
+        stats["locations_per_s"] = round(stats["locations_done"] / elapsed, 2)
+        stats["rows_per_s"] = round(stats["rows"] / elapsed, 1)
+        return stats
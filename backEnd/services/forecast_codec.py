@@ -0,0 +1,165 @@
+import json
+import math
+import struct
+from array import array
+from collections.abc import Mapping
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+"""
+Compact binary form of an OpenWeather /forecast response, for caching.
+
+A parsed forecast is ~40 list items of nested dicts: tens of KB of Python
+objects, or ~15 KB of JSON. Here each metric is one packed array (float32,
+NaN = missing), and the repeated weather strings go into an interned table
+referenced by uint16 index. A 40-item forecast encodes to ~3 KB.
+
+Layout (little-endian):
+    MAGIC | n_items u16 | n_strings u16 | city_len u32 | city JSON
+    | strings (u16 length + UTF-8 each) | dt int64[n]
+    | one float32[n] per FLOAT_FIELDS | weather id int16[n]
+    | one uint16[n] string index per STRING_FIELDS
+
+CompactForecast reads the header on construction and rebuilds the `list`
+items only when first accessed, so callers that just pass a cached forecast
+along never pay for the decode.
+"""
+
+MAGIC = b"WFC1"
+
+# (section, key) paths into a list item; None section = top-level key.
+FLOAT_FIELDS: List[Tuple[Optional[str], str]] = [
+    ("main", "temp"), ("main", "feels_like"), ("main", "temp_min"), ("main", "temp_max"),
+    ("main", "pressure"), ("main", "sea_level"), ("main", "grnd_level"), ("main", "humidity"),
+    ("main", "temp_kf"), ("wind", "speed"), ("wind", "deg"), ("wind", "gust"),
+    ("clouds", "all"), (None, "visibility"), (None, "pop"), ("rain", "3h"), ("snow", "3h"),
+]
+# Whole numbers in these fields decode back to int (as OpenWeather sends them).
+INT_FIELDS = {"pressure", "sea_level", "grnd_level", "humidity", "deg", "all", "visibility"}
+STRING_FIELDS = [("weather", "main"), ("weather", "description"), ("weather", "icon"), ("sys", "pod")]
+_NONE = 0xFFFF
+
+
+def _get(item: Dict[str, Any], section: Optional[str], key: str) -> Any:
+    if section is None:
+        return item.get(key)
+    if section == "weather":
+        weather = item.get("weather") or [{}]
+        return weather[0].get(key)
+    return (item.get(section) or {}).get(key)
+
+
+def encode_forecast(data: Mapping) -> bytes:
+    items = list(data.get("list") or [])
+    n = len(items)
+    strings: Dict[str, int] = {}
+
+    def intern(value: Any) -> int:
+        if value is None:
+            return _NONE
+        return strings.setdefault(str(value), len(strings))
+
+    dts = array("q", (int(item.get("dt") or 0) for item in items))
+    floats = []
+    for section, key in FLOAT_FIELDS:
+        values = (_get(item, section, key) for item in items)
+        floats.append(array("f", (float(v) if v is not None else math.nan for v in values)))
+    weather_ids = array("h", (int(v) if v is not None else -1 for v in (_get(item, "weather", "id") for item in items)))
+    indexes = [array("H", (intern(_get(item, section, key)) for item in items)) for section, key in STRING_FIELDS]
+
+    header = {k: v for k, v in data.items() if k != "list"}
+    city = json.dumps(header, separators=(",", ":")).encode("utf-8")
+    out = bytearray(MAGIC)
+    out += struct.pack("<HHI", n, len(strings), len(city))
+    out += city
+    for text in strings:
+        encoded = text.encode("utf-8")
+        out += struct.pack("<H", len(encoded)) + encoded
+    out += dts.tobytes()
+    for column in floats:
+        out += column.tobytes()
+    out += weather_ids.tobytes()
+    for column in indexes:
+        out += column.tobytes()
+    return bytes(out)
+
+
+class CompactForecast(Mapping):
+    """Read-only mapping over an encoded forecast; behaves like the original response dict."""
+
+    def __init__(self, raw: bytes) -> None:
+        if not raw.startswith(MAGIC):
+            raise ValueError("not an encoded forecast")
+        self._raw = raw
+        self._n, self._n_strings, city_len = struct.unpack_from("<HHI", raw, len(MAGIC))
+        self._offset = len(MAGIC) + 8
+        self._header: Dict[str, Any] = json.loads(raw[self._offset:self._offset + city_len])
+        self._offset += city_len
+        self._items: Optional[List[Dict[str, Any]]] = None
+
+    @property
+    def nbytes(self) -> int:
+        return len(self._raw)
+
+    def _decode_items(self) -> List[Dict[str, Any]]:
+        raw, pos, n = self._raw, self._offset, self._n
+        strings = []
+        for _ in range(self._n_strings):
+            (length,) = struct.unpack_from("<H", raw, pos)
+            strings.append(raw[pos + 2:pos + 2 + length].decode("utf-8"))
+            pos += 2 + length
+
+        def column(typecode: str) -> array:
+            nonlocal pos
+            values = array(typecode)
+            values.frombytes(raw[pos:pos + values.itemsize * n])
+            pos += values.itemsize * n
+            return values
+
+        dts = column("q")
+        floats = [column("f") for _ in FLOAT_FIELDS]
+        weather_ids = column("h")
+        indexes = [column("H") for _ in STRING_FIELDS]
+
+        items = []
+        for i in range(n):
+            item: Dict[str, Any] = {"dt": dts[i]}
+            for (section, key), values in zip(FLOAT_FIELDS, floats):
+                value = values[i]
+                if math.isnan(value):
+                    continue
+                value = round(value, 2)
+                if key in INT_FIELDS and value.is_integer():
+                    value = int(value)
+                if section is None:
+                    item[key] = value
+                else:
+                    item.setdefault(section, {})[key] = value
+            weather: Dict[str, Any] = {}
+            if weather_ids[i] >= 0:
+                weather["id"] = weather_ids[i]
+            for (section, key), values in zip(STRING_FIELDS, indexes):
+                if values[i] == _NONE:
+                    continue
+                if section == "weather":
+                    weather[key] = strings[values[i]]
+                else:
+                    item.setdefault(section, {})[key] = strings[values[i]]
+            item["weather"] = [weather] if weather else []
+            item["dt_txt"] = datetime.fromtimestamp(dts[i], tz=timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+            items.append(item)
+        return items
+
+    def __getitem__(self, key: str) -> Any:
+        if key == "list":
+            if self._items is None:
+                self._items = self._decode_items()
+            return self._items
+        return self._header[key]
+
+    def __iter__(self) -> Iterator[str]:
+        yield from self._header
+        yield "list"
+
+    def __len__(self) -> int:
+        return len(self._header) + 1
@@ -0,0 +1,179 @@
+import csv
+import io
+import json
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.engine import Engine
+
+from backEnd.models.model import WeatherForecast
+from backEnd.services.forecast_reader import forecast_columns
+
+EXPORT_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+# Every stored column except the raw upstream payload.
+METRIC_COLUMNS = [
+    "temperature_c",
+    "temp_min_c",
+    "temp_max_c",
+    "humidity_pct",
+    "pressure_hpa",
+    "wind_speed_ms",
+    "wind_gust_ms",
+    "wind_deg",
+    "precip_mm",
+    "snow_mm",
+    "cloud_pct",
+    "pop_pct",
+]
+EXPORT_COLUMNS = [
+    "id",
+    "location_id",
+    "provider_id",
+    "kind",
+    "snapshot_time",
+    "forecast_time",
+    "horizon_hours",
+    *METRIC_COLUMNS,
+    "weather_code",
+]
+
+
+def _export_statement(
+    location_id: Optional[str] = None,
+    provider_id: Optional[str] = None,
+    start_time: Optional[datetime] = None,
+    end_time: Optional[datetime] = None,
+):
+    stmt = select(*forecast_columns(EXPORT_COLUMNS))
+    if location_id:
+        stmt = stmt.where(WeatherForecast.location_id == location_id)
+    if provider_id:
+        stmt = stmt.where(WeatherForecast.provider_id == provider_id)
+    if start_time:
+        stmt = stmt.where(WeatherForecast.forecast_time >= start_time)
+    if end_time:
+        stmt = stmt.where(WeatherForecast.forecast_time < end_time)
+    return stmt.order_by(WeatherForecast.forecast_time.asc(), WeatherForecast.id.asc())
+
+
+def iter_forecast_batches(
+    engine: Engine,
+    *,
+    batch_size: int = 5000,
+    location_id: Optional[str] = None,
+    provider_id: Optional[str] = None,
+    start_time: Optional[datetime] = None,
+    end_time: Optional[datetime] = None,
+) -> Iterator[List[Dict[str, Any]]]:
+    """Yield forecast rows as lists of dicts, `batch_size` at a time, from a server-side cursor."""
+    stmt = _export_statement(location_id, provider_id, start_time, end_time)
+    with engine.connect() as conn:
+        result = conn.execution_options(yield_per=batch_size).execute(stmt)
+        for partition in result.mappings().partitions():
+            yield [dict(row) for row in partition]
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def encode_ndjson(batches: Iterator[List[Dict[str, Any]]]) -> Iterator[bytes]:
+    for batch in batches:
+        yield "".join(json.dumps(row, default=_json_default) + "\n" for row in batch).encode("utf-8")
+
+
+def encode_csv(batches: Iterator[List[Dict[str, Any]]]) -> Iterator[bytes]:
+    buf = io.StringIO()
+    writer = csv.DictWriter(buf, fieldnames=EXPORT_COLUMNS)
+    writer.writeheader()
+    for batch in batches:
+        writer.writerows(batch)
+        yield buf.getvalue().encode("utf-8")
+        buf.seek(0)
+        buf.truncate(0)
+    if buf.tell():
+        yield buf.getvalue().encode("utf-8")
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file object that hands written bytes back to the caller after each row group."""
+
+    def __init__(self) -> None:
+        self._chunks: List[bytes] = []
+        self._pos = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        chunk = bytes(data)
+        self._chunks.append(chunk)
+        self._pos += len(chunk)
+        return len(chunk)
+
+    def tell(self) -> int:
+        return self._pos
+
+    def drain(self) -> bytes:
+        out = b"".join(self._chunks)
+        self._chunks.clear()
+        return out
+
+
+def encode_parquet(batches: Iterator[List[Dict[str, Any]]]) -> Iterator[bytes]:
+    """One Parquet row group per batch. Requires the optional `pyarrow` package."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.schema(
+        [
+            ("id", pa.string()),
+            ("location_id", pa.string()),
+            ("provider_id", pa.string()),
+            ("kind", pa.string()),
+            ("snapshot_time", pa.timestamp("us")),
+            ("forecast_time", pa.timestamp("us")),
+            ("horizon_hours", pa.int32()),
+            *[(name, pa.float64()) for name in METRIC_COLUMNS],
+            ("weather_code", pa.string()),
+        ]
+    )
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(sink, schema, compression="zstd")
+    try:
+        for batch in batches:
+            writer.write_table(pa.Table.from_pylist(batch, schema=schema))
+            chunk = sink.drain()
+            if chunk:
+                yield chunk
+    finally:
+        writer.close()
+    yield sink.drain()
+
+
+def parquet_available() -> bool:
+    try:
+        import pyarrow.parquet  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+ENCODERS = {
+    "ndjson": encode_ndjson,
+    "csv": encode_csv,
+    "parquet": encode_parquet,
+}
+
+
+def export_forecasts(engine: Engine, fmt: str, **filters: Any) -> Iterator[bytes]:
+    """Stream stored forecasts in `fmt` (ndjson, csv or parquet) with constant memory."""
+    return ENCODERS[fmt](iter_forecast_batches(engine, **filters))
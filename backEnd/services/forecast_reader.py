@@ -0,0 +1,42 @@
+from typing import Any, List, Sequence
+
+from sqlalchemy import Float, type_coerce
+
+from backEnd.models.model import WeatherForecast
+
+# Numeric(p, s) columns on WeatherForecast. Core reads coerce them to Float so
+# rows carry plain floats instead of Decimal objects.
+NUMERIC_COLUMNS = frozenset(
+    {
+        "temperature_c",
+        "temp_min_c",
+        "temp_max_c",
+        "humidity_pct",
+        "pressure_hpa",
+        "wind_speed_ms",
+        "wind_gust_ms",
+        "wind_deg",
+        "precip_mm",
+        "snow_mm",
+        "cloud_pct",
+        "pop_pct",
+    }
+)
+
+
+def forecast_columns(names: Sequence[str], include_raw: bool = False) -> List[Any]:
+    """Labelled Core columns for a projection of `weather_forecasts`.
+
+    `payload_raw` is dropped unless `include_raw` is set, so the large JSON
+    text never leaves SQLite for the common read paths.
+    """
+    columns = []
+    for name in names:
+        if name == "payload_raw" and not include_raw:
+            continue
+        col = getattr(WeatherForecast, name)
+        columns.append(type_coerce(col, Float).label(name) if name in NUMERIC_COLUMNS else col)
+    if include_raw and "payload_raw" not in names:
+        columns.append(WeatherForecast.payload_raw)
+    return columns
+
@@ -0,0 +1,213 @@
+import asyncio
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+
+from sqlalchemy import Date, and_, case, cast, delete, func, select
+from sqlalchemy.engine import Engine
+
+from backEnd.core.config import settings
+from backEnd.core.database import dialect_insert
+from backEnd.core.metrics import run_in_threadpool
+from backEnd.models.model import WeatherForecast, WeatherForecastDaily, WeatherForecastHourly
+
+
+def _hour_bucket(col, dialect_name: str):
+    if dialect_name == "sqlite":
+        # Match the stored DateTime text format so range filters compare correctly.
+        return func.strftime("%Y-%m-%d %H:00:00.000000", col)
+    return func.date_trunc("hour", col)
+
+
+def _day_bucket(col, dialect_name: str):
+    if dialect_name == "sqlite":
+        return func.date(col)
+    return cast(col, Date)
+
+
+def _merge_min(current, incoming):
+    return case(
+        (incoming.is_(None), current),
+        (current.is_(None), incoming),
+        (incoming < current, incoming),
+        else_=current,
+    )
+
+
+def _merge_max(current, incoming):
+    return case(
+        (incoming.is_(None), current),
+        (current.is_(None), incoming),
+        (incoming > current, incoming),
+        else_=current,
+    )
+
+
+def _merge_sum(current, incoming):
+    return case(
+        (incoming.is_(None), current),
+        (current.is_(None), incoming),
+        else_=current + incoming,
+    )
+
+
+class ForecastRetentionService:
+    """Folds raw forecast snapshots older than the retention window into rollups.
+
+    Each batch covers one day of `snapshot_time` and runs in a single
+    transaction: upsert hourly buckets, recompute the affected daily rows from
+    the hourly table, then delete the compacted raw rows. All aggregation is
+    set-based SQL; no rows are materialised in Python.
+    """
+
+    def __init__(
+        self,
+        engine: Engine,
+        raw_retention_days: Optional[int] = None,
+        hourly_retention_days: Optional[int] = None,
+        max_batches: Optional[int] = None,
+    ) -> None:
+        self.engine = engine
+        self.dialect = engine.dialect.name
+        self.raw_retention_days = raw_retention_days if raw_retention_days is not None else settings.forecast_raw_retention_days
+        self.hourly_retention_days = (
+            hourly_retention_days if hourly_retention_days is not None else settings.forecast_hourly_retention_days
+        )
+        self.max_batches = max_batches if max_batches is not None else settings.forecast_retention_max_batches
+
+    # ---------- compaction ----------
+
+    def _compact_batch(self, conn, batch_end: datetime) -> int:
+        wf = WeatherForecast
+        bucket = _hour_bucket(wf.forecast_time, self.dialect).label("bucket_start")
+        source = (
+            select(
+                wf.location_id,
+                wf.provider_id,
+                bucket,
+                func.count().label("sample_count"),
+                func.count(wf.temperature_c).label("temp_count"),
+                func.sum(wf.temperature_c).label("temp_sum_c"),
+                func.min(wf.temperature_c).label("temp_min_c"),
+                func.max(wf.temperature_c).label("temp_max_c"),
+                func.count(wf.precip_mm).label("precip_count"),
+                func.sum(wf.precip_mm).label("precip_sum_mm"),
+                func.max(wf.wind_speed_ms).label("wind_max_ms"),
+            )
+            .where(wf.snapshot_time < batch_end)
+            .group_by(wf.location_id, wf.provider_id, bucket)
+        )
+        hourly = WeatherForecastHourly.__table__
+        columns = [
+            "location_id", "provider_id", "bucket_start", "sample_count", "temp_count", "temp_sum_c",
+            "temp_min_c", "temp_max_c", "precip_count", "precip_sum_mm", "wind_max_ms",
+        ]
+        stmt = dialect_insert(self.dialect, hourly).from_select(columns, source)
+        ex = stmt.excluded
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["location_id", "provider_id", "bucket_start"],
+            set_={
+                "sample_count": hourly.c.sample_count + ex.sample_count,
+                "temp_count": hourly.c.temp_count + ex.temp_count,
+                "temp_sum_c": _merge_sum(hourly.c.temp_sum_c, ex.temp_sum_c),
+                "temp_min_c": _merge_min(hourly.c.temp_min_c, ex.temp_min_c),
+                "temp_max_c": _merge_max(hourly.c.temp_max_c, ex.temp_max_c),
+                "precip_count": hourly.c.precip_count + ex.precip_count,
+                "precip_sum_mm": _merge_sum(hourly.c.precip_sum_mm, ex.precip_sum_mm),
+                "wind_max_ms": _merge_max(hourly.c.wind_max_ms, ex.wind_max_ms),
+            },
+        )
+
+        span = conn.execute(
+            select(func.min(wf.forecast_time), func.max(wf.forecast_time)).where(wf.snapshot_time < batch_end)
+        ).one()
+        if span[0] is None:
+            return 0
+        conn.execute(stmt)
+        self._refresh_daily(conn, span[0], span[1])
+        return conn.execute(delete(wf).where(wf.snapshot_time < batch_end)).rowcount or 0
+
+    def _refresh_daily(self, conn, first: datetime, last: datetime) -> None:
+        """Recompute daily rows for every day touched by a batch from the hourly table."""
+        h = WeatherForecastHourly
+        day_start = datetime(first.year, first.month, first.day)
+        day_end = datetime(last.year, last.month, last.day) + timedelta(days=1)
+        day = _day_bucket(h.bucket_start, self.dialect).label("day")
+        # Multiple snapshots predict the same hour; average them before summing the day.
+        hourly_precip = h.precip_sum_mm / func.nullif(h.precip_count, 0)
+        source = (
+            select(
+                h.location_id,
+                h.provider_id,
+                day,
+                func.min(h.temp_min_c).label("temp_min_c"),
+                func.max(h.temp_max_c).label("temp_max_c"),
+                (func.sum(h.temp_sum_c) / func.nullif(func.sum(h.temp_count), 0)).label("temp_mean_c"),
+                func.sum(hourly_precip).label("precip_total_mm"),
+                func.max(h.wind_max_ms).label("wind_max_ms"),
+                func.count().label("hours"),
+            )
+            .where(and_(h.bucket_start >= day_start, h.bucket_start < day_end))
+            .group_by(h.location_id, h.provider_id, day)
+        )
+        daily = WeatherForecastDaily.__table__
+        columns = [
+            "location_id", "provider_id", "day", "temp_min_c", "temp_max_c", "temp_mean_c",
+            "precip_total_mm", "wind_max_ms", "hours",
+        ]
+        stmt = dialect_insert(self.dialect, daily).from_select(columns, source)
+        ex = stmt.excluded
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["location_id", "provider_id", "day"],
+            set_={name: getattr(ex, name) for name in columns[3:]},
+        )
+        conn.execute(stmt)
+
+    def _purge_hourly(self, conn, now: datetime) -> int:
+        cutoff = now - timedelta(days=self.hourly_retention_days)
+        return conn.execute(
+            delete(WeatherForecastHourly).where(WeatherForecastHourly.bucket_start < cutoff)
+        ).rowcount or 0
+
+    def _incremental_vacuum(self) -> None:
+        if self.dialect != "sqlite":
+            return
+        with self.engine.begin() as conn:
+            # 2 == INCREMENTAL; files created before auto_vacuum was configured need a full VACUUM first.
+            if conn.exec_driver_sql("PRAGMA auto_vacuum").scalar() == 2:
+                # The pragma frees one page per step, so drain the cursor.
+                cursor = conn.connection.dbapi_connection.cursor()
+                try:
+                    cursor.execute(f"PRAGMA incremental_vacuum({int(settings.sqlite_incremental_vacuum_pages)})")
+                    cursor.fetchall()
+                finally:
+                    cursor.close()
+
+    def run_once(self, now: Optional[datetime] = None) -> Dict[str, Any]:
+        now = now or datetime.utcnow()
+        cutoff = now - timedelta(days=self.raw_retention_days)
+        compacted = 0
+        batches = 0
+        while batches < self.max_batches:
+            with self.engine.begin() as conn:
+                oldest = conn.execute(select(func.min(WeatherForecast.snapshot_time))).scalar()
+                if oldest is None or oldest >= cutoff:
+                    break
+                batch_end = min(cutoff, oldest + timedelta(days=1))
+                compacted += self._compact_batch(conn, batch_end)
+            batches += 1
+        with self.engine.begin() as conn:
+            purged_hourly = self._purge_hourly(conn, now)
+        if compacted or purged_hourly:
+            self._incremental_vacuum()
+        return {"batches": batches, "raw_rows_compacted": compacted, "hourly_rows_purged": purged_hourly}
+
+    async def run_periodic(self, interval_seconds: Optional[float] = None) -> None:
+        interval = interval_seconds or settings.forecast_retention_interval_seconds
+        while True:
+            try:
+                stats = await run_in_threadpool(self.run_once)
+                if stats["raw_rows_compacted"] or stats["hourly_rows_purged"]:
+                    print(f"Forecast retention: {stats}")
+            except Exception as e:
+                print(f"Forecast retention run failed: {type(e).__name__}: {str(e)}")
+            await asyncio.sleep(interval)
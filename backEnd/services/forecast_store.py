@@ -0,0 +1,258 @@
+import asyncio
+import json
+import re
+import threading
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from sqlalchemy import func, select
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from backEnd.core.config import settings
+from backEnd.core.database import dialect_insert, engine as default_engine
+from backEnd.core.metrics import run_in_threadpool
+from backEnd.models.model import Location, Provider, WeatherForecast
+from backEnd.services.forecast_writer import build_forecast_rows
+from backEnd.services.location_index import find_nearest_location
+
+"""
+Read-through forecast tier backed by the weather_forecasts table.
+
+On a cache miss WeatherService asks the store for the newest complete
+stored snapshot of the location (snapshots that POST /requests cut to a date
+range are skipped). Snapshots younger than FORECAST_STORE_MAX_AGE_SECONDS are
+served without calling OpenWeather (warm starts); older ones, up to
+FORECAST_STORE_STALE_SECONDS, are only served when the upstream call fails.
+
+Upstream fetches are queued and written back in batches: one transaction and
+one executemany per flush, every FORECAST_STORE_FLUSH_SECONDS or once
+_FLUSH_AT snapshots are pending. Only points that snap to an existing
+location (created by requests, favorites or bulk ingestion) are written back.
+"""
+
+PROVIDER_NAME = "openweather"
+PROVIDER_URL = "https://api.openweathermap.org/data/2.5"
+_FLUSH_AT = 50
+# Stored snapshots start at the fetch time; items older than this are dropped
+# so the first item served is "now", as in a fresh response.
+_PAST_ITEMS = timedelta(hours=3)
+# A snapshot is served only if it looks like a whole /forecast response:
+# first item within _PAST_ITEMS of the fetch, last one at least this far out
+# (the 5-day forecast reaches ~117 h).
+_MIN_HORIZON = timedelta(hours=96)
+_OFFSET_RE = re.compile(r"^([+-])(\d{2}):(\d{2})$")
+
+
+def _is_complete(snapshot_time: datetime, first: datetime, last: datetime) -> bool:
+    return first <= snapshot_time + _PAST_ITEMS and last >= snapshot_time + _MIN_HORIZON
+
+
+def _offset_label(seconds: int) -> str:
+    sign = "-" if seconds < 0 else "+"
+    minutes = abs(int(seconds)) // 60
+    return f"{sign}{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+def _offset_seconds(tz_name: Optional[str], lon: float) -> int:
+    """UTC offset for a location: a stored '+05:30' offset, an IANA zone, or a longitude estimate."""
+    match = _OFFSET_RE.match(tz_name or "")
+    if match:
+        seconds = int(match.group(2)) * 3600 + int(match.group(3)) * 60
+        return -seconds if match.group(1) == "-" else seconds
+    if tz_name:
+        try:
+            offset = datetime.now(ZoneInfo(tz_name)).utcoffset()
+            return int(offset.total_seconds()) if offset else 0
+        except (ZoneInfoNotFoundError, ValueError):
+            pass
+    return round(lon / 15) * 3600
+
+
+class ForecastStore:
+    def __init__(self, engine: Engine) -> None:
+        self.engine = engine
+        self.dialect = engine.dialect.name
+        self.stats: Dict[str, int] = defaultdict(int)
+        self._pending: List[Tuple[float, float, Dict[str, Any], datetime]] = []
+        self._lock = threading.Lock()
+        self._provider_id: Optional[str] = None
+        self._flush_task: Optional[asyncio.Task] = None
+
+    # ---------- read ----------
+
+    def _find_location(self, conn, lat: float, lon: float) -> Optional[Dict[str, Any]]:
+        """Same lookup as the API uses: the exact rounded point, else the nearest within the snap radius."""
+        key_lat, key_lon = round(float(lat), 5), round(float(lon), 5)
+        with Session(bind=conn) as db:
+            loc = db.query(Location).filter(Location.latitude == key_lat, Location.longitude == key_lon).first()
+            if loc is None:
+                nearest = find_nearest_location(db, key_lat, key_lon, settings.location_snap_radius_km)
+                loc = nearest[0] if nearest else None
+            if loc is None:
+                return None
+            return {
+                "id": loc.id,
+                "latitude": loc.latitude,
+                "longitude": loc.longitude,
+                "canonical_name": loc.canonical_name,
+                "country_code": loc.country_code,
+                "tz_name": loc.tz_name,
+            }
+
+    def _load(self, lat: float, lon: float, max_age_seconds: float) -> Optional[Tuple[Dict[str, Any], datetime]]:
+        now = datetime.utcnow()
+        with self.engine.connect() as conn:
+            location = self._find_location(conn, lat, lon)
+            provider_id = self._provider_id or conn.execute(select(Provider.id).where(Provider.name == PROVIDER_NAME)).scalar()
+            if location is None or provider_id is None:
+                return None
+            wf = WeatherForecast
+            # Uses idx_fc_loc_provider_snap. POST /requests stores snapshots cut to
+            # the request's date range; only snapshots covering the full horizon qualify.
+            candidates = conn.execute(
+                select(wf.snapshot_time, func.min(wf.forecast_time).label("first"), func.max(wf.forecast_time).label("last"))
+                .where(
+                    wf.location_id == location["id"],
+                    wf.provider_id == provider_id,
+                    wf.kind == "hourly",
+                    wf.snapshot_time >= now - timedelta(seconds=max_age_seconds),
+                )
+                .group_by(wf.snapshot_time)
+                .order_by(wf.snapshot_time.desc())
+            ).all()
+            snapshot = next((c.snapshot_time for c in candidates if _is_complete(c.snapshot_time, c.first, c.last)), None)
+            if snapshot is None:
+                return None
+            rows = conn.execute(
+                select(wf.forecast_time, wf.payload_raw)
+                .where(
+                    wf.location_id == location["id"],
+                    wf.provider_id == provider_id,
+                    wf.kind == "hourly",
+                    wf.snapshot_time == snapshot,
+                    wf.forecast_time >= now - _PAST_ITEMS,
+                )
+                .order_by(wf.forecast_time)
+            ).all()
+        items = [json.loads(r.payload_raw) for r in rows if r.payload_raw]
+        if not items:
+            return None
+        data = {
+            "cod": "200",
+            "cnt": len(items),
+            "list": items,
+            "city": {
+                "name": location["canonical_name"],
+                "country": location["country_code"] or "",
+                "timezone": _offset_seconds(location["tz_name"], location["longitude"]),
+                "coord": {"lat": location["latitude"], "lon": location["longitude"]},
+            },
+        }
+        return data, snapshot
+
+    async def load(self, lat: float, lon: float, max_age_seconds: float) -> Optional[Tuple[Dict[str, Any], datetime]]:
+        """Newest stored snapshot for (lat, lon) no older than `max_age_seconds`, with its snapshot_time."""
+        try:
+            return await run_in_threadpool(self._load, lat, lon, max_age_seconds)
+        except Exception as e:
+            self.stats["errors"] += 1
+            print(f"Forecast store read failed: {type(e).__name__}: {e}")
+            return None
+
+    # ---------- write-back ----------
+
+    def add(self, lat: float, lon: float, data: Dict[str, Any]) -> None:
+        """Queue an upstream response for the next batched write."""
+        with self._lock:
+            self._pending.append((lat, lon, data, datetime.utcnow()))
+            pending = len(self._pending)
+        if pending >= _FLUSH_AT and (self._flush_task is None or self._flush_task.done()):
+            self._flush_task = asyncio.create_task(run_in_threadpool(self.flush))
+
+    def _ensure_provider(self, conn) -> str:
+        if self._provider_id is None:
+            conn.execute(
+                dialect_insert(self.dialect, Provider.__table__)
+                .values(name=PROVIDER_NAME, base_url=PROVIDER_URL)
+                .on_conflict_do_nothing()
+            )
+            self._provider_id = conn.execute(select(Provider.id).where(Provider.name == PROVIDER_NAME)).scalar_one()
+        return self._provider_id
+
+    def _known_location(self, conn, lat: float, lon: float, city: Dict[str, Any]) -> Optional[str]:
+        """Id of the stored location this point snaps to, or None.
+
+        Write-back never creates locations: arbitrary summary points, live topics
+        and grid-cell centres would otherwise become user-facing snap targets.
+        """
+        found = self._find_location(conn, lat, lon)
+        if found is None:
+            return None
+        if not found["tz_name"] and city.get("timezone") is not None:
+            conn.execute(
+                Location.__table__.update()
+                .where(Location.id == found["id"])
+                .values(tz_name=_offset_label(city["timezone"]))
+            )
+        return found["id"]
+
+    def flush(self) -> int:
+        """Write every queued snapshot in one transaction; returns the number of rows inserted."""
+        with self._lock:
+            batch, self._pending = self._pending, []
+        if not batch:
+            return 0
+        try:
+            with self.engine.begin() as conn:
+                provider_id = self._ensure_provider(conn)
+                rows = []
+                skipped = 0
+                for lat, lon, data, snapshot_time in batch:
+                    location_id = self._known_location(conn, lat, lon, data.get("city") or {})
+                    if location_id is None:
+                        skipped += 1
+                        continue
+                    rows.extend(build_forecast_rows(location_id, provider_id, data, snapshot_time))
+                if rows:
+                    conn.execute(
+                        dialect_insert(self.dialect, WeatherForecast.__table__).on_conflict_do_nothing(
+                            index_elements=["location_id", "provider_id", "kind", "snapshot_time", "forecast_time"]
+                        ),
+                        rows,
+                    )
+        except Exception as e:
+            self._provider_id = None
+            self.stats["errors"] += 1
+            print(f"Forecast store write-back failed ({len(batch)} snapshots dropped): {type(e).__name__}: {e}")
+            return 0
+        self.stats["snapshots_written"] += len(batch) - skipped
+        self.stats["skipped_unknown_location"] += skipped
+        self.stats["rows_written"] += len(rows)
+        return len(rows)
+
+    async def run_periodic(self, interval_seconds: Optional[float] = None) -> None:
+        interval = interval_seconds or settings.forecast_store_flush_seconds
+        while True:
+            await asyncio.sleep(interval)
+            await run_in_threadpool(self.flush)
+
+    def summary(self) -> Dict[str, Any]:
+        with self._lock:
+            pending = len(self._pending)
+        return {**self.stats, "pending": pending}
+
+
+_store: Optional[ForecastStore] = None
+
+
+def get_forecast_store() -> Optional[ForecastStore]:
+    """Process-wide store, or None when FORECAST_STORE_ENABLED is off."""
+    global _store
+    if not settings.forecast_store_enabled:
+        return None
+    if _store is None:
+        _store = ForecastStore(default_engine)
+    return _store
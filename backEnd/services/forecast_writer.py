@@ -0,0 +1,63 @@
+import json
+from datetime import date, datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import insert
+
+from backEnd.models.model import WeatherForecast, gen_uuid
+
+
+def build_forecast_rows(
+    location_id: str,
+    provider_id: str,
+    data: Dict[str, Any],
+    snapshot_time: datetime,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+) -> List[Dict[str, Any]]:
+    """Turn OpenWeather /forecast 'list' items into weather_forecasts rows (plain dicts)."""
+    rows = []
+    for item in data.get("list", []):
+        dt = datetime.fromtimestamp(int(item.get("dt", 0)), tz=timezone.utc).replace(tzinfo=None)
+        if start_date and dt.date() < start_date:
+            continue
+        if end_date and dt.date() > end_date:
+            continue
+        main = item.get("main", {})
+        wind = item.get("wind", {})
+        rain = (item.get("rain") or {}).get("3h")
+        snow = (item.get("snow") or {}).get("3h")
+        weather = item.get("weather") or [{}]
+        pop = item.get("pop")
+        rows.append({
+            "id": gen_uuid(),
+            "location_id": location_id,
+            "provider_id": provider_id,
+            "kind": "hourly",
+            "snapshot_time": snapshot_time,
+            "forecast_time": dt,
+            "horizon_hours": int((dt - snapshot_time).total_seconds() // 3600),
+            "temperature_c": main.get("temp"),
+            "temp_min_c": main.get("temp_min"),
+            "temp_max_c": main.get("temp_max"),
+            "humidity_pct": main.get("humidity"),
+            "pressure_hpa": main.get("pressure"),
+            "wind_speed_ms": wind.get("speed"),
+            "wind_gust_ms": wind.get("gust"),
+            "wind_deg": wind.get("deg"),
+            "precip_mm": (rain or 0) + (snow or 0),
+            "snow_mm": snow,
+            "cloud_pct": (item.get("clouds") or {}).get("all"),
+            "pop_pct": (pop * 100 if pop is not None else None),
+            "weather_code": (str(weather[0]["id"]) if weather[0].get("id") is not None else None),
+            "payload_raw": json.dumps(item),
+        })
+    return rows
+
+
+def insert_forecast_rows(conn, rows: List[Dict[str, Any]]) -> int:
+    """Insert rows with a single executemany on `conn` (a Connection or Session)."""
+    if not rows:
+        return 0
+    conn.execute(insert(WeatherForecast.__table__), rows)
+    return len(rows)
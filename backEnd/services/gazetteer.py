@@ -0,0 +1,153 @@
+import csv
+import heapq
+import pathlib
+import threading
+import unicodedata
+from array import array
+from bisect import bisect_left
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from backEnd.core.config import settings
+
+"""
+Offline city gazetteer for autocomplete and query resolution.
+
+Entries are kept in parallel arrays sorted by normalized name, so a prefix is a
+contiguous slice found with two binary searches. Results are ranked by
+population. The very short prefixes (one or two characters) match large
+slices, so their top results are computed once at load time.
+
+Sources: the bundled `backEnd/data/cities.csv` (name, admin1, country, lat,
+lon, population) or a GeoNames `cities*.txt` dump via GAZETTEER_PATH.
+"""
+
+DEFAULT_PATH = pathlib.Path(__file__).resolve().parent.parent / "data" / "cities.csv"
+_PRECOMPUTED_PREFIX_LEN = 2
+_PRECOMPUTED_TOP = 25
+
+
+def normalize(text: str) -> str:
+    """Case- and accent-insensitive search key: 'São Paulo ' -> 'sao paulo'."""
+    decomposed = unicodedata.normalize("NFKD", text or "")
+    stripped = "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return " ".join(stripped.casefold().split())
+
+
+def _read_csv(path: str) -> Iterable[Tuple[str, str, str, float, float, int]]:
+    with open(path, newline="", encoding="utf-8") as fh:
+        for row in csv.DictReader(fh):
+            yield (
+                row["name"],
+                row.get("admin1") or "",
+                row.get("country") or "",
+                float(row["lat"]),
+                float(row["lon"]),
+                int(row.get("population") or 0),
+            )
+
+
+def _read_geonames(path: str) -> Iterable[Tuple[str, str, str, float, float, int]]:
+    # GeoNames dump columns: 1 name, 4 lat, 5 lon, 8 country code, 10 admin1 code, 14 population.
+    with open(path, encoding="utf-8") as fh:
+        for line in fh:
+            cols = line.rstrip("\n").split("\t")
+            if len(cols) < 15:
+                continue
+            yield cols[1], cols[10], cols[8], float(cols[4]), float(cols[5]), int(cols[14] or 0)
+
+
+class Gazetteer:
+    def __init__(self, entries: Iterable[Tuple[str, str, str, float, float, int]]) -> None:
+        rows = sorted(
+            ((normalize(name), name, admin1, country, lat, lon, pop) for name, admin1, country, lat, lon, pop in entries),
+            key=lambda r: (r[0], -r[6]),
+        )
+        self._keys: List[str] = [r[0] for r in rows]
+        self._names: List[str] = [r[1] for r in rows]
+        self._admin1: List[str] = [r[2] for r in rows]
+        self._country: List[str] = [r[3] for r in rows]
+        self._lat = array("d", (r[4] for r in rows))
+        self._lon = array("d", (r[5] for r in rows))
+        self._pop = array("q", (r[6] for r in rows))
+        self._admin1_keys = [normalize(a) for a in self._admin1]
+        self._country_keys = [normalize(c) for c in self._country]
+        self._top: Dict[str, List[int]] = {}
+        for length in range(1, _PRECOMPUTED_PREFIX_LEN + 1):
+            for prefix in {k[:length] for k in self._keys if len(k) >= length}:
+                lo, hi = self._range(prefix)
+                self._top[prefix] = heapq.nlargest(_PRECOMPUTED_TOP, range(lo, hi), key=self._pop.__getitem__)
+
+    @classmethod
+    def load(cls, path: str) -> "Gazetteer":
+        reader = _read_geonames if path.endswith(".txt") else _read_csv
+        return cls(reader(path))
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def _range(self, prefix: str) -> Tuple[int, int]:
+        return bisect_left(self._keys, prefix), bisect_left(self._keys, prefix + "\uffff")
+
+    def _qualifies(self, i: int, qualifiers: List[str]) -> bool:
+        return all(self._admin1_keys[i].startswith(q) or self._country_keys[i].startswith(q) for q in qualifiers)
+
+    def _entry(self, i: int) -> Dict[str, Any]:
+        return {
+            "name": self._names[i],
+            "admin1": self._admin1[i] or None,
+            "country": self._country[i],
+            "lat": self._lat[i],
+            "lon": self._lon[i],
+            "population": self._pop[i],
+            "label": ", ".join(p for p in (self._names[i], self._admin1[i], self._country[i]) if p),
+        }
+
+    @staticmethod
+    def _split(query: str) -> Tuple[str, List[str]]:
+        # "Paris, Texas, US" -> name "paris", qualifiers matched against admin1/country.
+        parts = [normalize(p) for p in (query or "").split(",")]
+        return parts[0], [p for p in parts[1:] if p]
+
+    def suggest(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """Entries whose name starts with `query`, most populous first."""
+        prefix, qualifiers = self._split(query)
+        if not prefix:
+            return []
+        if not qualifiers and limit <= _PRECOMPUTED_TOP and prefix in self._top:
+            return [self._entry(i) for i in self._top[prefix][:limit]]
+        lo, hi = self._range(prefix)
+        candidates = (i for i in range(lo, hi) if self._qualifies(i, qualifiers))
+        return [self._entry(i) for i in heapq.nlargest(limit, candidates, key=self._pop.__getitem__)]
+
+    def lookup(self, query: str) -> Optional[Dict[str, Any]]:
+        """Most populous entry whose name equals `query` exactly (after normalization)."""
+        name, qualifiers = self._split(query)
+        if not name:
+            return None
+        lo, hi = bisect_left(self._keys, name), bisect_left(self._keys, name + "\x00")
+        for i in range(lo, hi):  # equal keys are already sorted by population, descending
+            if self._qualifies(i, qualifiers):
+                return self._entry(i)
+        return None
+
+
+_gazetteer: Optional[Gazetteer] = None
+_gazetteer_lock = threading.Lock()
+
+
+def get_gazetteer() -> Optional[Gazetteer]:
+    """Process-wide gazetteer, loaded on first use. None when disabled or the file is missing."""
+    global _gazetteer
+    if not settings.gazetteer_enabled:
+        return None
+    if _gazetteer is None:
+        with _gazetteer_lock:
+            if _gazetteer is None:
+                path = settings.gazetteer_path or str(DEFAULT_PATH)
+                try:
+                    _gazetteer = Gazetteer.load(path)
+                except OSError as e:
+                    print(f"Gazetteer unavailable ({path}): {e}")
+                    return None
+                print(f"Gazetteer loaded: {len(_gazetteer)} places from {path}")
+    return _gazetteer
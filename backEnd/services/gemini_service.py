@@ -1,9 +1,15 @@
+import hashlib
 import json
 from typing import Any, Dict, List
 
 import httpx
 
+from backEnd.core.cache import get_cache
 from backEnd.core.config import settings
+from backEnd.core.metrics import track_upstream
+
+# Insights keyed on a hash of model + prompt: the same forecast context gets the same brief.
+_insight_cache = get_cache("gemini")
 
 
 class GeminiService:
@@ -26,6 +32,10 @@ class GeminiService:
             return None
 
         prompt = self._build_prompt(weather_context)
+        key = hashlib.sha256(f"{self.model}\n{prompt}".encode("utf-8")).hexdigest()
+        cached = await _insight_cache.get(key)
+        if cached is not None:
+            return cached
         payload = {
             "contents": [
                 {
@@ -66,15 +76,17 @@ class GeminiService:
 
         url = f"{self.base_url}/models/{self.model}:generateContent"
         timeout = httpx.Timeout(settings.api_timeout)
-        async with httpx.AsyncClient(timeout=timeout) as client:
-            response = await client.post(
-                url,
-                headers={
-                    "Content-Type": "application/json",
-                    "x-goog-api-key": self.api_key,
-                },
-                json=payload,
-            )
+        with track_upstream("gemini") as call:
+            async with httpx.AsyncClient(timeout=timeout) as client:
+                response = await client.post(
+                    url,
+                    headers={
+                        "Content-Type": "application/json",
+                        "x-goog-api-key": self.api_key,
+                    },
+                    json=payload,
+                )
+            call.status = response.status_code
             response.raise_for_status()
 
         response_payload = response.json()
@@ -90,7 +102,10 @@ class GeminiService:
         except json.JSONDecodeError:
             return None
 
-        return self._normalize_insight(generated)
+        insight = self._normalize_insight(generated)
+        if insight:
+            await _insight_cache.set(key, insight, settings.gemini_cache_ttl_seconds)
+        return insight
 
     def _build_prompt(self, weather_context: Dict[str, Any]) -> str:
         compact_context = {
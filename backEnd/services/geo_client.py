@@ -2,6 +2,7 @@ from typing import Dict, Any, Optional, List
 import httpx
 from fastapi import HTTPException
 from backEnd.core.config import settings
+from backEnd.core.metrics import track_upstream
 
 
 class GeoClient:
@@ -12,8 +13,10 @@ class GeoClient:
         url = f"{self.base_url}/{path}"
         timeout = httpx.Timeout(settings.api_timeout)
         try:
-            async with httpx.AsyncClient(timeout=timeout) as client:
-                response = await client.get(url, params=params)
+            with track_upstream("geocoding") as call:
+                async with httpx.AsyncClient(timeout=timeout) as client:
+                    response = await client.get(url, params=params)
+                call.status = response.status_code
                 if response.status_code == 401:
                     raise HTTPException(
                         status_code=502,
@@ -1,6 +1,12 @@
 from typing import Optional, Tuple
+from backEnd.core.cache import cache_key, get_cache
 from backEnd.core.config import settings
 from .geo_client import GeoClient
+from .gazetteer import get_gazetteer
+
+# Upstream geocoding answers (including "not found", stored as []) are cached.
+_geo_cache = get_cache("geo")
+
 
 class GeoService:
     def __init__(self, client: GeoClient | None = None):
@@ -8,8 +14,18 @@ class GeoService:
     async def  resolve_coords_from_query(self, q: str) -> Optional[Tuple[float, float, str]]:
         '''Returns latitude, longitude and city name of the given query.'''
 
+        # Known cities are answered offline; only misses go to the upstream geocoder.
+        gazetteer = get_gazetteer()
+        hit = gazetteer.lookup(q) if gazetteer else None
+        if hit:
+            return (hit["lat"], hit["lon"], hit["label"])
+        key = cache_key("direct", q.strip().lower())
+        cached = await _geo_cache.get(key)
+        if cached is not None:
+            return tuple(cached) if cached else None
         rows = await self.client.direct(q=q, appid = settings.api_weather_key, limit = 1)
         if not rows:
+            await _geo_cache.set(key, [], settings.geo_cache_ttl_seconds)
             return None
         row = rows[0]
         lat, lon = float(row["lat"]), float(row["lon"])
@@ -17,15 +33,23 @@ class GeoService:
         country = row.get("country") or ""
         state = row.get("state") or ""
         place = ", ".join([p for p in [name, state, country] if p])
+        await _geo_cache.set(key, [lat, lon, place], settings.geo_cache_ttl_seconds)
         return (lat, lon, place)
     async def resolve_place_from_coords(self, lat:float, lon:float) -> Optional[str]:
         '''Returns city name of the given latitude and longitude.'''
+        key = cache_key("reverse", round(float(lat), 4), round(float(lon), 4))
+        cached = await _geo_cache.get(key)
+        if cached is not None:
+            return cached or None
         rows = await self.client.reverse(lat=lat, lon=lon, appid=settings.api_weather_key, limit=1)
         print(rows)
         if not rows:
+            await _geo_cache.set(key, "", settings.geo_cache_ttl_seconds)
             return None
         row = rows[0]
         name = row.get("name") or ""
         country = row.get("country") or ""
         state = row.get("state") or ""
-        return ", ".join([p for p in [name, state, country] if p]) or None
+        place = ", ".join([p for p in [name, state, country] if p]) or None
+        await _geo_cache.set(key, place or "", settings.geo_cache_ttl_seconds)
+        return place
@@ -0,0 +1,163 @@
+import asyncio
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from fastapi import HTTPException
+
+from backEnd.core.config import settings
+from backEnd.core.metrics import run_in_threadpool
+from backEnd.services.weather_service import WeatherService
+
+"""
+Live forecast updates for subscribed dashboards (GET /api/weather/live).
+
+Subscribers register (lat, lon, units) topics. Each topic has one refresh
+loop, however many subscribers it has: every LIVE_REFRESH_SECONDS it reads
+the forecast through WeatherService (so the shared cache and store decide
+whether OpenWeather is called at all), rebuilds the summary context and, if
+it changed, pushes a JSON-patch style diff to every subscriber. A new
+subscriber first gets the full context as a snapshot. Idle subscribers cost
+one asyncio queue each; loops stop when a topic's last subscriber leaves.
+"""
+
+Topic = Tuple[float, float, str]
+
+
+def _escape(key: str) -> str:
+    return str(key).replace("~", "~0").replace("/", "~1")
+
+
+def json_diff(old: Any, new: Any, path: str = "") -> List[Dict[str, Any]]:
+    """RFC 6902 style operations (add/remove/replace) that turn `old` into `new`.
+
+    Dicts are compared key by key and equal-length lists item by item; a list
+    that changed length is replaced whole.
+    """
+    if isinstance(old, dict) and isinstance(new, dict):
+        ops: List[Dict[str, Any]] = []
+        for key in old:
+            if key not in new:
+                ops.append({"op": "remove", "path": f"{path}/{_escape(key)}"})
+        for key, value in new.items():
+            if key not in old:
+                ops.append({"op": "add", "path": f"{path}/{_escape(key)}", "value": value})
+            else:
+                ops.extend(json_diff(old[key], value, f"{path}/{_escape(key)}"))
+        return ops
+    if isinstance(old, list) and isinstance(new, list) and len(old) == len(new):
+        ops = []
+        for i, (a, b) in enumerate(zip(old, new)):
+            ops.extend(json_diff(a, b, f"{path}/{i}"))
+        return ops
+    if old == new and type(old) is type(new):
+        return []
+    return [{"op": "replace", "path": path or "", "value": new}]
+
+
+class _TopicState:
+    def __init__(self) -> None:
+        self.subscribers: Set[asyncio.Queue] = set()
+        self.context: Optional[Dict[str, Any]] = None
+        self.task: Optional[asyncio.Task] = None
+        self.lock = asyncio.Lock()
+
+
+class LiveHub:
+    def __init__(self, weather_service: Optional[WeatherService] = None, refresh_seconds: Optional[float] = None) -> None:
+        self.wx = weather_service or WeatherService()
+        self.refresh_seconds = refresh_seconds or settings.live_refresh_seconds
+        self._topics: Dict[Topic, _TopicState] = {}
+        self.stats: Dict[str, int] = {"refreshes": 0, "patches_sent": 0, "unchanged": 0, "errors": 0, "resets": 0}
+
+    @staticmethod
+    def topic(lat: float, lon: float, units: Optional[str] = None) -> Topic:
+        return round(float(lat), 4), round(float(lon), 4), units or settings.units
+
+    async def _build(self, topic: Topic) -> Dict[str, Any]:
+        lat, lon, units = topic
+        data = await self.wx.fetch_data(lat, lon)
+        return await run_in_threadpool(self.wx.build_context, data, units=units)
+
+    def _publish(self, state: _TopicState, message: Dict[str, Any]) -> None:
+        for queue in state.subscribers:
+            if queue.qsize() >= queue.maxsize - 1:
+                # Too slow to keep up: drop the backlog and tell the stream to close, so the
+                # client reconnects and starts again from fresh snapshots.
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait({"type": "reset"})
+                self.stats["resets"] += 1
+            else:
+                queue.put_nowait(message)
+
+    async def _refresh_loop(self, topic: Topic) -> None:
+        state = self._topics[topic]
+        while True:
+            await asyncio.sleep(self.refresh_seconds)
+            try:
+                context = await self._build(topic)
+            except HTTPException as e:
+                self.stats["errors"] += 1
+                print(f"Live refresh failed for {topic}: {e.detail}")
+                continue
+            except Exception as e:
+                # Anything else (bad payload, DB hiccup) must not end the topic's refreshes.
+                self.stats["errors"] += 1
+                print(f"Live refresh failed for {topic}: {type(e).__name__}: {e}")
+                continue
+            self.stats["refreshes"] += 1
+            ops = json_diff(state.context, context)
+            state.context = context
+            if not ops:
+                self.stats["unchanged"] += 1
+                continue
+            self.stats["patches_sent"] += len(state.subscribers)
+            self._publish(state, {"type": "patch", "topic": list(topic), "ops": ops})
+
+    async def subscribe(self, topics: List[Topic]) -> asyncio.Queue:
+        """Register a subscriber; its queue receives a snapshot per topic, then patches."""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=settings.live_queue_size + len(topics))
+        for topic in topics:
+            state = self._topics.get(topic)
+            if state is None:
+                state = self._topics[topic] = _TopicState()
+            state.subscribers.add(queue)
+            async with state.lock:  # concurrent first subscribers share one fetch
+                if state.context is None:
+                    try:
+                        state.context = await self._build(topic)
+                    except Exception:
+                        self.unsubscribe(queue, topics)
+                        raise
+            if state.task is None or state.task.done():
+                state.task = asyncio.create_task(self._refresh_loop(topic))
+            queue.put_nowait({"type": "snapshot", "topic": list(topic), "data": state.context})
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue, topics: List[Topic]) -> None:
+        for topic in topics:
+            state = self._topics.get(topic)
+            if state is None:
+                continue
+            state.subscribers.discard(queue)
+            if not state.subscribers:
+                if state.task is not None:
+                    state.task.cancel()
+                del self._topics[topic]
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            "topics": len(self._topics),
+            "subscriptions": sum(len(s.subscribers) for s in self._topics.values()),
+            "refresh_seconds": self.refresh_seconds,
+        }
+
+
+_hub: Optional[LiveHub] = None
+
+
+def get_live_hub() -> LiveHub:
+    global _hub
+    if _hub is None:
+        _hub = LiveHub()
+    return _hub
@@ -0,0 +1,79 @@
+import math
+from typing import Optional, Tuple
+
+from sqlalchemy import and_, case, func, or_
+from sqlalchemy.orm import Session
+
+from backEnd.models.model import Location
+
+EARTH_RADIUS_KM = 6371.0088
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    p1, p2 = math.radians(lat1), math.radians(lat2)
+    dp = p2 - p1
+    dl = math.radians(lon2 - lon1)
+    a = math.sin(dp / 2) ** 2 + math.cos(p1) * math.cos(p2) * math.sin(dl / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def coordinate_name(lat: float, lon: float) -> str:
+    """Placeholder canonical_name for locations created without a geocoded name."""
+    return f"{round(float(lat), 5):.5f}, {round(float(lon), 5):.5f}"
+
+
+def has_coordinate_name(loc: Location) -> bool:
+    return loc.canonical_name == coordinate_name(loc.latitude, loc.longitude)
+
+
+def _bbox_filter(lat: float, lon: float, radius_km: float):
+    """Bounding-box predicate over (latitude, longitude) that idx_locations_geo can range-scan."""
+    dlat = math.degrees(radius_km / EARTH_RADIUS_KM)
+    min_lat, max_lat = lat - dlat, lat + dlat
+    lat_range = and_(Location.latitude >= min_lat, Location.latitude <= max_lat)
+    cos_lat = math.cos(math.radians(max(abs(min_lat), abs(max_lat))))
+    if max_lat >= 90 or min_lat <= -90 or cos_lat <= 1e-9:
+        # The box reaches a pole: every longitude is in range.
+        return lat_range
+    dlon = math.degrees(radius_km / (EARTH_RADIUS_KM * cos_lat))
+    min_lon, max_lon = lon - dlon, lon + dlon
+    if min_lon < -180:
+        lon_range = or_(Location.longitude >= min_lon + 360, Location.longitude <= max_lon)
+    elif max_lon > 180:
+        lon_range = or_(Location.longitude >= min_lon, Location.longitude <= max_lon - 360)
+    else:
+        lon_range = and_(Location.longitude >= min_lon, Location.longitude <= max_lon)
+    return and_(lat_range, lon_range)
+
+
+def _approx_distance(lat: float, lon: float):
+    """Equirectangular squared distance in degrees; ranks candidates like haversine does over short ranges."""
+    dlat = Location.latitude - lat
+    dlon = func.abs(Location.longitude - lon)
+    dlon = case((dlon > 180, 360 - dlon), else_=dlon) * math.cos(math.radians(lat))
+    return dlat * dlat + dlon * dlon
+
+
+def find_nearest_location(db: Session, lat: float, lon: float, radius_km: float) -> Optional[Tuple[Location, float]]:
+    """Nearest stored location within `radius_km` of (lat, lon), with its distance in km.
+
+    The bounding box narrows candidates through the (latitude, longitude)
+    index. The closest 256 by approximate distance are kept, so a dense area
+    cannot push the true nearest out; exact great-circle distance is only
+    computed for those rows.
+    """
+    if radius_km <= 0:
+        return None
+    candidates = (
+        db.query(Location)
+        .filter(_bbox_filter(lat, lon, radius_km))
+        .order_by(_approx_distance(lat, lon))
+        .limit(256)
+        .all()
+    )
+    best: Optional[Tuple[Location, float]] = None
+    for loc in candidates:
+        dist = haversine_km(lat, lon, loc.latitude, loc.longitude)
+        if dist <= radius_km and (best is None or dist < best[1]):
+            best = (loc, dist)
+    return best
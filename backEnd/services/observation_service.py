@@ -0,0 +1,249 @@
+import asyncio
+import csv
+import json
+import math
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from fastapi import HTTPException
+from sqlalchemy import Integer, String, and_, cast, extract, func, literal, select
+from sqlalchemy.engine import Engine
+
+from backEnd.core.database import dialect_insert
+from backEnd.core.metrics import run_in_threadpool
+from backEnd.models.model import Location, Provider, WeatherForecast, WeatherObservation
+from backEnd.services.weather_service import WeatherService
+
+OBSERVATION_COLUMNS = [
+    "temperature_c",
+    "humidity_pct",
+    "pressure_hpa",
+    "wind_speed_ms",
+    "wind_gust_ms",
+    "wind_deg",
+    "precip_mm",
+    "snow_mm",
+    "cloud_pct",
+    "visibility_m",
+    "uv_index",
+    "weather_code",
+]
+
+# Metrics that exist on both forecasts and observations and can be scored.
+ACCURACY_METRICS = {"temperature_c", "humidity_pct", "pressure_hpa", "wind_speed_ms", "wind_gust_ms", "precip_mm", "cloud_pct"}
+# Forecast precip_mm is a 3-hour accumulation (rain/snow "3h"), observations
+# hold the last hour ("1h"); forecasts are scored as the mean hourly amount.
+FORECAST_PRECIP_HOURS = 3
+
+
+def parse_current_weather(location_id: str, provider_id: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Map an OpenWeather /weather (current conditions) response to a weather_observations row."""
+    main = payload.get("main", {})
+    wind = payload.get("wind", {})
+    rain = (payload.get("rain") or {}).get("1h")
+    snow = (payload.get("snow") or {}).get("1h")
+    weather = payload.get("weather") or [{}]
+    return {
+        "location_id": location_id,
+        "provider_id": provider_id,
+        "observed_at": datetime.fromtimestamp(int(payload.get("dt", 0)), tz=timezone.utc).replace(tzinfo=None),
+        "temperature_c": main.get("temp"),
+        "humidity_pct": main.get("humidity"),
+        "pressure_hpa": main.get("pressure"),
+        "wind_speed_ms": wind.get("speed"),
+        "wind_gust_ms": wind.get("gust"),
+        "wind_deg": wind.get("deg"),
+        "precip_mm": (rain or 0) + (snow or 0),
+        "snow_mm": snow,
+        "cloud_pct": (payload.get("clouds") or {}).get("all"),
+        "visibility_m": payload.get("visibility"),
+        "weather_code": (str(weather[0]["id"]) if weather[0].get("id") is not None else None),
+        "payload_raw": json.dumps(payload),
+    }
+
+
+def read_observation_file(path: str) -> Iterator[Dict[str, Any]]:
+    """Yield observation rows from an NDJSON or CSV file.
+
+    Each record needs `location_id` and an ISO-8601 `observed_at`; any of
+    OBSERVATION_COLUMNS may be present. Empty CSV cells are treated as NULL.
+    """
+    with open(path, newline="", encoding="utf-8") as fh:
+        if path.endswith((".ndjson", ".jsonl", ".json")):
+            records: Iterable[Dict[str, Any]] = (json.loads(line) for line in fh if line.strip())
+        else:
+            records = csv.DictReader(fh)
+        for record in records:
+            row: Dict[str, Any] = {
+                "location_id": record["location_id"],
+                "observed_at": datetime.fromisoformat(str(record["observed_at"]).replace("Z", "+00:00")).replace(tzinfo=None),
+            }
+            for name in OBSERVATION_COLUMNS:
+                value = record.get(name)
+                if value in (None, ""):
+                    continue
+                row[name] = value if name == "weather_code" else float(value)
+            yield row
+
+
+class ObservationService:
+    """Batch-loads weather_observations and scores stored forecasts against them."""
+
+    def __init__(self, engine: Engine, weather_service: Optional[WeatherService] = None) -> None:
+        self.engine = engine
+        self.dialect = engine.dialect.name
+        self.wx = weather_service or WeatherService()
+
+    # ---------- ingestion ----------
+
+    def provider_id(self, name: str, base_url: Optional[str] = None) -> str:
+        with self.engine.begin() as conn:
+            found = conn.execute(select(Provider.id).where(Provider.name == name)).scalar()
+            if found:
+                return found
+            conn.execute(dialect_insert(self.dialect, Provider.__table__).values(name=name, base_url=base_url).on_conflict_do_nothing())
+            return conn.execute(select(Provider.id).where(Provider.name == name)).scalar_one()
+
+    def tracked_locations(self, location_ids: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        stmt = select(Location.id, Location.latitude, Location.longitude)
+        if location_ids:
+            stmt = stmt.where(Location.id.in_(location_ids))
+        with self.engine.connect() as conn:
+            return [dict(r) for r in conn.execute(stmt).mappings()]
+
+    def store_batch(self, rows: List[Dict[str, Any]]) -> int:
+        """Insert rows in one transaction; duplicates of (location, provider, observed_at) are skipped."""
+        if not rows:
+            return 0
+        stmt = dialect_insert(self.dialect, WeatherObservation.__table__).on_conflict_do_nothing(
+            index_elements=["location_id", "provider_id", "observed_at"]
+        )
+        with self.engine.begin() as conn:
+            return conn.execute(stmt, rows).rowcount or 0
+
+    def load_rows(self, rows: Iterable[Dict[str, Any]], provider_id: str, batch_size: int = 5000) -> int:
+        # executemany needs every dict to carry the same keys.
+        template = {name: None for name in OBSERVATION_COLUMNS}
+        stored = 0
+        batch: List[Dict[str, Any]] = []
+        for row in rows:
+            batch.append({**template, "provider_id": provider_id, "payload_raw": None, **row})
+            if len(batch) >= batch_size:
+                stored += self.store_batch(batch)
+                batch = []
+        return stored + self.store_batch(batch)
+
+    async def ingest_current(self, location_ids: Optional[List[str]] = None, concurrency: int = 8) -> Dict[str, int]:
+        """Fetch current conditions for tracked locations and store them as one batch."""
+        provider_id = await run_in_threadpool(self.provider_id, "openweather", "https://api.openweathermap.org/data/2.5")
+        locations = await run_in_threadpool(self.tracked_locations, location_ids)
+        sem = asyncio.Semaphore(concurrency)
+        errors = 0
+
+        async def _one(loc: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+            nonlocal errors
+            async with sem:
+                try:
+                    # Observations are always stored in SI units, like forecasts.
+                    payload = await self.wx.fetch_current(loc["latitude"], loc["longitude"], units="metric")
+                except HTTPException as e:
+                    errors += 1
+                    print(f"Observation fetch failed for {loc['id']}: {e.detail}")
+                    return None
+            return parse_current_weather(loc["id"], provider_id, payload)
+
+        rows = [r for r in await asyncio.gather(*(_one(loc) for loc in locations)) if r]
+        stored = await run_in_threadpool(self.store_batch, rows)
+        return {"locations": len(locations), "observations_stored": stored, "errors": errors}
+
+    # ---------- accuracy ----------
+
+    def _seconds_between(self, later, earlier):
+        if self.dialect == "sqlite":
+            return (func.julianday(later) - func.julianday(earlier)) * 86400.0
+        return extract("epoch", later - earlier)
+
+    def _shift(self, col, minutes: int):
+        if self.dialect == "sqlite":
+            # Render like the stored column ("YYYY-MM-DD HH:MM:SS.ffffff") so the string
+            # comparison is exact and idx_obs_loc_time still serves the range; %f only has ms.
+            modifier = f"{minutes:+d} minutes"
+            seconds = func.strftime("%Y-%m-%d %H:%M:%S", col, modifier, type_=String)
+            millis = func.substr(func.strftime("%f", col, modifier, type_=String), 4, type_=String)
+            return seconds + "." + millis + "000"
+        return col + timedelta(minutes=minutes)
+
+    def accuracy_by_horizon(
+        self,
+        *,
+        metric: str = "temperature_c",
+        location_id: Optional[str] = None,
+        provider_id: Optional[str] = None,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None,
+        max_gap_minutes: int = 90,
+        horizon_bucket_hours: int = 3,
+    ) -> List[Dict[str, Any]]:
+        """Error statistics of `metric` grouped by forecast horizon.
+
+        Each forecast row is paired with the observation at the same location
+        closest to its forecast_time (within max_gap_minutes). Pairing and
+        aggregation run in SQL with a window function; only one row per
+        horizon bucket comes back.
+        """
+        f = WeatherForecast.__table__.alias("f")
+        o = WeatherObservation.__table__.alias("o")
+        gap = func.abs(self._seconds_between(o.c.observed_at, f.c.forecast_time))
+        horizon = func.coalesce(f.c.horizon_hours, self._seconds_between(f.c.forecast_time, f.c.snapshot_time) / 3600.0)
+        forecast_value = f.c[metric] / float(FORECAST_PRECIP_HOURS) if metric == "precip_mm" else f.c[metric]
+        error = forecast_value - o.c[metric]
+
+        conditions = [
+            o.c.location_id == f.c.location_id,
+            o.c.observed_at >= self._shift(f.c.forecast_time, -max_gap_minutes),
+            o.c.observed_at <= self._shift(f.c.forecast_time, max_gap_minutes),
+            f.c[metric].isnot(None),
+            o.c[metric].isnot(None),
+        ]
+        if location_id:
+            conditions.append(f.c.location_id == location_id)
+        if provider_id:
+            conditions.append(f.c.provider_id == provider_id)
+        if start_time:
+            conditions.append(f.c.forecast_time >= start_time)
+        if end_time:
+            conditions.append(f.c.forecast_time < end_time)
+
+        pairs = (
+            select(
+                (cast(func.floor(horizon / horizon_bucket_hours), Integer) * horizon_bucket_hours).label("horizon"),
+                error.label("err"),
+                func.row_number().over(partition_by=f.c.id, order_by=gap).label("rn"),
+            )
+            .select_from(f.join(o, and_(*conditions)))
+            .subquery()
+        )
+        stmt = (
+            select(
+                pairs.c.horizon,
+                func.count().label("pairs"),
+                func.avg(pairs.c.err).label("bias"),
+                func.avg(func.abs(pairs.c.err)).label("mae"),
+                func.avg(pairs.c.err * pairs.c.err).label("mse"),
+            )
+            .where(pairs.c.rn == literal(1))
+            .group_by(pairs.c.horizon)
+            .order_by(pairs.c.horizon)
+        )
+        with self.engine.connect() as conn:
+            rows = conn.execute(stmt).all()
+        return [
+            {
+                "horizon_hours": int(r.horizon),
+                "pairs": r.pairs,
+                "bias": (float(r.bias) if r.bias is not None else None),
+                "mae": (float(r.mae) if r.mae is not None else None),
+                "rmse": (math.sqrt(float(r.mse)) if r.mse is not None else None),
+            }
+            for r in rows
+        ]
@@ -0,0 +1,289 @@
+import asyncio
+import time
+from collections import defaultdict, deque
+from datetime import date, datetime
+from typing import Any, Deque, Dict, List, Optional, Set
+
+from fastapi import HTTPException
+from sqlalchemy import select, update
+from sqlalchemy.engine import Engine
+
+from backEnd.core.config import settings
+from backEnd.core.database import dialect_insert, engine as default_engine
+from backEnd.core.metrics import run_in_threadpool
+from backEnd.models.model import Location, Provider, Request as RequestModel
+from backEnd.services.forecast_store import PROVIDER_NAME, PROVIDER_URL
+from backEnd.services.forecast_writer import build_forecast_rows, insert_forecast_rows
+from backEnd.services.weather_service import WeatherService
+
+"""
+In-process job queue for POST /requests?wait=false.
+
+The handler inserts the request row with status "pending" and returns 202;
+a pool of REQUEST_QUEUE_WORKERS workers does the forecast fetch and insert.
+Each worker takes up to REQUEST_QUEUE_BATCH_SIZE queued jobs at a time,
+fetches once per distinct location, and writes every job's rows and its
+new status in one transaction. Upstream failures are retried with
+exponential backoff; after REQUEST_QUEUE_MAX_ATTEMPTS the request is marked
+"error" with the reason in error_message. A failed batch write is retried
+the same way; requests that cannot be retried are marked "error" in a
+separate transaction.
+
+The queue is memory-only: on startup, rows still "pending" (e.g. after a
+crash) are queued again.
+"""
+
+_LATENCY_SAMPLES = 1000
+
+
+def _percentile(samples: Deque[float], pct: float) -> Optional[float]:
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    return round(ordered[min(len(ordered) - 1, int(len(ordered) * pct))], 2)
+
+
+def _as_date(value: Any) -> Optional[date]:
+    if value is None or isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value))
+
+
+class RequestQueue:
+    def __init__(self, engine: Engine, weather_service: Optional[WeatherService] = None) -> None:
+        self.engine = engine
+        self.dialect = engine.dialect.name
+        self.wx = weather_service or WeatherService()
+        self.workers = max(1, settings.request_queue_workers)
+        self.batch_size = max(1, settings.request_queue_batch_size)
+        self.max_attempts = max(1, settings.request_queue_max_attempts)
+        self.retry_seconds = settings.request_queue_retry_seconds
+        self.stats: Dict[str, int] = defaultdict(int)
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        self._retry_tasks: Set[asyncio.Task] = set()
+        self._in_flight = 0
+        self._waiting_retry = 0
+        self._queue_wait_ms: Deque[float] = deque(maxlen=_LATENCY_SAMPLES)
+        self._processing_ms: Deque[float] = deque(maxlen=_LATENCY_SAMPLES)
+
+    # ---------- lifecycle ----------
+
+    def start(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._tasks and not all(t.done() for t in self._tasks) and self._tasks[0].get_loop() is loop:
+            return
+        self._queue = asyncio.Queue()
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self) -> None:
+        # Jobs waiting for a retry stay "pending" in the database; recover() queues them again.
+        tasks = self._tasks + list(self._retry_tasks)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._tasks = []
+        self._retry_tasks.clear()
+
+    def _pending_jobs(self) -> List[Dict[str, Any]]:
+        stmt = (
+            select(RequestModel.id, RequestModel.start_date, RequestModel.end_date, Location.latitude, Location.longitude)
+            .join(Location, Location.id == RequestModel.location_id)
+            .where(RequestModel.status == "pending")
+            .order_by(RequestModel.created_at)
+        )
+        with self.engine.connect() as conn:
+            return [
+                {
+                    "request_id": r.id,
+                    "lat": r.latitude,
+                    "lon": r.longitude,
+                    "start_date": r.start_date,
+                    "end_date": r.end_date,
+                }
+                for r in conn.execute(stmt)
+            ]
+
+    async def recover(self) -> int:
+        """Queue again every request left "pending" by a previous process."""
+        jobs = await run_in_threadpool(self._pending_jobs)
+        for job in jobs:
+            await self.submit(job)
+        return len(jobs)
+
+    # ---------- producer ----------
+
+    async def submit(self, job: Dict[str, Any]) -> int:
+        """Queue a job (request_id, lat, lon, start_date, end_date); returns the queue depth."""
+        self.start()
+        job.setdefault("attempts", 0)
+        job.setdefault("enqueued_at", time.perf_counter())
+        await self._queue.put(job)
+        self.stats["submitted"] += 1
+        return self._queue.qsize()
+
+    def _retry_later(self, job: Dict[str, Any], reason: str) -> bool:
+        """Schedule another attempt; False when the job is out of attempts."""
+        if job["attempts"] >= self.max_attempts:
+            return False
+        delay = self.retry_seconds * (2 ** (job["attempts"] - 1))
+        self.stats["retried"] += 1
+        self._waiting_retry += 1
+        print(f"Request {job['request_id']} attempt {job['attempts']} failed ({reason}); retrying in {delay:.1f}s")
+
+        async def _requeue():
+            try:
+                await asyncio.sleep(delay)
+            finally:
+                self._waiting_retry -= 1
+            await self._queue.put(job)
+
+        task = asyncio.create_task(_requeue())
+        self._retry_tasks.add(task)
+        task.add_done_callback(self._retry_tasks.discard)
+        return True
+
+    # ---------- workers ----------
+
+    async def _worker(self) -> None:
+        while True:
+            batch = [await self._queue.get()]
+            while len(batch) < self.batch_size and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            self._in_flight += len(batch)
+            try:
+                await self._process(batch)
+            except Exception as e:
+                # Never let one bad batch kill the worker.
+                print(f"Request queue batch failed: {type(e).__name__}: {e}")
+            finally:
+                self._in_flight -= len(batch)
+                for _ in batch:
+                    self._queue.task_done()
+
+    async def _process(self, batch: List[Dict[str, Any]]) -> None:
+        started = time.perf_counter()
+        for job in batch:
+            job["attempts"] += 1
+            self._queue_wait_ms.append((started - job["enqueued_at"]) * 1000.0)
+
+        # One upstream fetch per distinct location in the batch.
+        by_location: Dict[tuple, List[Dict[str, Any]]] = defaultdict(list)
+        for job in batch:
+            by_location[(round(float(job["lat"]), 5), round(float(job["lon"]), 5))].append(job)
+
+        async def _fetch(point: tuple) -> Any:
+            try:
+                return await self.wx.fetch_raw(point[0], point[1])
+            except HTTPException as e:
+                return e
+            except Exception as e:
+                return HTTPException(status_code=502, detail=f"{type(e).__name__}: {e}")
+
+        results = await asyncio.gather(*(_fetch(point) for point in by_location))
+        done: List[Dict[str, Any]] = []
+        failed: List[Dict[str, Any]] = []
+        for (point, jobs), result in zip(by_location.items(), results):
+            if isinstance(result, HTTPException):
+                for job in jobs:
+                    # 4xx will not get better on retry.
+                    if result.status_code < 500 or not self._retry_later(job, str(result.detail)):
+                        failed.append({**job, "error": str(result.detail)})
+            else:
+                done.extend({**job, "data": result} for job in jobs)
+
+        try:
+            stored = await run_in_threadpool(self._write, done, failed)
+        except Exception as e:
+            await self._write_failed(batch, done, failed, f"database write failed: {type(e).__name__}: {e}")
+            return
+        finished = time.perf_counter()
+        for job in done + failed:
+            self._processing_ms.append((finished - job["enqueued_at"]) * 1000.0)
+        self.stats["completed"] += len(done)
+        self.stats["failed"] += len(failed)
+        self.stats["batches"] += 1
+        self.stats["rows_stored"] += stored
+
+    def _write(self, done: List[Dict[str, Any]], failed: List[Dict[str, Any]]) -> int:
+        """Insert forecast rows and set statuses for a whole batch in one transaction."""
+        if not done and not failed:
+            return 0
+        req = RequestModel.__table__
+        with self.engine.begin() as conn:
+            rows: List[Dict[str, Any]] = []
+            if done:
+                provider_id = self._provider_id(conn)
+                location_ids = dict(
+                    conn.execute(
+                        select(RequestModel.id, RequestModel.location_id).where(RequestModel.id.in_([j["request_id"] for j in done]))
+                    ).all()
+                )
+                snapshot_time = datetime.utcnow()
+                for job in done:
+                    location_id = location_ids.get(job["request_id"])
+                    if location_id is None:  # deleted while queued
+                        continue
+                    rows.extend(
+                        build_forecast_rows(
+                            location_id, provider_id, job["data"], snapshot_time, _as_date(job["start_date"]), _as_date(job["end_date"])
+                        )
+                    )
+                insert_forecast_rows(conn, rows)
+                conn.execute(
+                    update(req).where(req.c.id.in_([j["request_id"] for j in done])).values(status="ok", error_message=None)
+                )
+            for job in failed:
+                conn.execute(update(req).where(req.c.id == job["request_id"]).values(status="error", error_message=job["error"][:500]))
+        return len(rows)
+
+    async def _write_failed(
+        self, batch: List[Dict[str, Any]], done: List[Dict[str, Any]], failed: List[Dict[str, Any]], reason: str
+    ) -> None:
+        """Retry fetched jobs whose batch write failed; mark the rest "error" on their own."""
+        self.stats["write_errors"] += 1
+        print(f"Request queue write failed for {len(batch)} jobs: {reason}")
+        originals = {job["request_id"]: job for job in batch}
+        give_up = list(failed)
+        for job in done:
+            if not self._retry_later(originals[job["request_id"]], reason):
+                give_up.append({**job, "error": reason})
+        if not give_up:
+            return
+        try:
+            await run_in_threadpool(self._write, [], give_up)
+        except Exception as e:
+            # Rows stay "pending"; recover() picks them up on the next start.
+            print(f"Request queue could not mark {len(give_up)} jobs as failed: {type(e).__name__}: {e}")
+            return
+        self.stats["failed"] += len(give_up)
+
+    def _provider_id(self, conn) -> str:
+        found = conn.execute(select(Provider.id).where(Provider.name == PROVIDER_NAME)).scalar()
+        if found:
+            return found
+        conn.execute(dialect_insert(self.dialect, Provider.__table__).values(name=PROVIDER_NAME, base_url=PROVIDER_URL).on_conflict_do_nothing())
+        return conn.execute(select(Provider.id).where(Provider.name == PROVIDER_NAME)).scalar_one()
+
+    # ---------- stats ----------
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            "workers": sum(1 for t in self._tasks if not t.done()),
+            "depth": self._queue.qsize() if self._queue is not None else 0,
+            "in_flight": self._in_flight,
+            "waiting_retry": self._waiting_retry,
+            "queue_wait_ms": {"p50": _percentile(self._queue_wait_ms, 0.5), "p95": _percentile(self._queue_wait_ms, 0.95)},
+            "latency_ms": {"p50": _percentile(self._processing_ms, 0.5), "p95": _percentile(self._processing_ms, 0.95)},
+        }
+
+
+_queue: Optional[RequestQueue] = None
+
+
+def get_request_queue() -> RequestQueue:
+    global _queue
+    if _queue is None:
+        _queue = RequestQueue(default_engine)
+    return _queue
@@ -0,0 +1,254 @@
+import asyncio
+import difflib
+import json
+import os
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Set
+
+from fastapi import HTTPException
+
+from backEnd.core.config import settings
+from backEnd.core.metrics import run_in_threadpool
+from backEnd.services.gazetteer import normalize
+from backEnd.services.ski_resort_client import SkiResortClient
+
+"""
+Local catalog of ski resorts, built from the provider's `regions` and
+`resorts?region=` listings and refreshed in the background.
+
+Lookups never go upstream: names are resolved through a sorted prefix index
+and a trigram index for typo-tolerant matches. Resolved coordinates are stored
+on each entry and written to the snapshot file with the rest of the catalog
+(every _FLUSH_SECONDS when changed, and at shutdown), so a restart does not
+have to list or geocode resorts again.
+"""
+
+DEFAULT_SNAPSHOT_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "db", "ski_catalog.json"))
+_FLUSH_SECONDS = 30.0
+
+
+def listing_items(payload: Any) -> List[Any]:
+    """Upstream listings come back as a bare list or wrapped in an object; accept both."""
+    if isinstance(payload, list):
+        return payload
+    if isinstance(payload, dict):
+        for value in payload.values():
+            if isinstance(value, list):
+                return value
+    return []
+
+
+def item_name(item: Any) -> Optional[str]:
+    if isinstance(item, str):
+        return item.strip() or None
+    if isinstance(item, dict):
+        for key in ("name", "resort", "resortName", "slug", "region", "id"):
+            if isinstance(item.get(key), str) and item[key].strip():
+                return item[key].strip()
+    return None
+
+
+def _trigrams(key: str) -> Set[str]:
+    padded = f"  {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class SkiResortCatalog:
+    def __init__(self, client: SkiResortClient, snapshot_path: Optional[str] = None) -> None:
+        self.client = client
+        self.snapshot_path = snapshot_path if snapshot_path is not None else (settings.ski_catalog_path or DEFAULT_SNAPSHOT_PATH)
+        self.refreshed_at: Optional[float] = None
+        self._entries: List[Dict[str, Any]] = []
+        self._by_key: Dict[str, int] = {}
+        self._sorted_keys: List[str] = []
+        self._sorted_ids: List[int] = []
+        self._trigram_index: Dict[str, List[int]] = {}
+        self._by_region: Dict[str, List[int]] = {}
+        self._dirty = False
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def loaded(self) -> bool:
+        return bool(self._entries)
+
+    # ---------- index ----------
+
+    def _build(self, entries: List[Dict[str, Any]]) -> None:
+        by_key: Dict[str, int] = {}
+        unique: List[Dict[str, Any]] = []
+        for entry in entries:
+            key = normalize(entry["name"])
+            if not key or key in by_key:
+                continue
+            by_key[key] = len(unique)
+            unique.append(entry)
+        trigram_index: Dict[str, List[int]] = defaultdict(list)
+        by_region: Dict[str, List[int]] = defaultdict(list)
+        for key, i in by_key.items():
+            for gram in _trigrams(key):
+                trigram_index[gram].append(i)
+            by_region[normalize(unique[i].get("region") or "")].append(i)
+        ordered = sorted(by_key.items())
+        # Swap the whole index in at once so readers never see a half-built catalog.
+        self._entries, self._by_key = unique, by_key
+        self._sorted_keys = [k for k, _ in ordered]
+        self._sorted_ids = [i for _, i in ordered]
+        self._trigram_index, self._by_region = dict(trigram_index), dict(by_region)
+
+    # ---------- lookups (local only) ----------
+
+    def search(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """Prefix matches first, then fuzzy (typo-tolerant) matches."""
+        key = normalize(query)
+        if not key:
+            return []
+        found: List[int] = []
+        start = bisect_left(self._sorted_keys, key)
+        for pos in range(start, len(self._sorted_keys)):
+            if not self._sorted_keys[pos].startswith(key) or len(found) >= limit:
+                break
+            found.append(self._sorted_ids[pos])
+        if len(found) < limit:
+            seen = set(found)
+            found.extend(i for i in self._fuzzy(key, limit) if i not in seen)
+        return [self._entries[i] for i in found[:limit]]
+
+    def _fuzzy(self, key: str, limit: int, cutoff: float = 0.6) -> List[int]:
+        grams = _trigrams(key)
+        shared: Dict[int, int] = defaultdict(int)
+        for gram in grams:
+            for i in self._trigram_index.get(gram, ()):
+                shared[i] += 1
+        # Only the candidates sharing the most trigrams get the exact similarity score.
+        candidates = sorted(shared, key=shared.__getitem__, reverse=True)[: max(50, limit * 5)]
+        scored = []
+        for i in candidates:
+            ratio = difflib.SequenceMatcher(None, key, normalize(self._entries[i]["name"])).ratio()
+            if ratio >= cutoff:
+                scored.append((ratio, i))
+        scored.sort(reverse=True)
+        return [i for _, i in scored[:limit]]
+
+    def resolve(self, query: str) -> Optional[Dict[str, Any]]:
+        """The catalog entry `query` refers to: exact name, a unique prefix, or a close fuzzy match."""
+        key = normalize(query)
+        if not key:
+            return None
+        if key in self._by_key:
+            return self._entries[self._by_key[key]]
+        start = bisect_left(self._sorted_keys, key)
+        prefixed = [
+            self._sorted_ids[pos]
+            for pos in range(start, min(start + 2, len(self._sorted_keys)))
+            if self._sorted_keys[pos].startswith(key)
+        ]
+        if len(prefixed) == 1:
+            return self._entries[prefixed[0]]
+        fuzzy = self._fuzzy(key, 1, cutoff=0.8)
+        return self._entries[fuzzy[0]] if fuzzy else None
+
+    def resorts_in_region(self, region: str) -> Optional[List[Dict[str, Any]]]:
+        ids = self._by_region.get(normalize(region))
+        return [self._entries[i] for i in ids] if ids is not None else None
+
+    def remember_coords(self, entry: Dict[str, Any], lat: float, lon: float, place: str) -> None:
+        entry.update(lat=lat, lon=lon, place=place)
+        # Written by flush_periodic / save_if_dirty, never from the request path.
+        self._dirty = True
+
+    # ---------- refresh ----------
+
+    def load_snapshot(self) -> bool:
+        if not self.snapshot_path or not os.path.exists(self.snapshot_path):
+            return False
+        try:
+            with open(self.snapshot_path, encoding="utf-8") as fh:
+                snapshot = json.load(fh)
+        except (OSError, ValueError) as e:
+            print(f"Ski catalog snapshot unreadable ({self.snapshot_path}): {e}")
+            return False
+        self._build(snapshot.get("resorts") or [])
+        self.refreshed_at = snapshot.get("refreshed_at")
+        return self.loaded
+
+    def _snapshot(self) -> Dict[str, Any]:
+        # Entry copies, so the file can be written off the event loop while requests add coordinates.
+        self._dirty = False
+        return {"refreshed_at": self.refreshed_at, "resorts": [dict(e) for e in self._entries]}
+
+    def _write(self, snapshot: Dict[str, Any]) -> None:
+        if not self.snapshot_path:
+            return
+        tmp = f"{self.snapshot_path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as fh:
+            json.dump(snapshot, fh)
+        os.replace(tmp, self.snapshot_path)
+
+    async def _save(self) -> None:
+        snapshot = self._snapshot()
+        try:
+            await run_in_threadpool(self._write, snapshot)
+        except OSError as e:
+            self._dirty = True
+            print(f"Ski catalog snapshot write failed ({self.snapshot_path}): {e}")
+
+    def save_if_dirty(self) -> None:
+        """Synchronous write for shutdown."""
+        if self._dirty:
+            try:
+                self._write(self._snapshot())
+            except OSError as e:
+                print(f"Ski catalog snapshot write failed ({self.snapshot_path}): {e}")
+
+    async def flush_periodic(self, interval_seconds: float = _FLUSH_SECONDS) -> None:
+        """Persist coordinates learned since the last write."""
+        while True:
+            await asyncio.sleep(interval_seconds)
+            if self._dirty:
+                await self._save()
+
+    async def refresh(self, concurrency: int = 4) -> int:
+        """Rebuild the catalog from upstream listings. Coordinates already resolved are kept."""
+        regions = [name for name in (item_name(r) for r in listing_items(await self.client.list_regions())) if name]
+        sem = asyncio.Semaphore(concurrency)
+
+        async def _region(region: str) -> List[Dict[str, Any]]:
+            async with sem:
+                try:
+                    listing = await self.client.list_resorts_by_region(region)
+                except HTTPException as e:
+                    print(f"Ski catalog: listing '{region}' failed: {e.detail}")
+                    return []
+            return [{"name": name, "region": region} for name in (item_name(r) for r in listing_items(listing)) if name]
+
+        entries = [e for chunk in await asyncio.gather(*(_region(r) for r in regions)) for e in chunk]
+        if not entries:
+            return len(self._entries)
+        for entry in entries:
+            old = self._by_key.get(normalize(entry["name"]))
+            if old is not None:
+                for field in ("lat", "lon", "place"):
+                    if field in self._entries[old]:
+                        entry[field] = self._entries[old][field]
+        self.refreshed_at = time.time()
+        self._build(entries)
+        await self._save()
+        return len(self._entries)
+
+    async def run_periodic(self, interval_seconds: Optional[float] = None) -> None:
+        interval = interval_seconds or settings.ski_catalog_refresh_seconds
+        if self.load_snapshot() and self.refreshed_at and time.time() - self.refreshed_at < interval:
+            await asyncio.sleep(interval - (time.time() - self.refreshed_at))
+        while True:
+            try:
+                count = await self.refresh()
+                print(f"Ski catalog refreshed: {count} resorts")
+            except HTTPException as e:
+                print(f"Ski catalog refresh failed: {e.detail}")
+            except Exception as e:
+                print(f"Ski catalog refresh failed: {type(e).__name__}: {str(e)}")
+            await asyncio.sleep(interval)
@@ -1,10 +1,27 @@
-from typing import Optional, Dict, Any, Tuple
+import asyncio
+from collections import defaultdict
+from typing import Optional, Dict, Any
 from urllib.parse import quote
 
 import httpx
 from fastapi import HTTPException
 
+from backEnd.core.cache import cache_key, get_cache
 from backEnd.core.config import settings
+from backEnd.core.metrics import track_upstream
+
+
+def _endpoint(path: str) -> str:
+    """'Stevens%20Pass/snowConditions' -> 'snowConditions'; 'regions' -> 'regions'."""
+    return path.strip("/").rsplit("/", 1)[-1]
+
+
+def _ttl_for(endpoint: str) -> float:
+    if endpoint == "snowConditions":
+        return settings.ski_cache_ttl_snow_seconds
+    if endpoint in ("hourly", "forecast"):
+        return settings.ski_cache_ttl_forecast_seconds
+    return settings.ski_cache_ttl_listing_seconds
 
 
 class SkiResortClient:
@@ -19,6 +36,11 @@ class SkiResortClient:
             timeout=httpx.Timeout(settings.api_timeout),
             limits=httpx.Limits(max_connections=50, max_keepalive_connections=20),
         )
+        # Caps in-flight requests to the provider across all callers (fan-outs included).
+        self._limit = asyncio.Semaphore(settings.ski_max_concurrency)
+        # Response cache keyed on (path, params); per-endpoint counters on top of the namespace's.
+        self._cache = get_cache("ski")
+        self._stats: Dict[str, Dict[str, int]] = defaultdict(lambda: {"hits": 0, "misses": 0, "stale": 0})
 
     async def close(self):
         await self._client.aclose()
@@ -26,10 +48,53 @@ class SkiResortClient:
     def slug(self, resort_name: str) -> str:
         return quote(resort_name.strip())
 
+    def cache_stats(self) -> Dict[str, Any]:
+        endpoints = {}
+        for endpoint, counts in sorted(self._stats.items()):
+            lookups = counts["hits"] + counts["misses"]
+            endpoints[endpoint] = {
+                **counts,
+                "hit_rate": (round(counts["hits"] / lookups, 4) if lookups else None),
+                "ttl_seconds": _ttl_for(endpoint),
+            }
+        return {**self._cache.summary(), "endpoints": endpoints}
+
     async def get(
             self,
             path: str,
             params: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Cached GET. Each endpoint has its own TTL; when the provider fails
+        (5xx, timeout, rate limit), an expired entry is served for up to
+        SKI_CACHE_STALE_SECONDS instead of the error.
+        """
+        endpoint = _endpoint(path)
+        key = cache_key(path, sorted((params or {}).items()))
+        stats = self._stats[endpoint]
+        cached, fresh = await self._cache.get_entry(key)
+        if fresh:
+            stats["hits"] += 1
+            return cached
+        stats["misses"] += 1
+
+        try:
+            data = await self._fetch(path, params)
+        except HTTPException as e:
+            if cached is not None and (e.status_code >= 500 or e.status_code == 429):
+                stats["stale"] += 1
+                self._cache.mark_stale_served()
+                print(f"Ski API failed ({e.status_code}); serving stale '{path}'")
+                return cached
+            raise
+
+        await self._cache.set(key, data, _ttl_for(endpoint), stale_ttl=settings.ski_cache_stale_seconds)
+        return data
+
+    async def _fetch(
+            self,
+            path: str,
+            params: Optional[Dict[str, Any]] = None,
     ) -> Dict[str, Any]:
         if not self.api_key:
             raise HTTPException(
@@ -45,7 +110,10 @@ class SkiResortClient:
 
         try:
 
-            resp = await self._client.get(url, headers=headers, params=params)
+            async with self._limit:
+                with track_upstream("rapidapi_ski") as call:
+                    resp = await self._client.get(url, headers=headers, params=params)
+                    call.status = resp.status_code
 
             # If upstream returns 4xx/5xx, keep your current behavior
             try:
@@ -1,12 +1,172 @@
 # backEnd/services/ski_resort_service.py
 import asyncio
-from typing import Optional, Dict, Any, Tuple
+import re
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Optional, Dict, Any, Iterator, List, Tuple
 
 from fastapi import HTTPException
 
+from backEnd.core.config import settings
+from backEnd.core.metrics import timed, timing_stage
 from backEnd.services.geo_service import GeoService
+from backEnd.services.ski_catalog import SkiResortCatalog, listing_items, item_name
 from backEnd.services.ski_resort_client import SkiResortClient
 
+_NUMBER = re.compile(r"-?\d+(?:\.\d+)?")
+
+COMPARE_SORT_KEYS = ("fresh_snow", "forecast_snowfall", "base_depth", "top_depth")
+# Elevations the provider serves; each one requested is a separate (billed) upstream call.
+ELEVATIONS = ("top", "mid", "base")
+
+
+def _amount(value: Any) -> Optional[float]:
+    """Numeric part of provider values like '12in', '3.5 cm' or 4; None for '-' / missing."""
+    if isinstance(value, (int, float)):
+        return float(value)
+    match = _NUMBER.search(str(value or ""))
+    return float(match.group()) if match else None
+
+
+def _forecast_snowfall(forecast: Dict[str, Any]) -> Optional[float]:
+    """Total snow over the multi-day forecast (am + pm + night of every day)."""
+    amounts = [
+        _amount((day.get(slot) or {}).get("snow"))
+        for day in (forecast.get("forecast5Day") or [])
+        for slot in ("am", "pm", "night")
+    ]
+    amounts = [a for a in amounts if a is not None]
+    return round(sum(amounts), 2) if amounts else None
+
+
+FORECAST_SLOTS = ("am", "pm", "night")
+
+
+def _columns(rows: List[Dict[str, Any]], fields: Optional[List[str]]) -> Dict[str, List[Any]]:
+    """Rows -> parallel arrays, one per field. Fields that are empty in every row are dropped."""
+    names = fields or list(dict.fromkeys(k for row in rows for k in row))
+    out = {}
+    for name in names:
+        values = [row.get(name) for row in rows]
+        if any(v not in (None, "") for v in values):
+            out[name] = values
+    return out
+
+
+def compact_hourly(doc: Dict[str, Any], fields: Optional[List[str]] = None) -> Dict[str, Any]:
+    """
+    Hourly provider document -> columnar form:
+    {"basicInfo": ..., "hours": n, "columns": {"time": [...], "snow": [...], ...}}
+    """
+    rows = doc.get("forecast") or []
+    if fields and "time" not in fields:
+        fields = ["time", *fields]
+    return {"basicInfo": doc.get("basicInfo"), "hours": len(rows), "columns": _columns(rows, fields)}
+
+
+def compact_forecast(doc: Dict[str, Any], fields: Optional[List[str]] = None) -> Dict[str, Any]:
+    """
+    Multi-day provider document -> columnar form, one set of parallel arrays
+    per slot: {"days": n, "dayOfWeek": [...], "am": {"snow": [...], ...}, "pm": ..., "night": ...}
+    """
+    days = doc.get("forecast5Day") or []
+    out: Dict[str, Any] = {
+        "basicInfo": doc.get("basicInfo"),
+        "days": len(days),
+        "dayOfWeek": [d.get("dayOfWeek") for d in days],
+    }
+    for slot in FORECAST_SLOTS:
+        out[slot] = _columns([d.get(slot) or {} for d in days], fields)
+    for key in ("summary3Day", "summaryDays4To6"):
+        if key in doc:
+            out[key] = doc[key]
+    return out
+
+
+def project_hourly(doc: Dict[str, Any], fields: List[str]) -> Dict[str, Any]:
+    """Row-shaped hourly document limited to `fields` (plus time)."""
+    keep = {"time", *fields}
+    rows = [{k: v for k, v in row.items() if k in keep} for row in (doc.get("forecast") or [])]
+    return {**doc, "forecast": rows}
+
+
+def project_forecast(doc: Dict[str, Any], fields: List[str]) -> Dict[str, Any]:
+    """Row-shaped multi-day document whose am/pm/night blocks only carry `fields`."""
+    keep = set(fields)
+    days = [
+        {k: ({f: v for f, v in (block or {}).items() if f in keep} if k in FORECAST_SLOTS else block) for k, block in day.items()}
+        for day in (doc.get("forecast5Day") or [])
+    ]
+    return {**doc, "forecast5Day": days}
+
+
+def shape_hourly(doc: Dict[str, Any], compact: bool, fields: Optional[List[str]]) -> Dict[str, Any]:
+    if compact:
+        return compact_hourly(doc, fields)
+    return project_hourly(doc, fields) if fields else doc
+
+
+def shape_forecast(doc: Dict[str, Any], compact: bool, fields: Optional[List[str]]) -> Dict[str, Any]:
+    if compact:
+        return compact_forecast(doc, fields)
+    return project_forecast(doc, fields) if fields else doc
+
+
+def _align(rows_by_elevation: Dict[str, List[Dict[str, Any]]], key: str) -> List[Dict[str, Any]]:
+    """
+    Join per-elevation rows on `key` (e.g. time): one row per timestamp with a
+    sub-object per elevation. The n-th occurrence of a repeated key value
+    (same hour on the next day) is matched with the n-th occurrence elsewhere.
+    """
+    merged: Dict[Tuple[Any, int], Dict[str, Any]] = {}
+    for elevation, rows in rows_by_elevation.items():
+        seen: Dict[Any, int] = defaultdict(int)
+        for row in rows:
+            value = row.get(key)
+            slot = merged.setdefault((value, seen[value]), {key: value})
+            seen[value] += 1
+            slot[elevation] = {k: v for k, v in row.items() if k != key}
+    return list(merged.values())
+
+
+def merge_hourly(docs: Dict[str, Dict[str, Any]], compact: bool, fields: Optional[List[str]]) -> Dict[str, Any]:
+    """Hourly documents of several elevations -> one per-timestamp structure."""
+    rows = {el: (project_hourly(doc, fields) if fields else doc).get("forecast") or [] for el, doc in docs.items()}
+    merged = _align(rows, "time")
+    basic_info = next(iter(docs.values())).get("basicInfo")
+    if not compact:
+        return {"basicInfo": basic_info, "elevations": list(docs), "forecast": merged}
+    return {
+        "basicInfo": basic_info,
+        "elevations": list(docs),
+        "hours": len(merged),
+        "time": [r["time"] for r in merged],
+        "columns": {el: _columns([r.get(el) or {} for r in merged], fields) for el in docs},
+    }
+
+
+def merge_forecast(docs: Dict[str, Dict[str, Any]], compact: bool, fields: Optional[List[str]]) -> Dict[str, Any]:
+    """Multi-day documents of several elevations -> one per-day structure."""
+    rows = {el: (project_forecast(doc, fields) if fields else doc).get("forecast5Day") or [] for el, doc in docs.items()}
+    merged = _align(rows, "dayOfWeek")
+    out: Dict[str, Any] = {
+        "basicInfo": next(iter(docs.values())).get("basicInfo"),
+        "elevations": list(docs),
+        "summaries": {
+            el: {k: doc.get(k) for k in ("summary3Day", "summaryDays4To6") if k in doc} for el, doc in docs.items()
+        },
+    }
+    if not compact:
+        out["forecast5Day"] = merged
+        return out
+    out["days"] = len(merged)
+    out["dayOfWeek"] = [r["dayOfWeek"] for r in merged]
+    out["columns"] = {
+        el: {slot: _columns([(r.get(el) or {}).get(slot) or {} for r in merged], fields) for slot in FORECAST_SLOTS}
+        for el in docs
+    }
+    return out
+
 
 class SkiResortService:
 
@@ -14,35 +174,77 @@ class SkiResortService:
         self,
         client: Optional[SkiResortClient] = None,
         geo_service: Optional[GeoService] = None,
+        catalog: Optional[SkiResortCatalog] = None,
     ) -> None:
         self.client = client or SkiResortClient()
         self.geo = geo_service or GeoService()
+        self.catalog = catalog or SkiResortCatalog(self.client)
 
     # ---------- helpers ----------
 
+    def _canonical(self, resort_query: str) -> Tuple[str, Optional[Dict[str, Any]]]:
+        """
+        Map a user-typed resort name to the catalog's spelling.
+        Names the catalog does not know are passed upstream unchanged:
+        the catalog is a snapshot and may miss resorts.
+        """
+        if not self.catalog.loaded:
+            return resort_query, None
+        entry = self.catalog.resolve(resort_query)
+        if not entry:
+            return resort_query, None
+        return entry["name"], entry
+
+    @contextmanager
+    def _suggest_on_404(self, resort_query: str, entry: Optional[Dict[str, Any]]) -> Iterator[None]:
+        """
+        For names the catalog did not resolve: turn an upstream 404 into
+        one that lists the closest catalog names.
+        """
+        try:
+            yield
+        except HTTPException as e:
+            if e.status_code != 404 or entry is not None or not self.catalog.loaded:
+                raise
+            suggestions = [c["name"] for c in self.catalog.search(resort_query, limit=3)]
+            if not suggestions:
+                raise
+            raise HTTPException(
+                status_code=404,
+                detail=f"Unknown ski resort '{resort_query}'. Did you mean: {', '.join(suggestions)}?",
+            ) from e
+
     async def _resolve_geo_strict(
         self,
         resort_query: str,
+        entry: Optional[Dict[str, Any]] = None,
     ) -> Tuple[float, float, str]:
         """
         Strict geocoding (used by /api/ski/geo).
         """
-        result = await self.geo.resolve_coords_from_query(resort_query)
+        if entry and entry.get("lat") is not None:
+            return entry["lat"], entry["lon"], entry["place"]
+        result = await timed("geocode", self.geo.resolve_coords_from_query(resort_query))
         if not result:
             raise HTTPException(
                 status_code=404,
                 detail=f"Could not resolve location for resort '{resort_query}'",
             )
+        if entry:
+            self.catalog.remember_coords(entry, *result)
         return result  # (lat, lon, place)
 
     async def _try_resolve_geo(
         self,
         resort_query: str,
+        entry: Optional[Dict[str, Any]] = None,
     ) -> Optional[Tuple[float, float, str]]:
         """
         Best-effort geocoding: try a few variants and
         return None if nothing found.
         """
+        if entry and entry.get("lat") is not None:
+            return entry["lat"], entry["lon"], entry["place"]
         candidates = [
             f"{resort_query}, US",
             f"{resort_query}, USA",
@@ -51,16 +253,40 @@ class SkiResortService:
         ]
 
         for q in candidates:
-            result = await self.geo.resolve_coords_from_query(q)
+            result = await timed("geocode", self.geo.resolve_coords_from_query(q))
             if result:
                 lat, lon, place = result
                 # place is like "Seattle, WA, US" from GeoService
                 if not place.endswith("US"):
                     continue
+                if entry:
+                    self.catalog.remember_coords(entry, *result)
                 return result
 
         return None
 
+    async def _hourly(self, name: str, units: str, elevations: List[str], compact: bool, fields: Optional[List[str]]) -> Dict[str, Any]:
+        """
+        One elevation -> the (shaped) provider document. Several -> fetched
+        concurrently (each cached on its own) and merged per timestamp.
+        """
+        docs = await timed(
+            "hourly", asyncio.gather(*(self.client.get_hourly_forecast(name, units=units, elevation=el) for el in elevations))
+        )
+        with timing_stage("shape"):
+            if len(elevations) == 1:
+                return shape_hourly(docs[0], compact, fields)
+            return merge_hourly(dict(zip(elevations, docs)), compact, fields)
+
+    async def _multi_day(self, name: str, units: str, elevations: List[str], compact: bool, fields: Optional[List[str]]) -> Dict[str, Any]:
+        docs = await timed(
+            "forecast", asyncio.gather(*(self.client.get_multi_day_forecast(name, units=units, elevation=el) for el in elevations))
+        )
+        with timing_stage("shape"):
+            if len(elevations) == 1:
+                return shape_forecast(docs[0], compact, fields)
+            return merge_forecast(dict(zip(elevations, docs)), compact, fields)
+
     # ---------- public methods ----------
 
     async def get_resort_geo(
@@ -70,7 +296,9 @@ class SkiResortService:
         """
         Only geocoding (strict).
         """
-        lat, lon, place = await self._resolve_geo_strict(resort_query)
+        name, entry = self._canonical(resort_query)
+        with self._suggest_on_404(resort_query, entry):
+            lat, lon, place = await self._resolve_geo_strict(name, entry)
         return {
             "query": resort_query,
             "place": place,
@@ -84,22 +312,25 @@ class SkiResortService:
         *,
         units: str = "i",
         elevation: str = "top",
+        compact: bool = False,
+        fields: Optional[List[str]] = None,
+        elevations: Optional[List[str]] = None,
     ) -> Dict[str, Any]:
         """
         Resort name -> geo (if available) + hourly forecast.
+        `compact` returns columnar arrays; `fields` keeps only those metrics;
+        `elevations` (e.g. ["top", "base"]) overrides `elevation` and merges them.
         """
-        geo = await self._try_resolve_geo(resort_query)
+        resort_query, entry = self._canonical(resort_query)
+        geo = await self._try_resolve_geo(resort_query, entry)
         if geo:
             lat, lon, place = geo
         else:
             lat = lon = None
             place = resort_query
 
-        hourly = await self.client.get_hourly_forecast(
-            resort_query,
-            units=units,
-            elevation=elevation,
-        )
+        with self._suggest_on_404(resort_query, entry):
+            hourly = await self._hourly(resort_query, units, elevations or [elevation], compact, fields)
 
         return {
             "query": resort_query,
@@ -110,19 +341,20 @@ class SkiResortService:
                                resort_query: str,
                                *,
                                units: str = "i",
-                               elevation: str = "top", ) -> Dict[str, Any]:
-        geo = await self._try_resolve_geo(resort_query)
+                               elevation: str = "top",
+                               compact: bool = False,
+                               fields: Optional[List[str]] = None,
+                               elevations: Optional[List[str]] = None, ) -> Dict[str, Any]:
+        resort_query, entry = self._canonical(resort_query)
+        geo = await self._try_resolve_geo(resort_query, entry)
         if geo:
             lat, lon, place = geo
         else:
             lat = lon = None
             place = resort_query
 
-        daily = await self.client.get_daily_forecast(
-            resort_query,
-            units=units,
-            elevation=elevation,
-        )
+        with self._suggest_on_404(resort_query, entry):
+            daily = await self._multi_day(resort_query, units, elevations or [elevation], compact, fields)
         return {
             "query": resort_query,
             "geo": {"place": place, "lat": lat, "lon": lon},
@@ -138,17 +370,19 @@ class SkiResortService:
         """
         Resort name -> geo (if available) + current snow conditions.
         """
-        geo = await self._try_resolve_geo(resort_query)
+        resort_query, entry = self._canonical(resort_query)
+        geo = await self._try_resolve_geo(resort_query, entry)
         if geo:
             lat, lon, place = geo
         else:
             lat = lon = None
             place = resort_query
 
-        snow = await self.client.get_snow_conditions(
-            resort_query,
-            units=units,
-        )
+        with self._suggest_on_404(resort_query, entry):
+            snow = await timed("snow", self.client.get_snow_conditions(
+                resort_query,
+                units=units,
+            ))
 
         return {
             "query": resort_query,
@@ -162,31 +396,31 @@ class SkiResortService:
         *,
         units: str = "i",
         elevation: str = "top",
+        compact: bool = False,
+        fields: Optional[List[str]] = None,
+        elevations: Optional[List[str]] = None,
     ) -> Dict[str, Any]:
         """
-        Geo (if available) + hourly + multi-day + snow.
+        Geo (if available) + hourly + multi-day + snow, fetched concurrently.
         """
-        geo = await self._try_resolve_geo(resort_query)
+        resort_query, entry = self._canonical(resort_query)
+        geo = await self._try_resolve_geo(resort_query, entry)
         if geo:
             lat, lon, place = geo
         else:
             lat = lon = None
             place = resort_query
 
-        hourly = await self.client.get_hourly_forecast(
-            resort_query,
-            units=units,
-            elevation=elevation,
-        )
-        snow = await self.client.get_snow_conditions(
-            resort_query,
-            units=units,
-        )
-        forecast = await self.client.get_multi_day_forecast(
-            resort_query,
-            units=units,
-            elevation=elevation,
-        )
+        elevations = elevations or [elevation]
+        with self._suggest_on_404(resort_query, entry):
+            hourly, snow, forecast = await asyncio.gather(
+                self._hourly(resort_query, units, elevations, compact, fields),
+                timed("snow", self.client.get_snow_conditions(
+                    resort_query,
+                    units=units,
+                )),
+                self._multi_day(resort_query, units, elevations, compact, fields),
+            )
 
         return {
             "query": resort_query,
@@ -196,5 +430,70 @@ class SkiResortService:
             "forecast": forecast,
         }
 
+    async def _compare_row(self, resort_query: str, *, units: str, elevation: str) -> Dict[str, Any]:
+        name, entry = self._canonical(resort_query)
+        try:
+            with self._suggest_on_404(resort_query, entry):
+                snow, forecast = await asyncio.gather(
+                    self.client.get_snow_conditions(name, units=units),
+                    self.client.get_multi_day_forecast(name, units=units, elevation=elevation),
+                )
+        except HTTPException as e:
+            return {"resort": resort_query, "error": e.detail}
+        return {
+            "resort": name,
+            "region": (entry or {}).get("region"),
+            "fresh_snow": _amount(snow.get("freshSnowfall")),
+            "base_depth": _amount(snow.get("botSnowDepth")),
+            "top_depth": _amount(snow.get("topSnowDepth")),
+            "forecast_snowfall": _forecast_snowfall(forecast),
+            "last_snowfall": snow.get("lastSnowfallDate"),
+        }
+
+    async def compare_resorts(
+        self,
+        resorts: Optional[List[str]] = None,
+        *,
+        region: Optional[str] = None,
+        units: str = "i",
+        elevation: str = "top",
+        sort_by: str = "fresh_snow",
+    ) -> Dict[str, Any]:
+        """
+        Snow conditions + multi-day forecast for many resorts at once, ranked.
+        All resorts are fetched concurrently; the client caps in-flight
+        requests to the provider.
+        """
+        names = list(resorts or [])
+        if region:
+            listing = await self.get_resorts_by_region(region)
+            names += [n for n in (item_name(r) for r in listing_items(listing)) if n]
+        names = list(dict.fromkeys(names))[: settings.ski_compare_max_resorts]
+        if not names:
+            raise HTTPException(status_code=400, detail="Provide resorts or a region with resorts to compare.")
+
+        # Rows are fetched concurrently; one stage covers the slowest resort.
+        rows = await timed("resorts", asyncio.gather(*(self._compare_row(n, units=units, elevation=elevation) for n in names)))
+        ok = [r for r in rows if "error" not in r]
+        tiebreak = [k for k in COMPARE_SORT_KEYS if k != sort_by]
+        ok.sort(key=lambda r: [(r[k] is not None, r[k] or 0.0) for k in (sort_by, *tiebreak)], reverse=True)
+        for rank, row in enumerate(ok, start=1):
+            row["rank"] = rank
+        return {
+            "units": "in" if units == "i" else "cm",
+            "sort_by": sort_by,
+            "resorts": ok,
+            "errors": [r for r in rows if "error" in r],
+        }
+
     async def get_resorts_by_region(self, region: str) -> Dict[str, Any]:
-        return await self.client.list_resorts_by_region(region)
+        local = self.catalog.resorts_in_region(region)
+        if local is not None:
+            return {"region": region, "resorts": local, "source": "catalog"}
+        return await timed("listing", self.client.list_resorts_by_region(region))
+
+    def search_resorts(self, query: str, limit: int = 10) -> Dict[str, Any]:
+        """
+        Prefix + typo-tolerant resort search over the local catalog.
+        """
+        return {"query": query, "items": self.catalog.search(query, limit=limit)}
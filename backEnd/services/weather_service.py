@@ -1,8 +1,13 @@
+import math
 from datetime import datetime, timedelta, timezone
-from collections import defaultdict
-from typing import Dict, Any, List
+from collections import OrderedDict, defaultdict
+from typing import Dict, Any, List, Optional, Tuple
+from fastapi import HTTPException
+from backEnd.core.cache import cache_key, get_cache
 from backEnd.core.config import settings
 from backEnd.services.api_forecast_client import ApiForecastClient
+from backEnd.services.forecast_codec import CompactForecast, encode_forecast
+from backEnd.services.forecast_store import get_forecast_store
 
 
 def _pick_icon(weather_argument):
@@ -53,9 +58,35 @@ def _weather_description(item: Dict[str, Any]) -> str:
     return (weather[0].get("description") or "Conditions update").capitalize()
 
 
+# Forecasts are always fetched in metric (°C, m/s) and converted for display,
+# so every unit system shares one upstream call and one cache entry.
+CANONICAL_UNITS = "metric"
+
+
+def _display_temp(celsius: float, units: str | None) -> float:
+    if units == "imperial":
+        return celsius * 9 / 5 + 32
+    if units == "standard":
+        return celsius + 273.15
+    return celsius
+
+
+def _display_temp_delta(delta: float, units: str | None) -> float:
+    return delta * 9 / 5 if units == "imperial" else delta
+
+
+def _temp_unit(units: str | None) -> str:
+    if units == "imperial":
+        return "F"
+    if units == "standard":
+        return "K"
+    return "C"
+
+
 def _wind_display_speed(speed: float, units: str | None) -> float:
+    """`speed` in m/s (the canonical unit) -> mph, m/s or km/h."""
     if units == "imperial":
-        return speed
+        return speed * 2.236936
     if units == "standard":
         return speed
     return speed * 3.6
@@ -94,7 +125,7 @@ def _build_weather_insight(items: List[Dict[str, Any]], time_zone: int, units: s
             "temp": _safe_float(item.get("main", {}).get("temp")),
             "pop": round(_safe_float(item.get("pop")) * 100),
             "precip": _precip_mm(item),
-            "wind": _wind_display_speed(_safe_float(item.get("wind", {}).get("speed")), units),
+            "wind": _safe_float(item.get("wind", {}).get("speed")),
             "main": _weather_main(item),
             "description": _weather_description(item),
         }
@@ -102,14 +133,21 @@ def _build_weather_insight(items: List[Dict[str, Any]], time_zone: int, units: s
     ]
 
     wind_unit = _wind_unit(units)
-    temp_unit = "F" if units == "imperial" else ("K" if units == "standard" else "C")
+    temp_unit = _temp_unit(units)
+
+    def show_temp(celsius: float) -> int:
+        return round(_display_temp(celsius, units))
+
+    def show_wind(speed: float) -> int:
+        return round(_wind_display_speed(speed, units))
+
     pop_peak = max(local_items, key=lambda x: x["pop"])
     wind_peak = max(local_items, key=lambda x: x["wind"])
     temp_peak = max(local_items, key=lambda x: x["temp"])
     temp_low = min(local_items, key=lambda x: x["temp"])
     current_temp = local_items[0]["temp"]
     final_temp = local_items[-1]["temp"]
-    temp_delta = round(final_temp - current_temp)
+    temp_delta = final_temp - current_temp
 
     wet_items = [
         item for item in local_items
@@ -121,9 +159,10 @@ def _build_weather_insight(items: List[Dict[str, Any]], time_zone: int, units: s
     snow_items = [item for item in local_items if item["main"] == "snow"]
     fog_items = [item for item in local_items if item["main"] in {"mist", "fog", "haze"}]
 
-    wind_threshold = 25 if units != "imperial" else 16
-    hot_threshold = 32 if units != "imperial" else 90
-    cold_threshold = 0 if units != "imperial" else 32
+    # Thresholds are in the canonical units (°C, m/s); values are converted only for display.
+    wind_threshold = 25 / 3.6  # 25 km/h
+    hot_threshold = 32
+    cold_threshold = 0
 
     risks: List[str] = []
     severity = "low"
@@ -139,14 +178,14 @@ def _build_weather_insight(items: List[Dict[str, Any]], time_zone: int, units: s
         severity = "moderate"
 
     if wind_peak["wind"] >= wind_threshold:
-        risks.append(f"Wind peaks near {round(wind_peak['wind'])} {wind_unit} around {wind_peak['time'].strftime('%I %p').lstrip('0')}.")
+        risks.append(f"Wind peaks near {show_wind(wind_peak['wind'])} {wind_unit} around {wind_peak['time'].strftime('%I %p').lstrip('0')}.")
         severity = "elevated" if severity == "moderate" else severity
 
     if temp_peak["temp"] >= hot_threshold:
-        risks.append(f"Heat stress possible near {round(temp_peak['temp'])} {temp_unit}.")
+        risks.append(f"Heat stress possible near {show_temp(temp_peak['temp'])} {temp_unit}.")
         severity = "moderate" if severity == "low" else severity
     elif temp_low["temp"] <= cold_threshold:
-        risks.append(f"Freezing conditions possible near {round(temp_low['temp'])} {temp_unit}.")
+        risks.append(f"Freezing conditions possible near {show_temp(temp_low['temp'])} {temp_unit}.")
         severity = "moderate" if severity == "low" else severity
 
     if fog_items and len(risks) < 3:
@@ -157,19 +196,21 @@ def _build_weather_insight(items: List[Dict[str, Any]], time_zone: int, units: s
         risks.append("No major weather risks flagged in the next 24 hours.")
 
     changes = []
-    if abs(temp_delta) >= (8 if units == "imperial" else 4):
+    if abs(temp_delta) >= 4:
         direction = "warms" if temp_delta > 0 else "cools"
-        changes.append(f"Temperature {direction} by about {abs(temp_delta)} {temp_unit} through the next 24 hours.")
+        changes.append(
+            f"Temperature {direction} by about {abs(round(_display_temp_delta(temp_delta, units)))} {temp_unit} through the next 24 hours."
+        )
     else:
-        changes.append(f"Temperature stays fairly steady, ranging {round(temp_low['temp'])}-{round(temp_peak['temp'])} {temp_unit}.")
+        changes.append(f"Temperature stays fairly steady, ranging {show_temp(temp_low['temp'])}-{show_temp(temp_peak['temp'])} {temp_unit}.")
 
     if wet_items:
         changes.append(f"Precipitation chance climbs as high as {pop_peak['pop']}% around {pop_peak['time'].strftime('%I %p').lstrip('0')}.")
     else:
         changes.append("Precipitation risk stays low across the upcoming 24 hours.")
 
-    if wind_peak["wind"] - local_items[0]["wind"] >= (10 if units != "imperial" else 6):
-        changes.append(f"Wind picks up from {round(local_items[0]['wind'])} to {round(wind_peak['wind'])} {wind_unit}.")
+    if wind_peak["wind"] - local_items[0]["wind"] >= 10 / 3.6:  # 10 km/h
+        changes.append(f"Wind picks up from {show_wind(local_items[0]['wind'])} to {show_wind(wind_peak['wind'])} {wind_unit}.")
 
     actions = []
     if wet_items:
@@ -181,8 +222,8 @@ def _build_weather_insight(items: List[Dict[str, Any]], time_zone: int, units: s
     elif temp_low["temp"] <= cold_threshold:
         actions.append(f"Layer up for the coldest window around {temp_low['time'].strftime('%I %p').lstrip('0')}.")
 
-    comfortable_low = 45 if units == "imperial" else 7
-    comfortable_high = 78 if units == "imperial" else 26
+    comfortable_low = 7
+    comfortable_high = 26
     run_candidates = [
         item for item in local_items
         if 5 <= item["time"].hour <= 20
@@ -212,18 +253,204 @@ def _build_weather_insight(items: List[Dict[str, Any]], time_zone: int, units: s
     }
 
 
+# Forecast cache shared by every WeatherService instance (services are
+# created per request) and, with a shared CACHE_BACKEND, by every worker.
+# Keyed on rounded coordinates (or the grid cell when FORECAST_GRID_DEG is set);
+# one entry serves every unit system (see CANONICAL_UNITS).
+# Entries are stored in the packed columnar form from forecast_codec (~3 KB
+# instead of ~15 KB of JSON) and only unpacked when a caller reads `list`.
+_forecast_cache = get_cache("forecast")
+_GRID_CELLS_TRACKED = 1024
+
+
+def grid_cell(lat: float, lon: float, cell_deg: float) -> Tuple[float, float]:
+    """Center of the `cell_deg` grid cell containing (lat, lon)."""
+    row = math.floor((float(lat) + 90.0) / cell_deg)
+    col = math.floor((float(lon) + 180.0) / cell_deg)
+    cell_lat = min(90.0, -90.0 + (row + 0.5) * cell_deg)
+    cell_lon = -180.0 + (col + 0.5) * cell_deg
+    if cell_lon >= 180.0:
+        cell_lon -= 360.0
+    return round(cell_lat, 5), round(cell_lon, 5)
+
+
+class GridCellStats:
+    """Forecast cache lookups per grid cell in tiling mode (most recently used cells are kept).
+
+    A "shared" hit is one served to a point other than the one whose miss
+    filled the cell, i.e. a request tiling actually saved.
+    """
+
+    def __init__(self, max_cells: int = _GRID_CELLS_TRACKED) -> None:
+        self.max_cells = max_cells
+        self.totals: Dict[str, int] = defaultdict(int)
+        self._cells: "OrderedDict[Tuple[float, float], Dict[str, Any]]" = OrderedDict()
+
+    def record(self, cell: Tuple[float, float], point: Tuple[float, float], hit: bool) -> None:
+        stats = self._cells.get(cell)
+        if stats is None:
+            stats = self._cells[cell] = {"lookups": 0, "hits": 0, "shared_hits": 0, "filled_by": None}
+            if len(self._cells) > self.max_cells:
+                self._cells.popitem(last=False)
+        else:
+            self._cells.move_to_end(cell)
+        stats["lookups"] += 1
+        self.totals["lookups"] += 1
+        if not hit:
+            stats["filled_by"] = point
+            self.totals["misses"] += 1
+            return
+        stats["hits"] += 1
+        self.totals["hits"] += 1
+        # Unknown filler (filled by another worker or before a restart): not counted as shared.
+        if stats["filled_by"] is not None and stats["filled_by"] != point:
+            stats["shared_hits"] += 1
+            self.totals["shared_hits"] += 1
+
+    def summary(self, top: int = 10) -> Dict[str, Any]:
+        lookups = self.totals["lookups"]
+        busiest = sorted(self._cells.items(), key=lambda kv: kv[1]["lookups"], reverse=True)[:top]
+        return {
+            "lookups": lookups,
+            "hits": self.totals["hits"],
+            "shared_hits": self.totals["shared_hits"],
+            "misses": self.totals["misses"],
+            "hit_rate": (round(self.totals["hits"] / lookups, 4) if lookups else None),
+            "shared_hit_rate": (round(self.totals["shared_hits"] / lookups, 4) if lookups else None),
+            "cells_tracked": len(self._cells),
+            "top_cells": [
+                {
+                    "cell": list(cell),
+                    "lookups": c["lookups"],
+                    "hits": c["hits"],
+                    "shared_hits": c["shared_hits"],
+                    "hit_rate": round(c["hits"] / c["lookups"], 4),
+                }
+                for cell, c in busiest
+            ],
+        }
+
+
+_grid_stats = GridCellStats()
+
+
+def forecast_grid_stats(top: int = 10) -> Optional[Dict[str, Any]]:
+    """Grid cell hit counters, or None when tiling is off."""
+    return _grid_stats.summary(top) if settings.forecast_grid_deg > 0 else None
+
+
+def forecast_cache_stats() -> Dict[str, Any]:
+    store = get_forecast_store()
+    return {
+        "grid_deg": settings.forecast_grid_deg,
+        "grid": forecast_grid_stats(),
+        **_forecast_cache.summary(),
+        "store": store.summary() if store is not None else None,
+    }
+
+
 class WeatherService:
-    def __init__(self, client=None):
+    def __init__(self, client=None, store=None):
         self.client = client if client is not None else ApiForecastClient()
+        # Read-through tier over weather_forecasts (see forecast_store); None disables it.
+        self.store = store if store is not None else get_forecast_store()
+
+    async def fetch_data(self, lat: float, lon: float) -> Dict[str, Any]:
+        """Forecast for (lat, lon) in CANONICAL_UNITS; pass the display units to build_context.
+
+        Lookup order: shared cache, a recent stored snapshot, OpenWeather, and
+        (only if OpenWeather fails) an older stored snapshot. Upstream responses
+        are queued for batched write-back to the store. Callers that persist the
+        rows themselves use fetch_raw instead.
+        """
+        point: Optional[Tuple[float, float]] = None
+        if settings.forecast_grid_deg > 0:
+            # Tiling mode: every point in a cell is served the forecast fetched for the cell center.
+            point = (round(float(lat), 5), round(float(lon), 5))
+            lat, lon = grid_cell(lat, lon, settings.forecast_grid_deg)
+        key = cache_key(round(float(lat), 5), round(float(lon), 5))
+        cached = await _forecast_cache.get(key)
+        if cached is not None:
+            try:
+                forecast = CompactForecast(cached)
+            except (ValueError, TypeError):
+                await _forecast_cache.delete(key)
+            else:
+                if point is not None:
+                    _grid_stats.record((lat, lon), point, hit=True)
+                return forecast
+        if point is not None:
+            _grid_stats.record((lat, lon), point, hit=False)
+
+        store = self.store
+        stored = None
+        if store is not None:
+            try:
+                # One read covers both the fresh and the stale-if-error window.
+                window = max(settings.forecast_store_max_age_seconds, settings.forecast_store_stale_seconds)
+                stored = await store.load(lat, lon, window)
+                if stored is not None:
+                    data, snapshot_time = stored
+                    age = (datetime.utcnow() - snapshot_time).total_seconds()
+                    if age <= settings.forecast_store_max_age_seconds:
+                        ttl = min(settings.forecast_cache_ttl_seconds, settings.forecast_store_max_age_seconds - age)
+                        await _forecast_cache.set(key, encode_forecast(data), ttl)
+                        store.stats["hits"] += 1
+                        return data
+            except Exception as e:
+                # The store is an optimisation: any failure is a miss, upstream still answers.
+                stored = None
+                store.stats["errors"] += 1
+                print(f"Forecast store lookup failed: {type(e).__name__}: {e}")
+            store.stats["misses"] += 1
 
-    async def fetch_data(self, lat: float, lon: float, units: str | None = None) -> Dict[str, Any]:
+        params = {
+            "lat": lat,
+            "lon": lon,
+            "appid": settings.api_weather_key,
+            "units": CANONICAL_UNITS,
+        }
+        try:
+            data = await self.client._make_request("forecast", params)
+        except HTTPException as e:
+            if stored is None or e.status_code < 500:
+                raise
+            store.stats["stale_served"] += 1
+            print(f"Forecast upstream failed ({e.detail}); serving stored snapshot from {stored[1].isoformat()}")
+            return stored[0]
+        await _forecast_cache.set(key, encode_forecast(data), settings.forecast_cache_ttl_seconds)
+        if store is not None:
+            store.add(lat, lon, data)
+        return data
+
+    async def fetch_raw(self, lat: float, lon: float) -> Dict[str, Any]:
+        """Upstream forecast for exactly (lat, lon), bypassing the cache and the store.
+
+        For callers that persist the rows as a snapshot taken now: cached entries
+        are packed (rounded, some fields dropped) and up to a TTL old.
+        The response still refreshes the cache entry for the point.
+        """
+        params = {
+            "lat": lat,
+            "lon": lon,
+            "appid": settings.api_weather_key,
+            "units": CANONICAL_UNITS,
+        }
+        data = await self.client._make_request("forecast", params)
+        if settings.forecast_grid_deg <= 0:
+            # In tiling mode the cache holds cell-center forecasts; leave those alone.
+            key = cache_key(round(float(lat), 5), round(float(lon), 5))
+            await _forecast_cache.set(key, encode_forecast(data), settings.forecast_cache_ttl_seconds)
+        return data
+
+    async def fetch_current(self, lat: float, lon: float, units: str | None = None) -> Dict[str, Any]:
         params = {
             "lat": lat,
             "lon": lon,
             "appid": settings.api_weather_key,
             "units": units or settings.units,
         }
-        return await self.client._make_request("forecast", params)
+        return await self.client._make_request("weather", params)
 
     def build_context(self, data: Dict[str, Any], max_days=7, units: str | None = None) -> Dict[str, Any]:
         units = units or settings.units
@@ -241,8 +468,8 @@ class WeatherService:
         current_wind = _wind_display_speed(_safe_float(wind.get("speed")), units)
         current_precip = _precip_mm(first)
         current = {
-            "temp": round(float(main.get("temp", 0))),
-            "feels_like": round(float(main.get("feels_like", 0))),
+            "temp": round(_display_temp(float(main.get("temp", 0)), units)),
+            "feels_like": round(_display_temp(float(main.get("feels_like", 0)), units)),
             "humidity": int(main.get("humidity", 0)),
             "wind": f'{round(current_wind)} {_wind_unit(units)}',
             "precip": f"{round(current_precip, 1)} mm" if current_precip else "0 mm",
@@ -252,7 +479,7 @@ class WeatherService:
         hourly = []
         for item in items[:8]:
             time = _to_local_time(int(item.get("dt") or 0), time_zone)
-            temp = round(float(item.get("main", {}).get("temp", 0)))
+            temp = round(_display_temp(float(item.get("main", {}).get("temp", 0)), units))
             item_wind = _wind_display_speed(_safe_float(item.get("wind", {}).get("speed")), units)
             hourly.append({
                 "time": time.strftime("%I %p").lstrip("0") if hasattr(time, "strftime") else "",
@@ -270,7 +497,7 @@ class WeatherService:
             groups[forecast_date].append(item)
         daily = []
         for forecast_date in sorted(groups.keys())[:max_days]:
-            temps = [float(x.get("main", {}).get("temp", 0)) for x in groups[forecast_date]]
+            temps = [_display_temp(float(x.get("main", {}).get("temp", 0)), units) for x in groups[forecast_date]]
             hi, lo = (round(max(temps)) if temps else 0, round(min(temps)) if temps else 0)
             mid = groups[forecast_date][len(groups[forecast_date]) // 2]
             daily.append({
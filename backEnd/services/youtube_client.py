@@ -2,6 +2,7 @@ from typing import List, Dict, Any, Optional
 import httpx
 from fastapi import HTTPException
 from backEnd.core.config import settings
+from backEnd.core.metrics import track_upstream
 
 class YoutubeClient:
     def __init__(self, api_key: Optional[str] = None, base_url: str = "https://www.googleapis.com/youtube/v3"):
@@ -19,8 +20,10 @@ class YoutubeClient:
         params = {**params, "key": self.api_key}
         timeout = httpx.Timeout(settings.api_timeout)
         try:
-            async with httpx.AsyncClient(timeout=timeout) as client:
-                response = await client.get(url, params=params)
+            with track_upstream("youtube") as call:
+                async with httpx.AsyncClient(timeout=timeout) as client:
+                    response = await client.get(url, params=params)
+                call.status = response.status_code
                 response.raise_for_status()
                 return response.json()
         except httpx.HTTPStatusError as e:
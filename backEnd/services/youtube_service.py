@@ -1,7 +1,11 @@
 from typing import Any, Dict, List, Optional
 
+from backEnd.core.cache import cache_key, get_cache
+from backEnd.core.config import settings
 from .youtube_client import YoutubeClient
 
+_video_cache = get_cache("youtube")
+
 
 class YoutubeService:
     """High-level service to fetch local news videos for a city."""
@@ -29,6 +33,11 @@ class YoutubeService:
         if country_code and len(country_code.strip()) == 2:
             region_code = country_code.strip().upper()
 
+        key = cache_key(query.lower(), region_code or "US", max_results)
+        cached = await _video_cache.get(key)
+        if cached is not None:
+            return cached
+
         data = await self.client.search_videos(
             query=query,
             region_code=region_code or "US",
@@ -58,4 +67,5 @@ class YoutubeService:
                 }
             )
 
+        await _video_cache.set(key, videos, settings.youtube_cache_ttl_seconds)
         return videos
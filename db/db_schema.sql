@@ -73,6 +73,7 @@ CHECK (
 CREATE INDEX IF NOT EXISTS idx_requests_loc_dates ON requests (location_id, start_date, end_date);
 CREATE INDEX IF NOT EXISTS idx_requests_user ON requests (user_id);
 CREATE INDEX IF NOT EXISTS idx_requests_status ON requests (status);
+CREATE INDEX IF NOT EXISTS idx_requests_created ON requests (created_at, id);
 
 -- =========================================
 -- weather_observations — point-in-time actuals (past/current)
@@ -132,6 +133,41 @@ ingested_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
 );
 CREATE INDEX IF NOT EXISTS idx_fc_loc_time ON weather_forecasts (location_id, forecast_time);
 CREATE INDEX IF NOT EXISTS idx_fc_loc_kind_snap ON weather_forecasts (location_id, kind, snapshot_time);
+CREATE INDEX IF NOT EXISTS idx_fc_loc_provider_snap ON weather_forecasts (location_id, provider_id, snapshot_time);
+CREATE INDEX IF NOT EXISTS idx_fc_time ON weather_forecasts (forecast_time, id);
+
+-- =========================================
+-- weather_forecast_hourly / weather_forecast_daily — rollups of compacted
+-- snapshots (raw rows older than the retention window are folded in here)
+-- =========================================
+CREATE TABLE IF NOT EXISTS weather_forecast_hourly (
+location_id TEXT NOT NULL REFERENCES locations (id) ON DELETE CASCADE,
+provider_id TEXT NOT NULL REFERENCES providers (id) ON DELETE CASCADE,
+bucket_start DATETIME NOT NULL,
+sample_count INTEGER NOT NULL DEFAULT 0,
+temp_count INTEGER NOT NULL DEFAULT 0,
+temp_sum_c REAL,
+temp_min_c REAL,
+temp_max_c REAL,
+precip_count INTEGER NOT NULL DEFAULT 0,
+precip_sum_mm REAL,
+wind_max_ms REAL,
+  PRIMARY KEY (location_id, provider_id, bucket_start)
+);
+CREATE INDEX IF NOT EXISTS idx_fc_hourly_time ON weather_forecast_hourly (bucket_start);
+
+CREATE TABLE IF NOT EXISTS weather_forecast_daily (
+location_id TEXT NOT NULL REFERENCES locations (id) ON DELETE CASCADE,
+provider_id TEXT NOT NULL REFERENCES providers (id) ON DELETE CASCADE,
+day DATE NOT NULL,
+temp_min_c REAL,
+temp_max_c REAL,
+temp_mean_c REAL,
+precip_total_mm REAL,
+wind_max_ms REAL,
+hours INTEGER NOT NULL DEFAULT 0,
+  PRIMARY KEY (location_id, provider_id, day)
+);
 
 -- =========================================
 -- favorites (optional)
@@ -142,6 +178,7 @@ user_id TEXT REFERENCES users (id) ON DELETE SET NULL,
 location_id TEXT NOT NULL REFERENCES locations (id) ON DELETE CASCADE,
 created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP
 );
+CREATE INDEX IF NOT EXISTS idx_favorites_created ON favorites (created_at, id);
 
 -- Helpful view
 CREATE VIEW IF NOT EXISTS v_recent_requests AS
@@ -1,6 +1,7 @@
 const ENV_API_BASE_URL = (window.__ENV__ && window.__ENV__.API_BASE_URL) ? window.__ENV__.API_BASE_URL : '';
 
 const API_BASE_URL = ENV_API_BASE_URL || '/api/weather';
+const GEO_BASE_URL = API_BASE_URL.replace(/\/weather\/?$/, '/geo');
 
 const searchForm = document.getElementById('searchForm');
 const searchInput = document.getElementById('searchInput');
@@ -32,6 +33,7 @@ document.addEventListener('DOMContentLoaded', () => {
   initTheme();
   loadWeather();
   loadFavorites();
+  initPlaceSuggestions();
 
   searchForm.addEventListener('submit', (e) => {
     e.preventDefault();
@@ -61,6 +63,36 @@ document.addEventListener('DOMContentLoaded', () => {
   });
 });
 
+// Autocomplete from the server-side offline gazetteer (debounced, no upstream geocoding).
+let suggestTimer = null;
+function initPlaceSuggestions() {
+  const list = document.getElementById('placeSuggestions');
+  if (!list) return;
+  searchInput.addEventListener('input', () => {
+    clearTimeout(suggestTimer);
+    const q = searchInput.value.trim();
+    if (q.length < 2) {
+      list.innerHTML = '';
+      return;
+    }
+    suggestTimer = setTimeout(async () => {
+      try {
+        const res = await fetch(`${GEO_BASE_URL}/suggest?q=${encodeURIComponent(q)}&limit=8`);
+        if (!res.ok) return;
+        const page = await res.json();
+        list.innerHTML = '';
+        (page.items || []).forEach((item) => {
+          const option = document.createElement('option');
+          option.value = item.label;
+          list.appendChild(option);
+        });
+      } catch (err) {
+        console.error(err);
+      }
+    }, 150);
+  });
+}
+
 async function loadWeather(query = null, lat = null, lon = null) {
   showLoading();
   hideError();
@@ -231,8 +263,8 @@ async function loadFavorites() {
   try {
     const res = await fetch(`${API_BASE_URL}/favorites`);
     if (!res.ok) throw new Error('Failed to load favorites');
-    const items = await res.json();
-    renderFavorites(items);
+    const page = await res.json();
+    renderFavorites(page.items);
   } catch (err) {
     console.error(err);
   }
@@ -0,0 +1,206 @@
+"""Cache backends: the same contract for memory, SQLite and Redis (against a local RESP stand-in)."""
+import asyncio
+import os
+import time
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
+
+import pytest
+
+from backEnd.core.cache import Cache, MemoryBackend, RedisBackend, SQLiteBackend, _RedisReplyError
+from backEnd.core.config import settings
+
+
+class FakeRedis:
+    """Just enough of a Redis server for RedisBackend: GET, SET [PX], DEL, INCR, DBSIZE."""
+
+    def __init__(self) -> None:
+        self.data = {}
+        self.connections = 0
+        self.drop_next = False
+        self.server = None
+        self.port = None
+
+    async def start(self) -> "FakeRedis":
+        self.server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        self.port = self.server.sockets[0].getsockname()[1]
+        return self
+
+    async def stop(self) -> None:
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def _read_command(self, reader):
+        header = await reader.readline()
+        if not header:
+            return None
+        args = []
+        for _ in range(int(header[1:-2])):
+            length = int((await reader.readline())[1:-2])
+            args.append((await reader.readexactly(length + 2))[:-2])
+        return args
+
+    async def _handle(self, reader, writer) -> None:
+        self.connections += 1
+        try:
+            while True:
+                args = await self._read_command(reader)
+                if args is None:
+                    return
+                if self.drop_next:
+                    # Simulate a broken stream: the command is read but never answered.
+                    self.drop_next = False
+                    return
+                writer.write(self._execute(args))
+                await writer.drain()
+        finally:
+            writer.close()
+
+    def _live(self, key):
+        item = self.data.get(key)
+        if item is not None and item[1] is not None and item[1] <= time.time():
+            del self.data[key]
+            return None
+        return item
+
+    def _execute(self, args) -> bytes:
+        command, args = args[0].upper(), args[1:]
+        if command == b"GET":
+            item = self._live(args[0])
+            return b"$-1\r\n" if item is None else b"$%d\r\n%s\r\n" % (len(item[0]), item[0])
+        if command == b"SET":
+            expires = time.time() + int(args[3]) / 1000.0 if len(args) > 3 and args[2].upper() == b"PX" else None
+            self.data[args[0]] = (args[1], expires)
+            return b"+OK\r\n"
+        if command == b"DEL":
+            return b":%d\r\n" % (self.data.pop(args[0], None) is not None)
+        if command == b"INCR":
+            item = self._live(args[0])
+            try:
+                value = int(item[0]) + 1 if item else 1
+            except ValueError:
+                return b"-ERR value is not an integer or out of range\r\n"
+            self.data[args[0]] = (str(value).encode(), item[1] if item else None)
+            return b":%d\r\n" % value
+        if command == b"DBSIZE":
+            return b":%d\r\n" % sum(1 for key in list(self.data) if self._live(key))
+        return b"-ERR unknown command\r\n"
+
+
+def run_with_backend(kind, tmp_path, body, max_bytes=1 << 20):
+    """Run `body(backend, server)` on a fresh backend of `kind` inside one event loop."""
+
+    async def _main():
+        server = None
+        if kind == "redis":
+            server = await FakeRedis().start()
+            backend = RedisBackend(f"redis://127.0.0.1:{server.port}/0", timeout=1.0, pool_size=4)
+        elif kind == "sqlite":
+            backend = SQLiteBackend(str(tmp_path / "cache.sqlite"), max_bytes)
+        else:
+            backend = MemoryBackend(max_bytes)
+        try:
+            await body(backend, server)
+        finally:
+            if server is not None:
+                for conn in backend._idle:
+                    conn.close()
+                await server.stop()
+
+    asyncio.run(_main())
+
+
+BACKENDS = ["memory", "sqlite", "redis"]
+
+
+@pytest.mark.parametrize("kind", BACKENDS)
+def test_set_get_delete(kind, tmp_path):
+    async def body(backend, server):
+        assert await backend.get("a") is None
+        await backend.set("a", b"\x00value\r\n", 60)
+        assert await backend.get("a") == b"\x00value\r\n"
+        await backend.delete("a")
+        assert await backend.get("a") is None
+
+    run_with_backend(kind, tmp_path, body)
+
+
+@pytest.mark.parametrize("kind", BACKENDS)
+def test_entries_expire_after_ttl(kind, tmp_path):
+    async def body(backend, server):
+        await backend.set("short", b"x", 0.05)
+        await backend.set("long", b"y", 60)
+        await asyncio.sleep(0.1)
+        assert await backend.get("short") is None
+        assert await backend.get("long") == b"y"
+
+    run_with_backend(kind, tmp_path, body)
+
+
+@pytest.mark.parametrize("kind", BACKENDS)
+def test_cache_round_trip_and_item_limit(kind, tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "cache_max_item_bytes", 1024)
+
+    async def body(backend, server):
+        cache = Cache("test", backend)
+        await cache.set("k", {"temp": 1.5}, 60)
+        assert await cache.get("k") == {"temp": 1.5}
+        await cache.set("big", "x" * 2048, 60)
+        assert await cache.get("big") is None
+        assert cache.stats["oversize"] == 1
+
+    run_with_backend(kind, tmp_path, body)
+
+
+@pytest.mark.parametrize("kind", ["memory", "sqlite"])
+def test_byte_budget_evicts_least_recently_used(kind, tmp_path):
+    async def body(backend, server):
+        # SQLite evicts on every 100th write.
+        for i in range(100):
+            await backend.set(f"k{i}", b"v" * 100, 60)
+        info = await backend.info()
+        assert info["bytes"] <= 5000
+        assert await backend.get("k0") is None
+        assert await backend.get("k99") == b"v" * 100
+
+    run_with_backend(kind, tmp_path, body, max_bytes=5000)
+
+
+def test_redis_reuses_pooled_connections(tmp_path):
+    async def body(backend, server):
+        await asyncio.gather(*(backend.set(f"k{i}", b"v", 60) for i in range(32)))
+        assert server.connections <= backend.pool_size
+        before = server.connections
+        for i in range(32):
+            assert await backend.get(f"k{i}") == b"v"
+        assert server.connections == before
+        assert (await backend.info())["entries"] == 32
+
+    run_with_backend("redis", tmp_path, body)
+
+
+def test_redis_replaces_broken_stream_and_keeps_pooling(tmp_path):
+    async def body(backend, server):
+        await backend.set("a", b"1", 60)
+        assert server.connections == 1
+        server.drop_next = True
+        # The dropped command is retried once on a fresh connection.
+        assert await backend.get("a") == b"1"
+        assert server.connections == 2
+        assert len(backend._idle) == 1
+        assert await backend.get("a") == b"1"
+        assert server.connections == 2
+
+    run_with_backend("redis", tmp_path, body)
+
+
+def test_redis_error_reply_keeps_connection(tmp_path):
+    async def body(backend, server):
+        assert await backend._command("INCR", "n") == 1
+        await backend.set("s", b"text", 60)
+        with pytest.raises(_RedisReplyError):
+            await backend._command("INCR", "s")
+        assert await backend._command("INCR", "n") == 2
+        assert server.connections == 1
+
+    run_with_backend("redis", tmp_path, body)
@@ -0,0 +1,67 @@
+"""ForecastStore reads: only complete snapshots are served from weather_forecasts."""
+import os
+from datetime import datetime, timedelta, timezone
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
+
+import pytest
+from sqlalchemy import create_engine
+
+from backEnd.core.database import Base
+from backEnd.models.model import Location, Provider
+from backEnd.services.forecast_store import PROVIDER_NAME, ForecastStore
+from backEnd.services.forecast_writer import build_forecast_rows, insert_forecast_rows
+
+LAT, LON = 10.0, 20.0
+
+
+@pytest.fixture()
+def store(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'store.db'}", future=True)
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(Location.__table__.insert().values(id="loc", canonical_name="Known", latitude=LAT, longitude=LON))
+        conn.execute(Provider.__table__.insert().values(id="ow", name=PROVIDER_NAME))
+    yield ForecastStore(engine)
+    engine.dispose()
+
+
+def _forecast(start: datetime, items: int = 40):
+    """A /forecast-shaped payload with 3-hourly items from `start`."""
+    base = int(start.replace(tzinfo=timezone.utc).timestamp())
+    return {"list": [{"dt": base + i * 3 * 3600, "main": {"temp": float(i)}} for i in range(items)], "city": {}}
+
+
+def _write(store, snapshot_time, data, start_date=None, end_date=None):
+    with store.engine.begin() as conn:
+        insert_forecast_rows(conn, build_forecast_rows("loc", "ow", data, snapshot_time, start_date, end_date))
+
+
+def test_full_snapshot_is_served(store):
+    now = datetime.utcnow()
+    _write(store, now, _forecast(now))
+    data, snapshot = store._load(LAT, LON, 3600)
+    assert snapshot == now
+    assert data["list"][0]["main"]["temp"] == 0.0
+
+
+def test_request_range_snapshot_is_skipped(store):
+    now = datetime.utcnow()
+    later = now.date() + timedelta(days=3)
+    _write(store, now, _forecast(now), start_date=later, end_date=later)
+    assert store._load(LAT, LON, 3600) is None
+
+
+def test_older_complete_snapshot_wins_over_newer_partial(store):
+    now = datetime.utcnow()
+    full_at = now - timedelta(minutes=10)
+    _write(store, full_at, _forecast(full_at))
+    _write(store, now, _forecast(now), start_date=now.date(), end_date=now.date())
+    _, snapshot = store._load(LAT, LON, 3600)
+    assert snapshot == full_at
+
+
+def test_snapshot_without_current_items_is_skipped(store):
+    now = datetime.utcnow()
+    _write(store, now, _forecast(now + timedelta(days=1)))
+    assert store._load(LAT, LON, 3600) is None
@@ -0,0 +1,80 @@
+"""EXPLAIN QUERY PLAN checks: the hot read paths must stay index range scans."""
+import os
+from datetime import date, datetime, timedelta
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
+
+import pytest
+from sqlalchemy import create_engine, event, select
+from sqlalchemy.orm import Session
+
+from backEnd.api.routers.weather import apply_keyset, encode_cursor, keyset_sort_key
+from backEnd.core.database import Base
+from backEnd.models.model import Favorite, Location, Request as RequestModel, WeatherForecast
+from backEnd.services.forecast_reader import forecast_columns
+
+CURSOR = encode_cursor("2025-11-01 00:00:00", "00000000-0000-0000-0000-000000000000")
+
+
+@pytest.fixture()
+def db():
+    engine = create_engine("sqlite://", future=True)
+    Base.metadata.create_all(bind=engine)
+    with Session(engine) as session:
+        yield session
+    engine.dispose()
+
+
+def query_plan(session: Session, stmt) -> str:
+    """Plan details SQLite reports for `stmt`, one line per step."""
+    conn = session.connection()
+
+    def _explain(conn, cursor, statement, parameters, context, executemany):
+        return "EXPLAIN QUERY PLAN " + statement, parameters
+
+    event.listen(conn, "before_cursor_execute", _explain, retval=True)
+    try:
+        rows = conn.execute(stmt).cursor.fetchall()
+    finally:
+        event.remove(conn, "before_cursor_execute", _explain)
+    return "\n".join(row[-1] for row in rows)
+
+
+def test_get_request_range_uses_location_time_index(db):
+    start, end = date(2025, 11, 1), date(2025, 11, 3)
+    stmt = select(*forecast_columns(["forecast_time", "temperature_c"])).where(
+        WeatherForecast.location_id == "loc",
+        WeatherForecast.forecast_time >= start,
+        WeatherForecast.forecast_time <= end + timedelta(days=1),
+    )
+    assert "USING INDEX idx_fc_loc_time" in query_plan(db, stmt)
+
+
+@pytest.mark.parametrize("cursor", [None, CURSOR])
+def test_list_requests_keyset_uses_created_index(db, cursor):
+    q = db.query(RequestModel, keyset_sort_key(RequestModel.created_at))
+    q = apply_keyset(q, RequestModel.created_at, RequestModel.id, cursor, descending=True)
+    plan = query_plan(db, q.limit(101).statement)
+    assert "USING INDEX idx_requests_created" in plan
+    assert "TEMP B-TREE" not in plan
+
+
+@pytest.mark.parametrize("cursor", [None, CURSOR])
+def test_list_favorites_keyset_uses_created_index(db, cursor):
+    q = db.query(Favorite, Location, keyset_sort_key(Favorite.created_at)).join(Location, Favorite.location_id == Location.id)
+    q = apply_keyset(q, Favorite.created_at, Favorite.id, cursor, descending=True)
+    plan = query_plan(db, q.limit(101).statement)
+    assert "USING INDEX idx_favorites_created" in plan
+    assert "TEMP B-TREE" not in plan
+
+
+@pytest.mark.parametrize("cursor", [None, CURSOR])
+def test_list_forecasts_keyset_uses_time_index(db, cursor):
+    q = select(
+        *forecast_columns(["id", "location_id", "forecast_time", "temperature_c", "humidity_pct", "kind"]),
+        keyset_sort_key(WeatherForecast.forecast_time).label("sort_key"),
+    ).filter(WeatherForecast.forecast_time >= datetime(2025, 11, 1))
+    q = apply_keyset(q, WeatherForecast.forecast_time, WeatherForecast.id, cursor)
+    plan = query_plan(db, q.limit(1001))
+    assert "USING INDEX idx_fc_time" in plan
+    assert "TEMP B-TREE" not in plan
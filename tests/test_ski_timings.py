@@ -0,0 +1,52 @@
+"""`_timings` debug field on ski responses, for dict and bare-list payloads."""
+import os
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from backEnd.api.routers import ski
+from backEnd.core.config import settings
+from backEnd.core.metrics import ServerTimingMiddleware, timed
+
+
+class FakeSkiService:
+    def __init__(self, listing):
+        self.listing = listing
+
+    async def get_resorts_by_region(self, region):
+        return await timed("upstream", _value(self.listing))
+
+
+async def _value(value):
+    return value
+
+
+@pytest.fixture()
+def client_for(monkeypatch):
+    monkeypatch.setattr(settings, "server_timing_debug", True)
+
+    def _client(listing):
+        app = FastAPI()
+        app.add_middleware(ServerTimingMiddleware, prefixes=("/api/ski/",))
+        app.include_router(ski.router)
+        app.dependency_overrides[ski.get_ski_service] = lambda: FakeSkiService(listing)
+        return TestClient(app)
+
+    return _client
+
+
+def test_dict_listing_gets_timings(client_for):
+    r = client_for({"items": [{"name": "A"}]}).get("/api/ski/resorts", params={"region": "USA-Idaho"})
+    assert r.status_code == 200
+    assert "upstream" in r.json()["_timings"]
+    assert "upstream;dur=" in r.headers["server-timing"]
+
+
+def test_list_listing_is_passed_through(client_for):
+    r = client_for([{"name": "A"}, {"name": "B"}]).get("/api/ski/resorts", params={"region": "USA-Idaho"})
+    assert r.status_code == 200
+    assert r.json() == [{"name": "A"}, {"name": "B"}]
+    assert "upstream;dur=" in r.headers["server-timing"]